@@ -0,0 +1,3 @@
+"""
+Offline benchmarks of the report graph and the API (see benchmarks/README.md).
+"""
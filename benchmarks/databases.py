@@ -0,0 +1,311 @@
+"""
+Offline copies of the `crm` and `crm_outlook` databases.
+
+The CRM tables are derived from the CSV exports in data/crm; the fund look-through,
+emails, meetings and preferences (loaded from notebooks in production) are
+generated deterministically from the same contacts. Tables are written to a
+SQLite file per database, or to a throwaway Postgres server.
+
+SQLite does not know the Postgres `~*` (case-insensitive regex) and `ILIKE`
+operators the tools use; SQLite engines rewrite them to `REGEXP` (backed by
+Python's re) and `LIKE` before executing.
+"""
+
+import re
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, event, text
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "crm"
+
+USER_EMAIL = "jane.moneypenny@bankwell.com"
+USER_NAME = ("Jane", "Moneypenny")
+
+# Top positions of the index funds held in data/crm/portfolio.csv
+INDEX_FUND_POSITIONS = [
+    ("Apple", 0.071),
+    ("Microsoft", 0.068),
+    ("NVIDIA", 0.061),
+    ("Amazon", 0.037),
+    ("Meta Platforms", 0.025),
+    ("Alphabet", 0.021),
+    ("Berkshire Hathaway", 0.017),
+    ("Broadcom", 0.016),
+    ("JPMorgan Chase", 0.013),
+    ("Tesla", 0.012),
+]
+INDEX_FUNDS = {"FZROX", "VTSAX", "SWPPX", "FXAIX", "VFIAX", "SPY"}
+STOCK_NAMES = {
+    "AAPL": "Apple",
+    "AMZN": "Amazon",
+    "GOOGL": "Alphabet",
+    "JPM": "JPMorgan Chase",
+    "META": "Meta Platforms",
+    "MSFT": "Microsoft",
+    "NVDA": "NVIDIA",
+    "TSLA": "Tesla",
+    "UNH": "UnitedHealth Group",
+    "V": "Visa",
+}
+
+EMAIL_TOPICS = [
+    (
+        "Quarterly portfolio review",
+        "Could you share the performance of our equity allocation this quarter?",
+    ),
+    (
+        "Credit facility renewal",
+        "We would like to discuss the terms of the credit facility ahead of renewal.",
+    ),
+    (
+        "Market volatility",
+        "How are you thinking about rate cuts and the recent market volatility?",
+    ),
+    (
+        "ESG reporting",
+        "Our board asked for the carbon score of the portfolio. Is that available?",
+    ),
+    (
+        "Cash management",
+        "We expect a large inflow next month and want options for short-term cash.",
+    ),
+    (
+        "Follow-up from our call",
+        "Thanks for the call. Attached are the documents you requested.",
+    ),
+]
+
+
+def _seed(*parts) -> int:
+    return zlib.crc32("|".join(map(str, parts)).encode("utf-8"))
+
+
+def load_crm_tables(data_dir: Path = DATA_DIR) -> Dict[str, pd.DataFrame]:
+    """Tables of the crm database, derived from the CSV exports"""
+    accounts = pd.read_csv(data_dir / "accounts.csv", index_col=0)
+    contacts = pd.read_csv(data_dir / "contacts.csv", index_col=0)
+    portfolio = pd.read_csv(data_dir / "portfolio.csv", index_col=0)
+
+    accounts_alignment = accounts.rename(columns={"Company": "company"})[
+        ["company", "industry"]
+    ]
+
+    clients_contact = pd.DataFrame(
+        {
+            "company": contacts["Company"],
+            "first_name": contacts["ContactFirstName"],
+            "last_name": contacts["ContactLastName"],
+            "email": contacts["ContactEmail"],
+            "title": contacts["ContactTitle"],
+        }
+    ).drop_duplicates("email")
+
+    rng = np.random.default_rng(_seed("portfolio"))
+    portfolio_table = pd.DataFrame(
+        {
+            "company": portfolio["Company_name"],
+            "symbol": portfolio["symbol"],
+            "fund_type": np.where(
+                portfolio["instrument_type"] == "Bond",
+                "Fixed Income Fund",
+                "Equity Fund",
+            ),
+            "fund_balance": rng.integers(50_000, 5_000_000, len(portfolio)),
+        }
+    )
+
+    fund_rows = []
+    for symbol in sorted(portfolio["symbol"].unique()):
+        if symbol in INDEX_FUNDS:
+            fund_rows += [
+                (symbol, name, weight) for name, weight in INDEX_FUND_POSITIONS
+            ]
+        elif symbol in STOCK_NAMES:
+            fund_rows.append((symbol, STOCK_NAMES[symbol], 1.0))
+    fund_detail = pd.DataFrame(fund_rows, columns=["fund", "position_name", "weight"])
+
+    return {
+        "accounts_alignment": accounts_alignment,
+        "clients_contact": clients_contact,
+        "portfolio": portfolio_table,
+        "fund_detail": fund_detail,
+    }
+
+
+def load_outlook_tables(
+    meeting_day: datetime,
+    emails_per_contact: int = 12,
+    data_dir: Path = DATA_DIR,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Tables of the crm_outlook database: the banker's emails and past meetings with
+    the contacts of her clients, spread over the year before `meeting_day`, the
+    benchmark meetings on `meeting_day`, and her report preferences.
+    """
+    contacts = pd.read_csv(data_dir / "janes_contacts.csv", index_col=0)
+    emails, meetings = [], []
+    for _, contact in contacts.iterrows():
+        rng = np.random.default_rng(_seed(contact["ContactEmail"]))
+        client_name = f"{contact['ContactFirstName_x']} {contact['ContactLastName_x']}"
+        for i in range(emails_per_contact):
+            subject, body = EMAIL_TOPICS[int(rng.integers(len(EMAIL_TOPICS)))]
+            sent = meeting_day - timedelta(
+                days=int(rng.integers(1, 365)), minutes=int(rng.integers(0, 600))
+            )
+            inbound = i % 2 == 0
+            emails.append(
+                {
+                    "email_timestamp": sent.strftime("%Y-%m-%d %H:%M:%S"),
+                    "to_names": "Jane Moneypenny" if inbound else client_name,
+                    "to_emails": USER_EMAIL if inbound else contact["ContactEmail"],
+                    "from_name": client_name if inbound else "Jane Moneypenny",
+                    "from_email": contact["ContactEmail"] if inbound else USER_EMAIL,
+                    "email_subject": f"{subject} - {contact['Company_x']}",
+                    "email_body": f"Hi {'Jane' if inbound else contact['ContactFirstName_x']},\n\n{body}\n\nBest regards",
+                }
+            )
+        for days_before in (30, 120, 300):
+            meetings.append(
+                {
+                    "meeting_timestamp": (
+                        meeting_day - timedelta(days=days_before)
+                    ).strftime("%Y-%m-%d 10:00:00"),
+                    "host": " ".join(USER_NAME),
+                    "host_email": USER_EMAIL,
+                    "invitees": client_name,
+                    "invitee_emails": contact["ContactEmail"],
+                    "meeting_subject": f"{contact['Company_x']} - Check-in",
+                }
+            )
+    # The benchmark meetings themselves, so the pre-generation path finds them in the calendar
+    for meeting in benchmark_meetings(meeting_day, data_dir):
+        meetings.append(
+            {
+                "meeting_timestamp": meeting["meeting_timestamp"],
+                "host": " ".join(USER_NAME),
+                "host_email": meeting["user_email"],
+                "invitees": meeting["client_name"],
+                "invitee_emails": meeting["client_email"],
+                "meeting_subject": meeting["meeting_description"],
+            }
+        )
+
+    preferences = pd.DataFrame(
+        [
+            {
+                "as_of_date": "2023-01-23 10:00:00",
+                "employee_first_name": USER_NAME[0],
+                "employee_last_name": USER_NAME[1],
+                "finance_detail": "full",
+                "news_detail": "full",
+                "macro_news_detail": "full",
+                "past_meeting_detail": "full",
+                "email": USER_EMAIL,
+            }
+        ]
+    )
+    return {
+        "email_data": pd.DataFrame(emails),
+        "meeting_data": pd.DataFrame(meetings),
+        "preferences": preferences,
+    }
+
+
+def benchmark_meetings(
+    meeting_day: datetime, data_dir: Path = DATA_DIR
+) -> List[Dict[str, str]]:
+    """Initial graph states of one meeting with each of the banker's client contacts"""
+    contacts = pd.read_csv(data_dir / "janes_contacts.csv", index_col=0)
+    return [
+        {
+            "user_email": USER_EMAIL,
+            "client_name": f"{row['ContactFirstName_x']} {row['ContactLastName_x']}",
+            "client_email": row["ContactEmail"],
+            "meeting_timestamp": (meeting_day + timedelta(minutes=30 * i)).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            ),
+            "meeting_description": f"{row['Company_x']} - Annual Portfolio Review",
+        }
+        for i, (_, row) in enumerate(contacts.iterrows())
+    ]
+
+
+POSTGRES_ONLY = [
+    (re.compile(r"~\*"), "REGEXP"),
+    (re.compile(r"\bILIKE\b", re.IGNORECASE), "LIKE"),
+]
+
+
+def _regexp(pattern: str, value: Optional[str]) -> bool:
+    return value is not None and re.search(pattern, value, re.IGNORECASE) is not None
+
+
+def create_sqlite_engine(path: Path):
+    """SQLite engine accepting the Postgres operators used by the tools"""
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+
+    @event.listens_for(engine, "connect")
+    def register_functions(dbapi_connection, connection_record):
+        dbapi_connection.create_function("regexp", 2, _regexp, deterministic=True)
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def rewrite(conn, cursor, statement, parameters, context, executemany):
+        for pattern, replacement in POSTGRES_ONLY:
+            statement = pattern.sub(replacement, statement)
+        return statement, parameters
+
+    return engine
+
+
+def create_postgres_engine(server_url: str, db_name: str):
+    """Engine of `db_name` on a throwaway Postgres server, creating the database if needed"""
+    admin = create_engine(f"{server_url}/postgres", isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": db_name}
+        ).scalar()
+        if not exists:
+            conn.execute(text(f'CREATE DATABASE "{db_name}"'))
+    admin.dispose()
+    return create_engine(f"{server_url}/{db_name}")
+
+
+def build_databases(
+    meeting_day: datetime,
+    directory: Path,
+    postgres_url: Optional[str] = None,
+    emails_per_contact: int = 12,
+) -> Dict[str, object]:
+    """
+    Load the offline databases and return their engines by database name.
+
+    Args:
+        meeting_day: Day of the benchmark meetings (emails and meetings precede it)
+        directory: Directory of the SQLite files
+        postgres_url: Postgres server URL (without database) to load instead of SQLite
+        emails_per_contact: Emails generated per client contact
+    """
+    from currensee.ingest.exposure import refresh_client_exposure
+
+    tables = {
+        "crm": load_crm_tables(),
+        "crm_outlook": load_outlook_tables(meeting_day, emails_per_contact),
+    }
+    engines = {}
+    for db_name, db_tables in tables.items():
+        if postgres_url:
+            engine = create_postgres_engine(postgres_url, db_name)
+        else:
+            engine = create_sqlite_engine(Path(directory) / f"{db_name}.db")
+        for name, df in db_tables.items():
+            df.to_sql(name, engine, if_exists="replace", index=False)
+        engines[db_name] = engine
+    refresh_client_exposure(engines["crm"])
+    return engines
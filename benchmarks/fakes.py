@@ -0,0 +1,227 @@
+"""
+Deterministic local stand-ins for the external services of the report graph.
+
+- `BenchmarkChatModel`: chat model answering from fixtures/llm_responses.json
+  after a configurable latency, reporting token usage like Gemini does
+- `FakeSerper`: drop-in for GoogleSerperAPIWrapper serving recorded responses
+  from fixtures/serper.json, or results synthesized from its templates
+- `fake_fred_reader`: drop-in for pandas_datareader's DataReader returning
+  seeded random walks
+- offline databases (see benchmarks.databases)
+
+`offline_backends()` installs all of them for the duration of a benchmark.
+"""
+
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import types
+import zlib
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Settings the currensee modules read at import; no real credentials are needed offline
+OFFLINE_ENV = {
+    "PROJECT_ID": "currensee-benchmark",
+    "USE_FAKE_MODEL": "true",
+    "SERPER_API_KEY": "offline",
+    "POSTGRES_USER": "benchmark",
+    "POSTGRES_PASSWORD": "benchmark",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+}
+for _name, _value in OFFLINE_ENV.items():
+    os.environ.setdefault(_name, _value)
+
+from langchain_community.chat_models import FakeListChatModel  # noqa: E402
+from langchain_core.messages import AIMessage  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatResult  # noqa: E402
+
+from benchmarks.databases import build_databases  # noqa: E402
+
+
+def _load_fixture(name: str) -> Dict[str, Any]:
+    return json.loads((FIXTURES_DIR / name).read_text(encoding="utf-8"))
+
+
+class BenchmarkChatModel(FakeListChatModel):
+    """
+    Fake chat model with a fixed latency per call. The answer is the first fixture
+    rule whose text is contained in the prompt (so it does not depend on call order).
+    """
+
+    latency: float = 0.0
+    rules: List[Dict[str, str]] = []
+    default: str = ""
+
+    def bind_tools(self, tools):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        content = next(
+            (rule["response"] for rule in self.rules if rule["contains"] in prompt),
+            self.default,
+        )
+        if self.latency:
+            time.sleep(self.latency)
+        usage = {
+            "input_tokens": len(prompt) // 4,
+            "output_tokens": len(content) // 4,
+            "total_tokens": (len(prompt) + len(content)) // 4,
+        }
+        message = AIMessage(content=content, usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def create_chat_model(latency: float = 0.0) -> BenchmarkChatModel:
+    from currensee.core.profiling import llm_callback
+
+    fixture = _load_fixture("llm_responses.json")
+    return BenchmarkChatModel(
+        responses=[fixture["default"]],
+        rules=fixture["rules"],
+        default=fixture["default"],
+        latency=latency,
+        callbacks=[llm_callback()],
+    )
+
+
+class FakeSerper:
+    """
+    Stand-in for GoogleSerperAPIWrapper. Recorded responses (fixture "recorded",
+    keyed by query) are returned as is; other `site:<domain> news about <subject>`
+    queries get the fixture templates filled in for the subject and site, dated
+    relative to `reference`.
+    """
+
+    templates: List[Dict[str, Any]] = []
+    recorded: Dict[str, Dict[str, Any]] = {}
+    reference: datetime = datetime(2024, 3, 26)
+    latency: float = 0.0
+    calls: int = 0
+
+    QUERY = re.compile(
+        r"^site:(?P<site>\S+)\s+(?:news about\s+)?(?P<subject>.*)$", re.IGNORECASE
+    )
+
+    def __init__(self, **kwargs):
+        pass
+
+    @classmethod
+    def configure(cls, reference: datetime, latency: float = 0.0) -> None:
+        fixture = _load_fixture("serper.json")
+        cls.templates = fixture["templates"]
+        cls.recorded = fixture.get("recorded", {})
+        cls.reference = reference
+        cls.latency = latency
+        cls.calls = 0
+
+    def results(self, query: str) -> Dict[str, Any]:
+        FakeSerper.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if query in self.recorded:
+            return self.recorded[query]
+
+        match = self.QUERY.match(query)
+        site, subject = (
+            (match["site"], match["subject"]) if match else ("reuters.com", query)
+        )
+        subject = re.sub(r"\s+and about .*$", "", subject).strip() or "Markets"
+        slug = re.sub(r"\W+", "-", subject.lower()).strip("-")
+        organic = []
+        for i, template in enumerate(self.templates):
+            published = self.reference - timedelta(days=template["days_before"])
+            organic.append(
+                {
+                    "title": template["title"].format(subject=subject),
+                    "snippet": template["snippet"].format(subject=subject),
+                    # Same story on every site: syndicated copies the dedup step should merge
+                    "link": f"https://www.{site.lower()}/markets/{slug}-{i}",
+                    "date": published.strftime("%b %d, %Y"),
+                    "position": i + 1,
+                }
+            )
+        return {"organic": organic}
+
+
+def fake_fred_reader(
+    series_id: str, data_source: str = "fred", *args, **kwargs
+) -> pd.DataFrame:
+    """Three years of business days of a seeded random walk, like DataReader(series_id, "fred")"""
+    rng = np.random.default_rng(zlib.crc32(series_id.encode("utf-8")))
+    index = pd.bdate_range(end="2024-03-22", periods=780)
+    values = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, len(index))))
+    return pd.DataFrame({series_id: values}, index=index)
+
+
+@contextmanager
+def offline_backends(
+    meeting_day: datetime,
+    llm_latency: float = 0.0,
+    search_latency: float = 0.0,
+    postgres_url: Optional[str] = None,
+    emails_per_contact: int = 12,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Route the model, search, FRED and database access of the currensee tools to
+    the offline stand-ins.
+
+    Yields:
+        Dict with the chat model and the database engines
+    """
+    from currensee.core import llm
+    from currensee.utils import db_utils
+
+    with ExitStack() as stack:
+        directory = Path(
+            stack.enter_context(tempfile.TemporaryDirectory(prefix="currensee-bench-"))
+        )
+        engines = build_databases(
+            meeting_day, directory, postgres_url, emails_per_contact
+        )
+        model = create_chat_model(llm_latency)
+        FakeSerper.configure(meeting_day, search_latency)
+
+        fred = types.ModuleType("pandas_datareader.data")
+        fred.DataReader = fake_fred_reader
+        datareader = types.ModuleType("pandas_datareader")
+        datareader.data = fred
+
+        stack.enter_context(
+            mock.patch.object(llm, "get_model", lambda model_name: model)
+        )
+        stack.enter_context(
+            mock.patch.object(db_utils, "create_pg_engine", engines.__getitem__)
+        )
+        stack.enter_context(
+            mock.patch(
+                "currensee.agents.tools.finance_tools.GoogleSerperAPIWrapper",
+                FakeSerper,
+            )
+        )
+        stack.enter_context(
+            mock.patch.dict(
+                sys.modules,
+                {"pandas_datareader": datareader, "pandas_datareader.data": fred},
+            )
+        )
+        db_utils.get_engine.cache_clear()
+        stack.callback(db_utils.get_engine.cache_clear)
+        try:
+            yield {"model": model, "engines": engines}
+        finally:
+            for engine in engines.values():
+                engine.dispose()
@@ -0,0 +1,239 @@
+"""
+End-to-end benchmark of the report graph against the offline stand-ins.
+
+Runs `compiled_graph` for the benchmark meetings at each concurrency level and
+reports the latency of every node and of whole reports, the throughput and the
+peak memory of a single report (--render also renders every report to HTML,
+FRED macro table included). Nothing leaves the machine: the model, Serper, FRED
+and the databases are replaced by benchmarks.fakes.
+
+    python -m benchmarks.graph_benchmark --concurrency 1 4 8 --reports 16
+    python -m benchmarks.graph_benchmark --llm-latency 0.8 --json results.json
+
+Each concurrency level starts with an empty holdings news store, so the first
+reports search their holdings and later ones share them, as in production.
+"""
+
+import argparse
+import json
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from benchmarks.databases import benchmark_meetings
+from benchmarks.fakes import FakeSerper, offline_backends
+
+MEETING_DAY = datetime(2024, 3, 26, 9, 0)
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def latency_summary(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 4) if values else 0.0,
+        "p50": round(percentile(values, 50), 4),
+        "p95": round(percentile(values, 95), 4),
+        "max": round(max(values), 4) if values else 0.0,
+    }
+
+
+def run_report(
+    graph, init_state: Dict[str, Any], render: bool = False
+) -> Dict[str, Any]:
+    start = time.perf_counter()
+    result = graph.invoke(dict(init_state))
+    if render:
+        from currensee.utils.output_utils_dynamic import generate_report
+
+        generate_report(result)
+    return {
+        "latency": time.perf_counter() - start,
+        "node_profile": result.get("node_profile", []),
+    }
+
+
+def measure_peak_memory(graph, init_state: Dict[str, Any]) -> int:
+    """Peak Python heap allocated while building one report (bytes)"""
+    tracemalloc.start()
+    try:
+        graph.invoke(dict(init_state))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_level(
+    graph,
+    meetings: List[Dict[str, Any]],
+    concurrency: int,
+    reports: int,
+    render: bool = False,
+) -> Dict[str, Any]:
+    from currensee.core.holdings_news import holdings_news_store
+    from currensee.core.profiling import summarize_profile
+
+    holdings_news_store.clear()
+    searches_before = FakeSerper.calls
+    states = [meetings[i % len(meetings)] for i in range(reports)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="benchmark"
+    ) as executor:
+        runs = list(
+            executor.map(lambda state: run_report(graph, state, render), states)
+        )
+    wall_time = time.perf_counter() - start
+
+    node_times: Dict[str, List[float]] = {}
+    totals: Dict[str, int] = {}
+    for run in runs:
+        for profile in run["node_profile"]:
+            node_times.setdefault(profile["node"], []).append(profile["wall_time"])
+        for counter, value in summarize_profile(run["node_profile"])["totals"].items():
+            if counter != "wall_time":
+                totals[counter] = totals.get(counter, 0) + value
+
+    return {
+        "concurrency": concurrency,
+        "reports": reports,
+        "wall_time": round(wall_time, 4),
+        "throughput": round(reports / wall_time, 4),
+        "report_latency": latency_summary([run["latency"] for run in runs]),
+        "nodes": {node: latency_summary(times) for node, times in node_times.items()},
+        "totals": totals,
+        "serper_calls": FakeSerper.calls - searches_before,
+    }
+
+
+def print_results(results: Dict[str, Any], out=sys.stdout) -> None:
+    print(
+        f"Peak memory of one report: {results['peak_memory_bytes'] / 2**20:.1f} MiB "
+        f"(max RSS {results['max_rss_kib'] / 1024:.1f} MiB)",
+        file=out,
+    )
+    for level in results["levels"]:
+        latency = level["report_latency"]
+        print(
+            f"\nconcurrency {level['concurrency']:>3}: {level['reports']} reports in {level['wall_time']:.2f}s, "
+            f"{level['throughput']:.2f} reports/s, latency p50 {latency['p50']:.3f}s "
+            f"p95 {latency['p95']:.3f}s, {level['serper_calls']} searches",
+            file=out,
+        )
+        print(f"  {'node':<40} {'mean':>8} {'p95':>8} {'share':>7}", file=out)
+        total = sum(node["mean"] for node in level["nodes"].values()) or 1
+        for name, node in sorted(
+            level["nodes"].items(), key=lambda item: -item[1]["mean"]
+        ):
+            print(
+                f"  {name:<40} {node['mean']:>8.4f} {node['p95']:>8.4f} {node['mean'] / total:>7.1%}",
+                file=out,
+            )
+
+
+def run_benchmark(
+    concurrency: List[int],
+    reports: Optional[int] = None,
+    llm_latency: float = 0.0,
+    search_latency: float = 0.0,
+    postgres_url: Optional[str] = None,
+    render: bool = False,
+) -> Dict[str, Any]:
+    """
+    Benchmark the graph at each concurrency level.
+
+    Args:
+        concurrency: Numbers of reports built at the same time
+        reports: Reports per level (default: one per benchmark meeting)
+        llm_latency: Seconds each fake model call takes
+        search_latency: Seconds each fake Serper search takes
+        postgres_url: Postgres server to load the databases into instead of SQLite
+        render: Also render every report to HTML
+    """
+    meetings = benchmark_meetings(MEETING_DAY)
+    with offline_backends(MEETING_DAY, llm_latency, search_latency, postgres_url):
+        from currensee.agents.complete_graph import compiled_graph
+
+        # Also warms imports and connections before the timed levels
+        peak_memory = measure_peak_memory(compiled_graph, meetings[0])
+        levels = [
+            run_level(compiled_graph, meetings, level, reports or len(meetings), render)
+            for level in concurrency
+        ]
+
+    return {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "settings": {
+            "llm_latency": llm_latency,
+            "search_latency": search_latency,
+            "database": "postgres" if postgres_url else "sqlite",
+            "render": render,
+        },
+        "peak_memory_bytes": peak_memory,
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "levels": levels,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the report graph offline.")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4], help="Concurrency levels"
+    )
+    parser.add_argument(
+        "--reports",
+        type=int,
+        default=None,
+        help="Reports per level (default: one per meeting)",
+    )
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.0, help="Seconds per fake model call"
+    )
+    parser.add_argument(
+        "--search-latency",
+        type=float,
+        default=0.0,
+        help="Seconds per fake Serper search",
+    )
+    parser.add_argument(
+        "--postgres-url",
+        default=None,
+        help="e.g. postgresql+psycopg2://user:pw@localhost:5432",
+    )
+    parser.add_argument(
+        "--render", action="store_true", help="Also render every report to HTML"
+    )
+    parser.add_argument(
+        "--json", default=None, help="Also write the results to this file"
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(
+        args.concurrency,
+        args.reports,
+        args.llm_latency,
+        args.search_latency,
+        args.postgres_url,
+        args.render,
+    )
+    print_results(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
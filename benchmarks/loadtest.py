@@ -0,0 +1,353 @@
+"""
+Load test of the Currensee API with stubbed backends.
+
+Drives /generate-report, /generate-report/html and /generate-report/pdf with a
+ramp of concurrent virtual users, each sending requests back to back, and
+reports per endpoint and concurrency level the throughput, latency percentiles
+(p50/p95/p99), error rate and the event-loop lag seen during the level.
+
+The app runs in-process by default (the requests go through httpx's ASGI
+transport on the same event loop, so the measured loop lag is the app's own and
+exposes blocking calls in async handlers). With --url the load goes to a
+locally launched server instead (the loop lag is then the load generator's);
+start one with the same stand-ins with
+
+    PYTHONPATH=src uvicorn benchmarks.loadtest:create_offline_app --factory --workers 4
+
+Results can be saved as a baseline and later runs compared against it:
+
+    python -m benchmarks.loadtest --concurrency 1 4 16 --save-baseline baseline.json
+    python -m benchmarks.loadtest --concurrency 1 4 16 --baseline baseline.json
+
+The report cache is disabled in-process unless --report-cache is given, so
+every request builds its report.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from contextlib import AsyncExitStack, ExitStack
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from benchmarks.databases import benchmark_meetings
+from benchmarks.fakes import offline_backends
+from benchmarks.graph_benchmark import MEETING_DAY, percentile
+
+ENDPOINTS = {
+    "report": "/generate-report",
+    "html": "/generate-report/html",
+    "pdf": "/generate-report/pdf",
+}
+
+# Regressions smaller than this (relative) are reported as unchanged
+DEFAULT_TOLERANCE = 0.1
+
+_offline_stack: Optional[ExitStack] = None
+
+
+def create_offline_app():
+    """
+    The API with the offline stand-ins installed (once per process, e.g. per uvicorn
+    worker). Latencies come from BENCHMARK_LLM_LATENCY and BENCHMARK_SEARCH_LATENCY.
+    """
+    global _offline_stack
+    if _offline_stack is None:
+        _offline_stack = ExitStack()
+        _offline_stack.enter_context(
+            offline_backends(
+                MEETING_DAY,
+                float(os.getenv("BENCHMARK_LLM_LATENCY", "0.5")),
+                float(os.getenv("BENCHMARK_SEARCH_LATENCY", "0.05")),
+            )
+        )
+    from currensee.api.main import app
+
+    return app
+
+
+def is_error(endpoint: str, status: int, body: bytes) -> bool:
+    if status >= 400:
+        return True
+    # /generate-report reports failures in the body with a 200 status
+    if endpoint == "report":
+        try:
+            return not json.loads(body).get("success", False)
+        except ValueError:
+            return True
+    return False
+
+
+async def measure_loop_lag(
+    samples: List[float], stop: asyncio.Event, interval: float = 0.01
+) -> None:
+    """Record how late the event loop wakes up from `interval` second sleeps"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - start - interval))
+
+
+async def virtual_user(
+    client, endpoints, meetings, user: int, deadline: float, records: list
+) -> None:
+    i = user
+    while time.perf_counter() < deadline:
+        endpoint = endpoints[i % len(endpoints)]
+        meeting = meetings[i % len(meetings)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = await client.post(ENDPOINTS[endpoint], json=meeting)
+            error = is_error(endpoint, response.status_code, response.content)
+        except Exception:
+            error = True
+        records.append((endpoint, time.perf_counter() - start, error))
+
+
+def summarize(records: list, wall_time: float) -> Dict[str, Any]:
+    latencies = [latency for _, latency, _ in records]
+    errors = sum(1 for _, _, error in records if error)
+    return {
+        "requests": len(records),
+        "throughput": round(len(records) / wall_time, 4) if wall_time else 0.0,
+        "error_rate": round(errors / len(records), 4) if records else 0.0,
+        "p50": round(percentile(latencies, 50), 4),
+        "p95": round(percentile(latencies, 95), 4),
+        "p99": round(percentile(latencies, 99), 4),
+    }
+
+
+async def run_level(
+    client, endpoints, meetings, concurrency: int, duration: float
+) -> Dict[str, Any]:
+    records: list = []
+    lag: List[float] = []
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(lag, stop))
+
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(
+        *(
+            virtual_user(client, endpoints, meetings, user, deadline, records)
+            for user in range(concurrency)
+        )
+    )
+    wall_time = time.perf_counter() - start
+    stop.set()
+    await lag_task
+
+    return {
+        "concurrency": concurrency,
+        "wall_time": round(wall_time, 4),
+        "all": summarize(records, wall_time),
+        "endpoints": {
+            endpoint: summarize([r for r in records if r[0] == endpoint], wall_time)
+            for endpoint in endpoints
+        },
+        "loop_lag": {
+            "p50": round(percentile(lag, 50), 4),
+            "p99": round(percentile(lag, 99), 4),
+            "max": round(max(lag), 4) if lag else 0.0,
+        },
+    }
+
+
+async def run_load(
+    concurrency: List[int],
+    duration: float,
+    endpoints: List[str],
+    url: Optional[str] = None,
+    report_cache: bool = False,
+    timeout: float = 600.0,
+) -> List[Dict[str, Any]]:
+    import httpx
+
+    meetings = benchmark_meetings(MEETING_DAY)
+    async with AsyncExitStack() as stack:
+        if url:
+            client = httpx.AsyncClient(base_url=url, timeout=timeout)
+        else:
+            from currensee.api import main
+
+            main.report_cache.enabled = report_cache
+            # ASGITransport does not run the lifespan: run it as a server would (warm-up, PDF pool shutdown)
+            await stack.enter_async_context(main.app.router.lifespan_context(main.app))
+            transport = httpx.ASGITransport(app=main.app)
+            client = httpx.AsyncClient(
+                transport=transport, base_url="http://loadtest", timeout=timeout
+            )
+        await stack.enter_async_context(client)
+        levels = []
+        for level in concurrency:
+            result = await run_level(client, endpoints, meetings, level, duration)
+            levels.append(result)
+            print(format_level(result), file=sys.stderr)
+        return levels
+
+
+def format_level(level: Dict[str, Any]) -> str:
+    overall = level["all"]
+    lines = [
+        f"concurrency {level['concurrency']:>3}: {overall['requests']} requests, "
+        f"{overall['throughput']:.2f} req/s, errors {overall['error_rate']:.1%}, "
+        f"loop lag p99 {level['loop_lag']['p99'] * 1000:.1f}ms (max {level['loop_lag']['max'] * 1000:.1f}ms)"
+    ]
+    for endpoint, stats in level["endpoints"].items():
+        lines.append(
+            f"  {endpoint:<7} p50 {stats['p50']:.3f}s  p95 {stats['p95']:.3f}s  p99 {stats['p99']:.3f}s  "
+            f"{stats['throughput']:.2f} req/s  errors {stats['error_rate']:.1%}"
+        )
+    return "\n".join(lines)
+
+
+def compare(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> str:
+    """
+    Markdown comparison of a run against a baseline, by concurrency level and
+    endpoint. Latency and error increases or throughput drops beyond `tolerance`
+    are flagged as regressions.
+    """
+    base_levels = {level["concurrency"]: level for level in baseline["levels"]}
+    rows = [
+        "| concurrency | endpoint | p95 (s) | Δ p95 | throughput (req/s) | Δ throughput | errors | verdict |",
+        "|---|---|---|---|---|---|---|---|",
+    ]
+    for level in results["levels"]:
+        base = base_levels.get(level["concurrency"])
+        for endpoint, stats in [("all", level["all"]), *level["endpoints"].items()]:
+            base_stats = (
+                (base or {}).get("endpoints", {}).get(endpoint)
+                if endpoint != "all"
+                else (base or {}).get("all")
+            )
+            if not base_stats:
+                rows.append(
+                    f"| {level['concurrency']} | {endpoint} | {stats['p95']:.3f} | n/a | "
+                    f"{stats['throughput']:.2f} | n/a | {stats['error_rate']:.1%} | new |"
+                )
+                continue
+            p95_change = _relative(stats["p95"], base_stats["p95"])
+            throughput_change = _relative(stats["throughput"], base_stats["throughput"])
+            if (
+                p95_change > tolerance
+                or throughput_change < -tolerance
+                or stats["error_rate"] > base_stats["error_rate"]
+            ):
+                verdict = "regression"
+            elif p95_change < -tolerance or throughput_change > tolerance:
+                verdict = "improvement"
+            else:
+                verdict = "unchanged"
+            rows.append(
+                f"| {level['concurrency']} | {endpoint} | {stats['p95']:.3f} | {p95_change:+.1%} | "
+                f"{stats['throughput']:.2f} | {throughput_change:+.1%} | {stats['error_rate']:.1%} | {verdict} |"
+            )
+    return "\n".join(rows)
+
+
+def _relative(value: float, base: float) -> float:
+    return (value - base) / base if base else 0.0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Load test the API with stubbed backends."
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 4, 16],
+        help="Ramp of concurrent users",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=30.0, help="Seconds per concurrency level"
+    )
+    parser.add_argument(
+        "--endpoints",
+        nargs="+",
+        choices=sorted(ENDPOINTS),
+        default=["report", "html", "pdf"],
+    )
+    parser.add_argument(
+        "--url",
+        default=None,
+        help="Load a running server instead of the in-process app",
+    )
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.5, help="Seconds per fake model call"
+    )
+    parser.add_argument(
+        "--search-latency",
+        type=float,
+        default=0.05,
+        help="Seconds per fake Serper search",
+    )
+    parser.add_argument(
+        "--report-cache", action="store_true", help="Keep the report cache enabled"
+    )
+    parser.add_argument(
+        "--save-baseline", default=None, help="Write the results to this file"
+    )
+    parser.add_argument(
+        "--baseline", default=None, help="Compare the results with this saved run"
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--report",
+        default=None,
+        help="Write the baseline comparison (Markdown) to this file",
+    )
+    args = parser.parse_args(argv)
+
+    with ExitStack() as stack:
+        if not args.url:
+            stack.enter_context(
+                offline_backends(MEETING_DAY, args.llm_latency, args.search_latency)
+            )
+        levels = asyncio.run(
+            run_load(
+                args.concurrency,
+                args.duration,
+                args.endpoints,
+                args.url,
+                args.report_cache,
+            )
+        )
+
+    results = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "settings": {
+            "target": args.url or "in-process",
+            "duration": args.duration,
+            "endpoints": args.endpoints,
+            "llm_latency": args.llm_latency,
+            "search_latency": args.search_latency,
+            "report_cache": args.report_cache,
+        },
+        "levels": levels,
+    }
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            comparison = compare(results, json.load(f), args.tolerance)
+        print(comparison)
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                f.write(comparison + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,15 +5,15 @@ from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage
 from langgraph.graph.state import CompiledStateGraph
 
+from currensee.agents.tools.article_serializer import serialize_articles
 from currensee.agents.tools.base import SupervisorState
 from currensee.agents.prompts import comms_prompts, news_prompts, holdings_prompts
-from currensee.core import get_model, settings
+from currensee.core import get_default_model
 from currensee.schema import AgentInfo
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
-model = get_model(settings.DEFAULT_MODEL)
 
 
 @dataclass
@@ -24,7 +24,8 @@ class Agent:
 
 # # Graph-specific utils
 
-def summarize_all_outputs(state: SupervisorState) -> str:
+
+def summarize_all_outputs(state: SupervisorState) -> dict:
     """
     Summarizes the outputs from all provided tools into one coherent summary.
 
@@ -62,34 +63,42 @@ def summarize_all_outputs(state: SupervisorState) -> str:
     client_news_prompt = news_prompts.get(client_news_detail.lower(), news_prompts["full"])
     client_comms_prompt = comms_prompts.get(past_meeting_detail.lower(), comms_prompts["full"])
 
-    new_state = state.copy()
+    # Articles go into the prompts as compact, size-capped text rather than reprs
+    prompt_state = {
+        **state,
+        "client_industry_sources": serialize_articles(
+            state.get("client_industry_sources")
+        ),
+    }
+
+    new_state = {}
     
     if finance_holdings_prompt:
         # Pass the entire state to the prompt for formatting
         # It will only use the variables declared in brackets
         # in the given prompt.
-        formatted_prompt = finance_holdings_prompt.format(**state)
+        formatted_prompt = finance_holdings_prompt.format(**prompt_state)
         # Create the messages to pass to the model
         messages_fin_hold = [HumanMessage(content=formatted_prompt)]
         # Produce the summary
-        summary_fin_hold = model.invoke(messages_fin_hold)
+        summary_fin_hold = get_default_model().invoke(messages_fin_hold)
         # Assign the summary to the state
         new_state["summary_fin_hold"] = summary_fin_hold.content
     else:
         new_state["summary_fin_hold"] = ""
 
     if client_news_prompt:
-        formatted_prompt = client_news_prompt.format(**state)
+        formatted_prompt = client_news_prompt.format(**prompt_state)
         messages_client_news = [HumanMessage(content=formatted_prompt)] 
-        summary_client_news = model.invoke(messages_client_news)
+        summary_client_news = get_default_model().invoke(messages_client_news)
         new_state["summary_client_news"] = summary_client_news.content
     else:
         new_state["summary_client_news"] = ""
 
     if client_comms_prompt:
-        formatted_prompt = client_comms_prompt.format(**state)
+        formatted_prompt = client_comms_prompt.format(**prompt_state)
         messages_client_comms = [HumanMessage(content=formatted_prompt)] 
-        summary_client_comms = model.invoke(messages_client_comms)
+        summary_client_comms = get_default_model().invoke(messages_client_comms)
         new_state["summary_client_comms"] = summary_client_comms.content
     else:
         new_state["summary_client_comms"] = ""
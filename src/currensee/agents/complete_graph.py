@@ -13,38 +13,53 @@ from currensee.agents.tools.outlook_tools import (
     produce_recent_client_questions, pull_recent_client_emails)
 from currensee.agents.tools.preference_tools import retrieve_current_formatt_preferences
 from currensee.agents.tools.meeting_categorization_tool import categorize_meeting_topic, determine_topic_of_news
-from currensee.core import get_model, settings
+from currensee.agents.tools.news_dedup import dedupe_news_sources
+from currensee.core.profiling import add_profiled_node
 from currensee.utils.sourcing_utils import get_fin_linked_summary
 
 load_dotenv()
 
 import asyncio
 
-# === Model ===
-model = get_model(settings.DEFAULT_MODEL)
-
-
 # === Build the Graph ===
 
 
 # Define the multi-agent supervisor graph
+# (every node is timed and its LLM, search and database usage counted, see core.profiling)
 complete_graph = StateGraph(SupervisorState)
 
-complete_graph.add_node("retrieve_client_metadata", retrieve_client_metadata)
-complete_graph.add_node("retrieve_current_formatt_preferences", retrieve_current_formatt_preferences)
-complete_graph.add_node("produce_outlook_summary", produce_client_email_summary)
-complete_graph.add_node("produce_recent_outlook_summary", produce_recent_client_email_summary)
-complete_graph.add_node("produce_recent_client_questions", produce_recent_client_questions)
-complete_graph.add_node("pull_recent_client_emails", pull_recent_client_emails)
-complete_graph.add_node("categorize_meeting_topic", categorize_meeting_topic)
-complete_graph.add_node("determine_topic_of_news", determine_topic_of_news)
-
-complete_graph.add_node("run_client_holdings_agent", retrieve_holdings_news)
-complete_graph.add_node("run_client_industry_agent", retrieve_client_industry_news)
-complete_graph.add_node("run_macro_finnews_agent", retrieve_macro_news)
-complete_graph.add_node("finance_summarizer_agent", summarize_finance_outputs)
-complete_graph.add_node("final_summarizer_agent", summarize_all_outputs)
-complete_graph.add_node("add_sourcing_agent", get_fin_linked_summary)
+add_profiled_node(complete_graph, "retrieve_client_metadata", retrieve_client_metadata)
+add_profiled_node(
+    complete_graph,
+    "retrieve_current_formatt_preferences",
+    retrieve_current_formatt_preferences,
+)
+add_profiled_node(
+    complete_graph, "produce_outlook_summary", produce_client_email_summary
+)
+add_profiled_node(
+    complete_graph,
+    "produce_recent_outlook_summary",
+    produce_recent_client_email_summary,
+)
+add_profiled_node(
+    complete_graph, "produce_recent_client_questions", produce_recent_client_questions
+)
+add_profiled_node(
+    complete_graph, "pull_recent_client_emails", pull_recent_client_emails
+)
+add_profiled_node(complete_graph, "categorize_meeting_topic", categorize_meeting_topic)
+add_profiled_node(complete_graph, "determine_topic_of_news", determine_topic_of_news)
+
+add_profiled_node(complete_graph, "run_client_holdings_agent", retrieve_holdings_news)
+add_profiled_node(
+    complete_graph, "run_client_industry_agent", retrieve_client_industry_news
+)
+add_profiled_node(complete_graph, "run_macro_finnews_agent", retrieve_macro_news)
+add_profiled_node(complete_graph, "dedupe_news_sources", dedupe_news_sources)
+add_profiled_node(complete_graph, "finance_summarizer_agent", summarize_finance_outputs)
+add_profiled_node(complete_graph, "final_summarizer_agent", summarize_all_outputs)
+add_profiled_node(complete_graph, "add_sourcing_agent", get_fin_linked_summary)
 
 complete_graph.add_edge(START, "retrieve_client_metadata")
 complete_graph.add_edge("retrieve_client_metadata", "retrieve_current_formatt_preferences")
@@ -59,7 +74,8 @@ complete_graph.add_edge("categorize_meeting_topic", "determine_topic_of_news")
 complete_graph.add_edge("determine_topic_of_news", "run_macro_finnews_agent")
 complete_graph.add_edge("run_macro_finnews_agent", "run_client_industry_agent")
 complete_graph.add_edge("run_client_industry_agent", "run_client_holdings_agent")
-complete_graph.add_edge("run_client_holdings_agent", "finance_summarizer_agent")
+complete_graph.add_edge("run_client_holdings_agent", "dedupe_news_sources")
+complete_graph.add_edge("dedupe_news_sources", "finance_summarizer_agent")
 complete_graph.add_edge("finance_summarizer_agent", "final_summarizer_agent")
 complete_graph.add_edge("final_summarizer_agent", "add_sourcing_agent")
 complete_graph.add_edge("add_sourcing_agent", END)
@@ -65,7 +65,7 @@ full_news_prompt = """
 
     You are a skilled financial advisor preparing for an upcoming meeting with {client_name}, who works at {client_company}. Your job is to write a report section that summarizes recent news about {client_company}. The meeting will focus on: {meeting_description}. When available in the context, highlight information on {news_focus}. 
 
-    Use {client_industry_sources} to write a paragraph summarizing relevant news, including:
+    Use the client news below to write a paragraph summarizing relevant news, including:
      - News about {client_company}
      - Industry trends 
 
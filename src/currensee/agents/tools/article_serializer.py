@@ -0,0 +1,110 @@
+"""
+Compact serialization of news articles for LLM prompts.
+
+Prompts only need the title, date, source and snippet of each article, one
+line per article, most relevant first. Each prompt section gets a token
+budget; articles that do not fit are left out and counted instead.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from currensee.agents.tools.base import NewsArticle
+
+try:
+    import tiktoken
+
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
+logger = logging.getLogger(__name__)
+
+# Token budget of each news section of the finance summarization prompt
+SECTION_TOKEN_BUDGET = 1500
+SNIPPET_CHARS = 300
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    if not HAS_TIKTOKEN:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:  # the encoding is downloaded on first use
+        logger.warning(f"tiktoken encoding unavailable, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Token count with tiktoken when available, otherwise ~4 characters per token"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 4 + 1
+
+
+def article_line(article: NewsArticle, snippet_chars: int = SNIPPET_CHARS) -> str:
+    date = (
+        article.published.strftime("%Y-%m-%d")
+        if article.published
+        else article.date or "undated"
+    )
+    snippet = " ".join(article.snippet.split())
+    if len(snippet) > snippet_chars:
+        snippet = snippet[:snippet_chars].rsplit(" ", 1)[0] + "..."
+    return (
+        f"- {article.title} ({article.domain or 'unknown source'}, {date}): {snippet}"
+    )
+
+
+def serialize_articles(
+    articles,
+    token_budget: int = SECTION_TOKEN_BUDGET,
+    snippet_chars: int = SNIPPET_CHARS,
+) -> str:
+    """
+    One line per article, highest score first, within `token_budget` tokens.
+
+    Strings (e.g. error messages left in the state) are returned unchanged.
+    """
+    if isinstance(articles, str):
+        return articles
+    articles = sorted(
+        (a for a in articles or [] if isinstance(a, NewsArticle)),
+        key=lambda a: a.score,
+        reverse=True,
+    )
+    if not articles:
+        return "No articles."
+
+    lines: List[str] = []
+    used = 0
+    for article in articles:
+        line = article_line(article, snippet_chars)
+        tokens = count_tokens(line)
+        if lines and used + tokens > token_budget:
+            break
+        lines.append(line)
+        used += tokens
+
+    omitted = len(articles) - len(lines)
+    if omitted:
+        lines.append(f"(+{omitted} less relevant articles omitted)")
+    return "\n".join(lines)
+
+
+def serialize_holdings(
+    articles_by_holding: Optional[Dict[str, List[NewsArticle]]],
+    token_budget: int = SECTION_TOKEN_BUDGET,
+    snippet_chars: int = SNIPPET_CHARS,
+) -> str:
+    """Articles grouped by holding, the token budget split evenly between holdings"""
+    if not articles_by_holding:
+        return "No articles."
+    per_holding = max(token_budget // len(articles_by_holding), 1)
+    return "\n".join(
+        f"{holding}:\n{serialize_articles(articles, per_holding, snippet_chars)}"
+        for holding, articles in articles_by_holding.items()
+    )
@@ -1,9 +1,50 @@
-from typing import Any, Dict, List, Optional, TypedDict
+import dataclasses
+import operator
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Annotated, Any, Dict, List, Optional, TypedDict
 
-import matplotlib.pyplot as plt
+
+@dataclass(slots=True)
+class EmailRecord:
+    """One row of email_data, kept in the state instead of column-oriented dicts"""
+
+    email_timestamp: str
+    to_names: str
+    to_emails: str
+    from_name: str
+    from_email: str
+    email_subject: str
+    email_body: str
+
+
+@dataclass(slots=True)
+class NewsArticle:
+    """
+    A news search result, parsed once when it is retrieved.
+    `date` keeps the date as returned by the search API, `published` its parsed UTC value
+    (None when missing or unparseable).
+    """
+
+    title: str
+    snippet: str
+    link: str
+    date: str = ""
+    published: Optional[datetime] = field(default=None, repr=False)
+    domain: str = ""
+    score: int = 0
+    holding: Optional[str] = None
+
+
+def state_json_default(value: Any) -> Any:
+    """`default` of json.dumps for graph state: records become objects, timestamps and other objects strings"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    return str(value)
 
 
 class SupervisorState(TypedDict):
+    # Nodes return only the keys they produce; LangGraph merges them into the state
 
     # initial state attributes from
     # meeting invite
@@ -26,14 +67,14 @@ class SupervisorState(TypedDict):
     email_summary: Optional[str]  # final outlook output 1
     recent_email_summary: Optional[str]  # final outlook output 2
     recent_client_questions: Optional[str]  # final outlook output 3
-    recent_all_emails_dict: Optional[dict]
-    recent_client_emails_dict: Optional[dict]
+    recent_all_emails: Optional[list[EmailRecord]]
+    recent_client_emails: Optional[list[EmailRecord]]
 
 
     # Finnews response generation
-    macro_news_sources: Optional[list[dict]]
-    client_industry_sources: Optional[list[dict]]
-    client_holdings_sources: Optional[list[dict]]
+    macro_news_sources: Optional[list[NewsArticle]]
+    client_industry_sources: Optional[list[NewsArticle]]
+    client_holdings_sources: Optional[dict[str, list[NewsArticle]]]  # by holding
     finnews_summary: Optional[str]  # final finnews output
 
     # Preference Data
@@ -62,3 +103,6 @@ class SupervisorState(TypedDict):
 
     # Processing metadata
     messages: List[Dict[str, Any]]  # Track conversation with LLM for analysis
+    node_profile: Annotated[
+        List[Dict[str, Any]], operator.add
+    ]  # one entry per node run (core.profiling)
@@ -3,10 +3,10 @@ import pandas as pd
 from sqlalchemy import text
 
 from currensee.agents.tools.base import SupervisorState
-from currensee.utils.db_utils import create_pg_engine
+from currensee.ingest.exposure import top_positions
+from currensee.utils.db_utils import get_engine
 
 DB_NAME = "crm"
-engine = create_pg_engine(db_name=DB_NAME)
 
 
 def retrieve_client_industry(client_company: str) -> str:
@@ -17,7 +17,7 @@ def retrieve_client_industry(client_company: str) -> str:
         WHERE company = '{client_company}'
     """
 
-    company_data = pd.read_sql(query_str, con=engine)
+    company_data = pd.read_sql(query_str, con=get_engine(DB_NAME))
 
     client_company = company_data["industry"].iloc[0]
 
@@ -26,21 +26,8 @@ def retrieve_client_industry(client_company: str) -> str:
 
 def retrieve_client_holdings(client_company: str) -> list[str]:
 
-    query_str = f"""
-        SELECT fd.position_name
-        FROM portfolio po
-        JOIN fund_detail fd ON po.symbol = fd.fund
-        WHERE po.company = '{client_company}'
-        AND po.fund_type = 'Equity Fund'
-        ORDER BY (po.fund_balance * fd.weight) DESC
-        LIMIT 5
-"""
-
-    portfolio_data = pd.read_sql(query_str, con=engine)
-
-    portfolio_positions = portfolio_data["position_name"]
-
-    return list(portfolio_positions)
+    # Served from the materialized client_exposure table (see currensee.ingest.exposure)
+    return top_positions(get_engine(DB_NAME), client_company, limit=5)
 
 
 def retrieve_client_company_from_email(client_email: str) -> str:
@@ -51,7 +38,7 @@ def retrieve_client_company_from_email(client_email: str) -> str:
         WHERE email = '{client_email}'
     """
 
-    contact_data = pd.read_sql(query_str, con=engine)
+    contact_data = pd.read_sql(query_str, con=get_engine(DB_NAME))
 
     client_company = contact_data["company"].iloc[0]
 
@@ -66,7 +53,7 @@ def retrieve_all_client_emails_for_company(client_company: str) -> str:
         WHERE company = '{client_company}'
     """
 
-    all_company_contacts = pd.read_sql(query_str, con=engine)
+    all_company_contacts = pd.read_sql(query_str, con=get_engine(DB_NAME))
 
     all_client_emails = all_company_contacts["email"]
 
@@ -87,10 +74,9 @@ def retrieve_client_metadata(state: SupervisorState) -> dict:
         client_company=client_company
     )
 
-    new_state = state.copy()
-    new_state["client_company"] = client_company
-    new_state["client_holdings"] = client_holdings
-    new_state["client_industry"] = client_industry
-    new_state["all_client_emails"] = all_client_emails
-
-    return new_state
+    return {
+        "client_company": client_company,
+        "client_holdings": client_holdings,
+        "client_industry": client_industry,
+        "all_client_emails": all_client_emails,
+    }
@@ -9,77 +9,63 @@ This module provides comprehensive financial news gathering capabilities for:
 Designed for enterprise-grade financial intelligence gathering.
 """
 
-from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, TypedDict
+import logging
 import pprint
+import threading
+import time
 
-import matplotlib.pyplot as plt
 import pandas as pd
-import pandas_datareader.data as web
-from dateutil import parser as date_parser
 from langchain_community.utilities import GoogleSerperAPIWrapper
 from langchain_core.messages import HumanMessage
-from tabulate import tabulate
-import re
-
-from currensee.agents.tools.base import SupervisorState
-from currensee.core import get_model, settings
-
-# === Model ===
-model = get_model(settings.DEFAULT_MODEL)
-
 
+from currensee.agents.tools.article_serializer import (
+    serialize_articles,
+    serialize_holdings,
+)
+from currensee.agents.tools.base import NewsArticle, SupervisorState
+from currensee.agents.tools.news_ranking import (
+    NewsCategoryConfig,
+    compile_keywords,
+    compile_sites,
+    rank_articles,
+    resolve_date_window,
+)
+from currensee.core import get_default_model
+from currensee.core.batch import shared_call
+from currensee.core.holdings_news import get_position_news
+from currensee.core.profiling import record_search_call
+from currensee.core.settings import get_serper_api_key
+from currensee.utils.date_utils import normalize_date
+
+logger = logging.getLogger(__name__)
 
 # definitions
 
 
-# function to parse dates in various string formatt
-def parse_flexible_date(date_str):
-    try:
-        # Try parsing with dateutil first
-        return date_parser.parse(date_str).replace(tzinfo=None)
-    except (ValueError, TypeError):
-        pass
-
-    # Normalize and parse relative dates
-    now = datetime.now()
-
-    # Match 'X days ago' or 'X hours ago'
-    day_match = re.match(r'(\d+)\s+day[s]?\s+ago', date_str)
-    hour_match = re.match(r'(\d+)\s+hour[s]?\s+ago', date_str)
-
-    if day_match:
-        days = int(day_match.group(1))
-        return now - timedelta(days=days)
-    elif hour_match:
-        hours = int(hour_match.group(1))
-        return now - timedelta(hours=hours)
-
-    raise ValueError(f"Unrecognized date format: {date_str}")
-
-
-
 def format_google_date(date_obj):
     return date_obj.strftime("%Y%m%d")
 
 
-def score_result(result):
-    score = 0
-    keywords = keywords_client
+def to_news_article(
+    result: Dict[str, Any], holding: Optional[str] = None
+) -> NewsArticle:
+    """Build a NewsArticle from a Serper result, parsing its date and source once."""
     link = result.get("link", "")
-    title = result.get("title", "").lower()
-    snippet = result.get("snippet", "").lower()
-
-    if any(site in link for site in allowed_sites):
-        score += 3
-
-    if any(word in title or word in snippet for word in keywords):
-        score += 2
-
-    if "date" in result:
-        score += 1
-
-    return score
+    date = result.get("date") or ""
+    published = normalize_date(date)
+
+    parts = link.split("/")
+    article = NewsArticle(
+        title=result.get("title", ""),
+        snippet=result.get("snippet", ""),
+        link=link,
+        date=str(date),
+        published=published,
+        domain=parts[2].lower() if len(parts) > 2 else "",
+        holding=holding,
+    )
+    return article
 
 
 keywords_client = [
@@ -138,14 +124,67 @@ def get_site_queries(base_query: str) -> List[str]:
     """Generate individual site-specific queries to avoid URL encoding issues with OR operators."""
     return [f"site:{site} {base_query}" for site in allowed_sites]
 
-def aggregate_search_results(search: GoogleSerperAPIWrapper, queries: List[str], max_results_per_site: int = 5) -> List[Dict[str, Any]]:
-    """Execute multiple queries and aggregate results with deduplication."""
+
+# Scoring and filtering settings of each news category (see news_ranking)
+CLIENT_INDUSTRY_NEWS = NewsCategoryConfig(
+    name="client_industry",
+    keywords=compile_keywords(keywords_client),
+    trusted_sites=compile_sites(allowed_sites),
+    lookback_days=90,  # comprehensive news coverage
+    recent_days=30,
+    include_score=5,
+    max_results_per_site=8,
+)
+MACRO_NEWS = NewsCategoryConfig(
+    name="macro",
+    keywords=compile_keywords(keywords_client),
+    trusted_sites=compile_sites(allowed_sites),
+    lookback_days=180,  # 6-month macro context
+    recent_days=60,
+    include_score=5,
+    max_results_per_site=6,
+)
+HOLDINGS_NEWS = NewsCategoryConfig(
+    name="holdings",
+    keywords=compile_keywords(keywords_client),
+    trusted_sites=compile_sites(allowed_sites),
+    lookback_days=60,
+    recent_days=45,
+    include_score=4,
+    max_results_per_site=4,
+)
+
+
+def _search(search: GoogleSerperAPIWrapper, query: str) -> Dict[str, Any]:
+    start = time.perf_counter()
+    failed = True
+    try:
+        results = search.results(query)
+        failed = False
+        return results
+    finally:
+        record_search_call(time.perf_counter() - start, failed)
+
+
+def aggregate_search_results(
+    search: GoogleSerperAPIWrapper,
+    queries: List[str],
+    max_results_per_site: int = 5,
+    raise_if_all_failed: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Execute multiple queries and aggregate results with deduplication.
+    With raise_if_all_failed, an outage (every query failing) raises the last error
+    instead of returning no results.
+    """
     all_results = []
     seen_urls = set()
+    failures = []
     
     for query in queries:
         try:
-            results = search.results(query)
+            # Identical queries from other reports of a batch are only sent once
+            results = shared_call(("serper", query), lambda: _search(search, query))
             organic_results = results.get("organic", [])
             
             # Add unique results from this site
@@ -157,10 +196,14 @@ def aggregate_search_results(search: GoogleSerperAPIWrapper, queries: List[str],
                     
         except Exception as e:
             print(f"Warning: Query failed for '{query[:50]}...': {e}")
+            failures.append(e)
             continue
-    
+
+    if raise_if_all_failed and queries and len(failures) == len(queries):
+        raise failures[-1]
     return all_results
 
+
 # Simple query templates (no complex OR operators)
 query_mn_base = "news about relevant macro events and the economy"
 query_ci_base = "news about {client_company} and about {industry} industry"
@@ -177,84 +220,42 @@ def retrieve_client_industry_news(state: SupervisorState) -> dict:
     Uses robust multi-query approach with individual site searches.
     """
     
-    # Enhanced date handling with fallback logic
-    try:
-        end_date = datetime.strptime(state["meeting_timestamp"], "%Y-%m-%d %H:%M:%S")
-        if state.get("last_meeting_timestamp"):
-            start_date = datetime.strptime(state["last_meeting_timestamp"], "%Y-%m-%d %H:%M:%S")
-        else:
-            start_date = end_date - timedelta(days=90)  # 90-day lookback for comprehensive news coverage
-            print(f"INFO: Using 90-day lookback as last_meeting_timestamp not available")
-    except (ValueError, KeyError) as e:
-        print(f"ERROR: Invalid date format in state. Details: {e}")
-        return state
+    window = resolve_date_window(state, CLIENT_INDUSTRY_NEWS.lookback_days)
+    if window is None:
+        return {}
+    start_date, end_date = window
 
     client_company = state["client_company"]
     industry = state["client_industry"]
-    
-    print(f"DEBUG: Filtering date range is from {start_date.date()} to {end_date.date()}")
+
+    logger.debug(
+        f"Filtering date range is from {start_date.date()} to {end_date.date()}"
+    )
 
     # --- Step 1: Use robust multi-query approach ---
     base_query = query_ci_base.format(client_company=client_company, industry=industry)
     queries = get_site_queries(base_query)
+
+    logger.debug(
+        f"Executing {len(queries)} site-specific queries for client industry news"
+    )
+
+    search = GoogleSerperAPIWrapper(serper_api_key=get_serper_api_key())
+    raw_results = aggregate_search_results(
+        search, queries, max_results_per_site=CLIENT_INDUSTRY_NEWS.max_results_per_site
+    )
     
-    print(f"DEBUG: Executing {len(queries)} site-specific queries for client industry news")
-    
-    search = GoogleSerperAPIWrapper()
-    raw_results = aggregate_search_results(search, queries, max_results_per_site=8)
-    
-    print(f"DEBUG: Aggregated {len(raw_results)} unique results from all sites")
-    
-    # --- Step 2: Enhanced filtering with flexible date logic ---
-    filtered_results = []
-    
-    for result in raw_results:
-        # Enhanced scoring
-        score = score_result(result)
-        result["relevance_score"] = score
-        
-        # Check if from trusted source (should always be true with our approach)
-        link = result.get("link", "")
-        is_trusted = any(site in link for site in allowed_sites)
-        
-        # Enhanced date filtering with fallback handling
-        result_date = None
-        if "date" in result:
-            try:
-                if isinstance(result["date"], str):
-                    result_date = parse_flexible_date(result["date"])
-                    #result_date = date_parser.parse(result["date"]).replace(tzinfo=None)
-                   # print(f"DEBUG: good date: '{result.get('date')}', formated to: {result_date } ")
-
-                else:
-                    result_date = result["date"]
-            except (ValueError, TypeError) as e:
-                print(f"DEBUG: Could not parse date '{result.get('date')}': {e}")
-                print(f"DEBUG: Bad date: '{result.get('date')}' ")
-                # For articles without valid dates, include if high relevance score
-                if score >= 4:
-                    result_date = end_date  # Treat as recent
-        
-        # Flexible date filtering: include if within meeting window OR recent high-quality
-        is_recent_or_relevant = False
-        if result_date:
-            is_within_window = start_date <= result_date <= end_date
-            is_recent_quality = (end_date - timedelta(days=30)) <= result_date <= end_date and score >= 3
-            is_recent_or_relevant = is_within_window or is_recent_quality
-        elif score >= 5:  # Very high relevance, include even without date
-            is_recent_or_relevant = True
-        
-        # Multi-tier filtering: prefer trusted + relevant, but include high-scoring articles
-        if (is_trusted and is_recent_or_relevant) or score >= 5:
-            filtered_results.append(result)
-    
-    # Sort by relevance score (highest first)
-    filtered_results.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
+    logger.debug(f"Aggregated {len(raw_results)} unique results from all sites")
     
-    print(f"DEBUG: After filtering: {len(filtered_results)} articles remain")
+    # Score, filter on the meeting window and rank in one pass
+    articles = [to_news_article(result) for result in raw_results]
+    filtered_results = rank_articles(
+        articles, start_date, end_date, CLIENT_INDUSTRY_NEWS
+    )
+
+    logger.debug(f"After filtering: {len(filtered_results)} articles remain")
     
-    state["client_industry_sources"] = filtered_results
-    return state
+    return {"client_industry_sources": filtered_results}
 
 
 
@@ -265,173 +266,100 @@ def retrieve_macro_news(state: SupervisorState) -> dict:
     Avoids URL encoding issues by using individual site queries.
     """
     
-    # Enhanced date handling with fallback logic
-    try:
-        end_date = datetime.strptime(state["meeting_timestamp"], "%Y-%m-%d %H:%M:%S")
-        if state.get("last_meeting_timestamp"):
-            start_date = datetime.strptime(state["last_meeting_timestamp"], "%Y-%m-%d %H:%M:%S")
-        else:
-            start_date = end_date - timedelta(days=180)  # 6-month lookback for macro context
-            print(f"INFO: Using 180-day lookback for macro news")
-    except (ValueError, KeyError) as e:
-        print(f"ERROR: Invalid date format in state. Details: {e}")
-        return state
-
-    print(f"DEBUG: Filtering date range is from {start_date.date()} to {end_date.date()}")
-    
+    window = resolve_date_window(state, MACRO_NEWS.lookback_days)
+    if window is None:
+        return {}
+    start_date, end_date = window
+
+    logger.debug(
+        f"Filtering date range is from {start_date.date()} to {end_date.date()}"
+    )
+
     # --- Step 1: Use robust multi-query approach ---
     queries = get_site_queries(query_mn_base)
     
-    print(f"DEBUG: Executing {len(queries)} site-specific queries for macro news")
+    logger.debug(f"Executing {len(queries)} site-specific queries for macro news")
     
-    search = GoogleSerperAPIWrapper()
-    raw_results = aggregate_search_results(search, queries, max_results_per_site=6)
-    
-    print(f"DEBUG: Aggregated {len(raw_results)} unique macro results from all sites")
-    
-    # --- Step 2: Enhanced filtering with flexible date logic ---
-    filtered_results = []
+    search = GoogleSerperAPIWrapper(serper_api_key=get_serper_api_key())
+    raw_results = aggregate_search_results(
+        search, queries, max_results_per_site=MACRO_NEWS.max_results_per_site
+    )
     
-    for result in raw_results:
-        # Enhanced scoring
-        score = score_result(result)
-        result["relevance_score"] = score
-        
-        # Check if from trusted source (should always be true with our approach)
-        link = result.get("link", "")
-        is_trusted = any(site in link for site in allowed_sites)
-        
-        # Enhanced date filtering with fallback handling
-        result_date = None
-        if "date" in result:
-            try:
-                if isinstance(result["date"], str):
-                    result_date = parse_flexible_date(result["date"])
-                    #result_date = date_parser.parse(result["date"]).replace(tzinfo=None)
-                else:
-                    result_date = result["date"]
-            except (ValueError, TypeError) as e:
-                print(f"DEBUG: Could not parse date '{result.get('date')}': {e}")
-                # For articles without valid dates, include if high relevance score
-                if score >= 4:
-                    result_date = end_date  # Treat as recent
-        
-        # Flexible date filtering: include if within meeting window OR recent high-quality
-        is_recent_or_relevant = False
-        if result_date:
-            is_within_window = start_date <= result_date <= end_date
-            is_recent_quality = (end_date - timedelta(days=60)) <= result_date <= end_date and score >= 3
-            is_recent_or_relevant = is_within_window or is_recent_quality
-        elif score >= 5:  # Very high relevance, include even without date
-            is_recent_or_relevant = True
-        
-        # Multi-tier filtering: prefer trusted + relevant, but include high-scoring articles
-        if (is_trusted and is_recent_or_relevant) or score >= 5:
-            filtered_results.append(result)
+    logger.debug(f"Aggregated {len(raw_results)} unique macro results from all sites")
     
-    # Sort by relevance score (highest first)
-    filtered_results.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
+    # Score, filter on the meeting window and rank in one pass
+    articles = [to_news_article(result) for result in raw_results]
+    filtered_results = rank_articles(articles, start_date, end_date, MACRO_NEWS)
     
-    print(f"DEBUG: After filtering: {len(filtered_results)} macro articles remain")
+    logger.debug(f"After filtering: {len(filtered_results)} macro articles remain")
     
-    state["macro_news_sources"] = filtered_results
-    return state
+    return {"macro_news_sources": filtered_results}
+
+
+def search_holding_news(holding: str) -> List[NewsArticle]:
+    """Search the trusted sites for news about a holding (unranked); raises if every query fails"""
+    # Use robust multi-query approach for each holding
+    base_query = query_ch_base.format(holding=holding)
+    queries = get_site_queries(base_query)
+
+    logger.debug(
+        f"Executing {len(queries)} site-specific queries for holding '{holding}'"
+    )
 
+    search = GoogleSerperAPIWrapper(serper_api_key=get_serper_api_key())
+    raw_results = aggregate_search_results(
+        search,
+        queries,
+        max_results_per_site=HOLDINGS_NEWS.max_results_per_site,
+        raise_if_all_failed=True,
+    )
+
+    logger.debug(
+        f"Aggregated {len(raw_results)} unique results for holding '{holding}'"
+    )
+
+    return [to_news_article(result, holding=holding) for result in raw_results]
 
 
 def retrieve_holdings_news(state: SupervisorState) -> dict:
     """
-    Return relevant news for client holdings using robust multi-query approach.
-    Avoids URL encoding issues by using individual site queries per holding.
+    Return relevant news for client holdings.
+    Articles come from the holdings news store shared by all clients; holdings
+    missing from it (or stale) are searched with individual site queries.
     """
 
-    # Enhanced date handling with fallback logic
-    try:
-        end_date = datetime.strptime(state["meeting_timestamp"], "%Y-%m-%d %H:%M:%S")
-        if state.get("last_meeting_timestamp"):
-            start_date = datetime.strptime(state["last_meeting_timestamp"], "%Y-%m-%d %H:%M:%S")
-        else:
-            start_date = end_date - timedelta(days=60)  # 60-day lookback for holdings
-            print(f"INFO: Using 60-day lookback for holdings news")
-    except (ValueError, KeyError) as e:
-        print(f"ERROR: Invalid date format in state. Details: {e}")
-        return state
-
-    print(f"DEBUG: Filtering date range is from {start_date.date()} to {end_date.date()}")
+    window = resolve_date_window(state, HOLDINGS_NEWS.lookback_days)
+    if window is None:
+        return {}
+    start_date, end_date = window
+
+    logger.debug(
+        f"Filtering date range is from {start_date.date()} to {end_date.date()}"
+    )
 
     holdings = state.get("client_holdings", [])
-    search = GoogleSerperAPIWrapper()
     holdings_news_by_ticker = {}
 
     for holding in holdings:
-        print(f"DEBUG: Processing holding '{holding}'")
-        
-        # Use robust multi-query approach for each holding
-        base_query = query_ch_base.format(holding=holding)
-        queries = get_site_queries(base_query)
-        
-        print(f"DEBUG: Executing {len(queries)} site-specific queries for holding '{holding}'")
-        
-        # Get results for this holding
-        raw_results = aggregate_search_results(search, queries, max_results_per_site=4)
-        
-        print(f"DEBUG: Aggregated {len(raw_results)} unique results for holding '{holding}'")
-        
-        # Enhanced filtering with flexible date logic
-        filtered_results = []
-        
-        for result in raw_results:
-            # Enhanced scoring
-            score = score_result(result)
-            result["relevance_score"] = score
-            result["holding"] = holding  # Track which holding this is for
-            
-            # Check if from trusted source (should always be true with our approach)
-            link = result.get("link", "")
-            is_trusted = any(site in link for site in allowed_sites)
-            
-            # Enhanced date filtering with fallback handling
-            result_date = None
-            if "date" in result:
-                try:
-                    if isinstance(result["date"], str):
-                        result_date = parse_flexible_date(result["date"])
-                        #result_date = date_parser.parse(result["date"]).replace(tzinfo=None)
-                    else:
-                        result_date = result["date"]
-                except (ValueError, TypeError) as e:
-                    print(f"DEBUG: Could not parse date '{result.get('date')}': {e}")
-                    # For articles without valid dates, include if high relevance score
-                    if score >= 4:
-                        result_date = end_date  # Treat as recent
-            
-            # Flexible date filtering: include if within meeting window OR recent high-quality
-            is_recent_or_relevant = False
-            if result_date:
-                is_within_window = start_date <= result_date <= end_date
-                is_recent_quality = (end_date - timedelta(days=45)) <= result_date <= end_date and score >= 3
-                is_recent_or_relevant = is_within_window or is_recent_quality
-            elif score >= 5:  # Very high relevance, include even without date
-                is_recent_or_relevant = True
-            
-            # Multi-tier filtering: prefer trusted + relevant, but include high-scoring articles
-            if (is_trusted and is_recent_or_relevant) or score >= 4:
-                filtered_results.append(result)
-        
-        # Sort by relevance score for this holding
-        filtered_results.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
-        
-        print(f"DEBUG: After filtering: {len(filtered_results)} articles for holding '{holding}'")
-        
+        logger.debug(f"Processing holding '{holding}'")
+
+        articles = get_position_news(holding)
+
+        # Score, filter on the meeting window and rank in one pass
+        filtered_results = rank_articles(articles, start_date, end_date, HOLDINGS_NEWS)
+
+        logger.debug(
+            f"After filtering: {len(filtered_results)} articles for holding '{holding}'"
+        )
+
         # Group by ticker as expected by sourcing utility
         holdings_news_by_ticker[holding] = filtered_results
     
     # Calculate total for logging
     total_articles = sum(len(articles) for articles in holdings_news_by_ticker.values())
-    print(f"DEBUG: Total holdings news articles after all filtering: {total_articles}")
+    logger.debug(f"Total holdings news articles after all filtering: {total_articles}")
     
-    state["client_holdings_sources"] = holdings_news_by_ticker
-    return state
+    return {"client_holdings_sources": holdings_news_by_ticker}
 
 
     
@@ -444,25 +372,23 @@ def summarize_finance_outputs(state: SupervisorState):
     - state: SupervisorState with financial news outputs
 
     Returns:
-    - Updated state with financial summary, even if some sources are empty
+    - State update with the financial summary, even if some sources are empty
     """
     
     client_industry_output = state.get("client_industry_sources", [])
     client_holdings_output = state.get("client_holdings_sources", [])
-    print(f"DEBUG: Retrieved holdings output length{len(client_holdings_output)}, type: {type(client_holdings_output)} ")
+    logger.debug(
+        f"Retrieved holdings output length{len(client_holdings_output)}, type: {type(client_holdings_output)} "
+    )
     macro_finnews_output = state.get("macro_news_sources", [])
     
 
     has_industry = len(client_industry_output) > 0
-    print(f"DEBUG: has_industry: {has_industry}")
+    logger.debug(f"has_industry: {has_industry}")
     has_holdings = len(client_holdings_output) > 0
-    print(f"DEBUG: has_holdings: {has_holdings}")
+    logger.debug(f"has_holdings: {has_holdings}")
     has_macro = len(macro_finnews_output) > 0
-    print(f"DEBUG: has_macro: {has_macro}")
-    
-    print(f"DEBUG: Summarizer input - Industry: {len(client_industry_output) if has_industry else 0} articles")
-    print(f"DEBUG: Summarizer input - Holdings: {len(client_holdings_output) if has_holdings else 0} articles")
-    print(f"DEBUG: Summarizer input - Macro: {len(macro_finnews_output) if has_macro else 0} articles")
+    logger.debug(f"has_macro: {has_macro}")
 
    # print(f"holdings output : {client_holdings_output}")
     
@@ -479,24 +405,29 @@ def summarize_finance_outputs(state: SupervisorState):
             "**Recommendation:** Consider expanding the date range or checking alternative news sources "
             "for the most current market developments affecting the client's portfolio."
         )
-        state["finnews_summary"] = fallback_summary
-        return state
+        return {"finnews_summary": fallback_summary}
     
     # Build summary with available data
     summary_sections = []
     
     if has_industry:
-        summary_sections.append(f"**Client Industry News ({len(client_industry_output)} articles):**\n{client_industry_output}")
+        summary_sections.append(
+            f"**Client Industry News ({len(client_industry_output)} articles):**\n{serialize_articles(client_industry_output)}"
+        )
     else:
         summary_sections.append("**Client Industry News:** No recent industry-specific news found.")
     
     if has_holdings:
-        summary_sections.append(f"**Client Holdings News ({len(client_holdings_output)} articles):**\n{client_holdings_output}")
+        summary_sections.append(
+            f"**Client Holdings News ({len(client_holdings_output)} articles):**\n{serialize_holdings(client_holdings_output)}"
+        )
     else:
         summary_sections.append("**Client Holdings News:** No recent holdings-specific news found.")
     
     if has_macro:
-        summary_sections.append(f"**Macroeconomic News ({len(macro_finnews_output)} articles):**\n{macro_finnews_output}")
+        summary_sections.append(
+            f"**Macroeconomic News ({len(macro_finnews_output)} articles):**\n{serialize_articles(macro_finnews_output)}"
+        )
     else:
         summary_sections.append("**Macroeconomic News:** No recent macro news found.")
     
@@ -514,8 +445,8 @@ def summarize_finance_outputs(state: SupervisorState):
 
     try:
         messages = [HumanMessage(content=prompt)]
-        result = model.invoke(messages)
-        state["finnews_summary"] = result.content
+        result = get_default_model().invoke(messages)
+        finnews_summary = result.content
     except Exception as e:
         print(f"ERROR: Summarization failed: {e}")
         # Provide basic fallback even if LLM fails
@@ -529,19 +460,41 @@ def summarize_finance_outputs(state: SupervisorState):
         
         Note: Automated summarization temporarily unavailable. Please review individual news items above.
         """
-        state["finnews_summary"] = basic_summary
+        finnews_summary = basic_summary
     
-    return state
+    return {"finnews_summary": finnews_summary}
 
 
 # MACRO TABLE
 
+# FRED series update daily at most, so the table is shared by all reports for a while
+MACRO_TABLE_TTL = 6 * 3600
+_macro_table = {"df": None, "fetched_at": 0.0}
+_macro_table_lock = threading.Lock()
+
+
+def get_macro_table(max_age: float = MACRO_TABLE_TTL) -> pd.DataFrame:
+    """The macro table of generate_macro_table, rebuilt when older than max_age seconds."""
+    with _macro_table_lock:
+        if (
+            _macro_table["df"] is None
+            or time.time() - _macro_table["fetched_at"] > max_age
+        ):
+            _macro_table["df"] = generate_macro_table()
+            _macro_table["fetched_at"] = time.time()
+        return _macro_table["df"].copy()
+
 
 def generate_macro_table() -> str:
     """Fetch macroeconomic and market data from FRED and return a Markdown table."""
 
+    # Deferred: pandas_datareader is only needed when the macro table is shown
+    import pandas_datareader.data as web
+
     def fetch_fred_latest(series_id):
-        data = web.DataReader(series_id, "fred")
+        data = shared_call(
+            ("fred", series_id), lambda: web.DataReader(series_id, "fred")
+        )
         return data
 
     def compute_percent_change(series, months):
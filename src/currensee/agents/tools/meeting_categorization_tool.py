@@ -12,18 +12,10 @@ from langchain_core.messages import HumanMessage
 from sqlalchemy import text
 
 from currensee.agents.tools.base import SupervisorState
-from currensee.core import get_model, settings
-from currensee.utils.db_utils import create_pg_engine
+from currensee.core import get_default_model
 
 load_dotenv()
 
-# === Model ===
-model = get_model(settings.DEFAULT_MODEL)
-
-
-# === DB Connection ===
-DB_NAME = "crm_outlook"
-engine = create_pg_engine(db_name=DB_NAME)
 
 def categorize_meeting_topic(state: SupervisorState) -> dict:
     """
@@ -63,14 +55,12 @@ def categorize_meeting_topic(state: SupervisorState) -> dict:
     messages = [HumanMessage(content=prompt)]
 
     # Use the 'invoke' method for summarization
-    meeting_category = model.invoke(messages)
+    meeting_category = get_default_model().invoke(messages)
 
     ############# Return the new state ###############
 
-    new_state = state.copy()
-    new_state["meeting_category"] = meeting_category.content
+    return {"meeting_category": meeting_category.content}
 
-    return new_state
 
 def determine_topic_of_news(state: SupervisorState) -> dict:
     meeting_category = state["meeting_category"]
@@ -90,9 +80,7 @@ def determine_topic_of_news(state: SupervisorState) -> dict:
     elif meeting_category == "Macro Update":
         news_topic = "Federal Reserve Bank, Interest Rates, politics, market conditions"
     
-    new_state = state.copy()
-    new_state["news_focus"] = news_topic
-    return new_state
+    return {"news_focus": news_topic}
 
     
         
@@ -0,0 +1,156 @@
+"""
+Run-level deduplication of the news retrieved by the finance tools.
+
+Each retrieval tool only dedupes its own results, so a wire story syndicated
+on several sites, or found both as macro and as holdings news, would reach
+the summarizers several times. `dedupe_news_sources` runs after the last
+retrieval node and indexes all articles of the run together: exact duplicates
+are detected by canonical URL, near-duplicates by a 64-bit SimHash of the
+title and snippet. Each cluster keeps its best-scoring article (the first
+one retrieved on ties); the others are dropped from their category.
+"""
+
+import hashlib
+import logging
+import re
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from currensee.agents.tools.base import NewsArticle, SupervisorState
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+# Titles and snippets are short, so syndicated copies differ by a few bits more
+# than long documents would
+MAX_HAMMING_DISTANCE = 6
+# Near-duplicates share at least one band exactly, so only those are compared
+BANDS = MAX_HAMMING_DISTANCE + 1
+BAND_BITS = SIMHASH_BITS // BANDS
+
+TRACKING_PARAMS = re.compile(
+    r"^(utm_\w+|ncid|cmpid|mod|guccounter|yptr|fbclid|gclid|taid|src)$", re.IGNORECASE
+)
+WORD = re.compile(r"\w+")
+
+
+def canonical_url(link: str) -> str:
+    """URL with scheme, www., fragment, tracking parameters and trailing slash removed"""
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(
+        sorted(
+            (k, v) for k, v in parse_qsl(parts.query) if not TRACKING_PARAMS.match(k)
+        )
+    )
+    return urlunsplit(("", host, parts.path.rstrip("/"), query, ""))
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over the words and word bigrams of a text"""
+    words = WORD.findall(text.lower())
+    features = words + [" ".join(pair) for pair in zip(words, words[1:])]
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        h = int.from_bytes(
+            hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big"
+        )
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+class ArticleIndex:
+    """Clusters articles by canonical URL and SimHash, tracking the best of each cluster"""
+
+    def __init__(self):
+        self._by_url: Dict[str, int] = {}
+        self._bands: Dict[tuple, List[int]] = {}
+        self._hashes: List[int] = []
+        self._best: List[NewsArticle] = []
+
+    def __len__(self) -> int:
+        return len(self._best)
+
+    def _find_cluster(self, url: str, fingerprint: int) -> Optional[int]:
+        if url in self._by_url:
+            return self._by_url[url]
+        for band in range(BANDS):
+            key = (band, fingerprint >> (band * BAND_BITS) & ((1 << BAND_BITS) - 1))
+            for cluster in self._bands.get(key, ()):
+                if (
+                    bin(self._hashes[cluster] ^ fingerprint).count("1")
+                    <= MAX_HAMMING_DISTANCE
+                ):
+                    return cluster
+        return None
+
+    def add(self, article: NewsArticle) -> None:
+        url = canonical_url(article.link)
+        fingerprint = simhash(f"{article.title} {article.snippet}")
+        cluster = self._find_cluster(url, fingerprint)
+
+        if cluster is None:
+            cluster = len(self._best)
+            self._hashes.append(fingerprint)
+            self._best.append(article)
+            for band in range(BANDS):
+                key = (band, fingerprint >> (band * BAND_BITS) & ((1 << BAND_BITS) - 1))
+                self._bands.setdefault(key, []).append(cluster)
+        elif article.score > self._best[cluster].score:
+            self._best[cluster] = article
+        self._by_url.setdefault(url, cluster)
+
+    def representatives(self) -> List[NewsArticle]:
+        """Best-scoring article of each cluster"""
+        return list(self._best)
+
+
+def _articles(items) -> List[NewsArticle]:
+    return (
+        [a for a in items if isinstance(a, NewsArticle)]
+        if isinstance(items, list)
+        else []
+    )
+
+
+def _keep(items, representatives: set):
+    # Non-article entries (e.g. error messages) are left untouched
+    if not isinstance(items, list):
+        return items
+    return [
+        a for a in items if not isinstance(a, NewsArticle) or id(a) in representatives
+    ]
+
+
+def dedupe_news_sources(state: SupervisorState) -> dict:
+    """Drop duplicate and near-duplicate articles across all news categories of the run"""
+    macro = state.get("macro_news_sources") or []
+    industry = state.get("client_industry_sources") or []
+    holdings = state.get("client_holdings_sources") or {}
+
+    # Holdings first: on equal scores the holding-specific copy is kept
+    candidates = [a for items in holdings.values() for a in _articles(items)]
+    candidates += _articles(industry) + _articles(macro)
+    index = ArticleIndex()
+    for article in candidates:
+        index.add(article)
+    representatives = {id(a) for a in index.representatives()}
+
+    logger.debug(
+        f"Deduplicated {len(candidates)} news articles into {len(index)} distinct stories"
+    )
+
+    new_state = {}
+    if "macro_news_sources" in state:
+        new_state["macro_news_sources"] = _keep(macro, representatives)
+    if "client_industry_sources" in state:
+        new_state["client_industry_sources"] = _keep(industry, representatives)
+    if "client_holdings_sources" in state:
+        new_state["client_holdings_sources"] = {
+            holding: _keep(items, representatives)
+            for holding, items in holdings.items()
+        }
+    return new_state
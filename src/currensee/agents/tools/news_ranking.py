@@ -0,0 +1,144 @@
+"""
+Relevance scoring and filtering of news search results.
+
+All news categories (client industry, macro, holdings) go through the same
+stage: articles are scored and filtered as a batch, with the trusted-source and
+keyword checks done by one precompiled regular expression each and the date
+window checks done on numpy datetime arrays. Categories only differ in their
+`NewsCategoryConfig`.
+
+Scoring: +3 trusted source, +2 keyword in title or snippet, +1 dated.
+An article is kept when it is from a trusted source and recent or relevant
+enough, or when its score alone clears `include_score`.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from currensee.agents.tools.base import NewsArticle
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def compile_keywords(keywords: Iterable[str]) -> re.Pattern:
+    """One case-insensitive pattern matching any of the keywords"""
+    alternatives = sorted({k.lower() for k in keywords}, key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in alternatives), re.IGNORECASE)
+
+
+def compile_sites(sites: Iterable[str]) -> re.Pattern:
+    """Pattern matching a domain that is one of the sites or a subdomain of one"""
+    alternatives = "|".join(re.escape(site.lower()) for site in sites)
+    return re.compile(rf"(?:^|\.)(?:{alternatives})$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class NewsCategoryConfig:
+    """Search and filtering settings of a news category"""
+
+    name: str
+    keywords: re.Pattern
+    trusted_sites: re.Pattern
+    lookback_days: int  # window start when there is no previous meeting
+    recent_days: int  # recent articles are kept if they score at least min_recent_score
+    include_score: int  # articles scoring this much are always kept
+    max_results_per_site: int
+    min_recent_score: int = 3
+    undated_recent_score: int = 4  # unparseable dates count as recent from this score
+    undated_include_score: int = 5  # undated articles are relevant from this score
+
+
+def resolve_date_window(
+    state: dict, lookback_days: int
+) -> Optional[Tuple[datetime, datetime]]:
+    """
+    News window of a meeting: from the last meeting (or `lookback_days` before
+    the meeting when there was none) to the meeting itself. None if the
+    timestamps in the state are invalid.
+    """
+    try:
+        end_date = datetime.strptime(state["meeting_timestamp"], TIMESTAMP_FORMAT)
+        if state.get("last_meeting_timestamp"):
+            start_date = datetime.strptime(
+                state["last_meeting_timestamp"], TIMESTAMP_FORMAT
+            )
+        else:
+            start_date = end_date - timedelta(days=lookback_days)
+            print(
+                f"INFO: Using {lookback_days}-day lookback as last_meeting_timestamp not available"
+            )
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"ERROR: Invalid date format in state. Details: {e}")
+        return None
+    return start_date, end_date
+
+
+def _matches(pattern: re.Pattern, texts: List[str]) -> np.ndarray:
+    return np.fromiter((pattern.search(t) is not None for t in texts), bool, len(texts))
+
+
+def rank_articles(
+    articles: List[NewsArticle],
+    start_date: datetime,
+    end_date: datetime,
+    config: NewsCategoryConfig,
+) -> List[NewsArticle]:
+    """
+    Score and filter articles for the meeting window in one pass.
+
+    Returns:
+        The kept articles, highest score first (ties keep their search order)
+    """
+    if not articles:
+        return []
+
+    trusted = _matches(config.trusted_sites, [a.domain for a in articles])
+    keyword = _matches(config.keywords, [f"{a.title}\n{a.snippet}" for a in articles])
+    has_raw_date = np.fromiter((bool(a.date) for a in articles), bool, len(articles))
+
+    scores = 3 * trusted.astype(int) + 2 * keyword + has_raw_date
+    for article, score in zip(articles, scores.tolist()):
+        article.score = score
+
+    # Parsed dates are UTC-aware; meeting timestamps are naive and taken as UTC
+    published = np.array(
+        [
+            (
+                a.published.astimezone(timezone.utc).replace(tzinfo=None)
+                if a.published
+                else "NaT"
+            )
+            for a in articles
+        ],
+        dtype="datetime64[s]",
+    )
+
+    start = np.datetime64(start_date, "s")
+    end = np.datetime64(end_date, "s")
+    recent_start = np.datetime64(end_date - timedelta(days=config.recent_days), "s")
+
+    # Unparseable dates are treated as the meeting date for relevant articles
+    effective = np.where(
+        np.isnat(published) & has_raw_date & (scores >= config.undated_recent_score),
+        end,
+        published,
+    )
+    has_date = ~np.isnat(effective)
+    in_window = (start <= effective) & (effective <= end)
+    recent_quality = (
+        (recent_start <= effective)
+        & (effective <= end)
+        & (scores >= config.min_recent_score)
+    )
+    recent_or_relevant = np.where(
+        has_date, in_window | recent_quality, scores >= config.undated_include_score
+    )
+
+    keep = (trusted & recent_or_relevant) | (scores >= config.include_score)
+    kept = np.flatnonzero(keep)
+    order = kept[np.argsort(-scores[kept], kind="stable")]
+    return [articles[i] for i in order]
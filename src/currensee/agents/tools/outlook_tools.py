@@ -4,19 +4,14 @@ from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage
 from sqlalchemy import text
 
-from currensee.agents.tools.base import SupervisorState
-from currensee.core import get_model, settings
-from currensee.utils.db_utils import create_pg_engine
+from currensee.agents.tools.base import EmailRecord, SupervisorState
+from currensee.core import get_default_model
+from currensee.utils.db_utils import get_engine
 
 load_dotenv()
 
-# === Model ===
-model = get_model(settings.DEFAULT_MODEL)
-
-
 # === DB Connection ===
 DB_NAME = "crm_outlook"
-engine = create_pg_engine(db_name=DB_NAME)
 
 # sql_workflow = create_sql_workflow(
 #     source_db = DB_NAME,
@@ -49,7 +44,7 @@ def find_last_meeting_date(all_client_emails: list[str],  user_email: str, meeti
 
     """
 
-    last_meeting = pd.read_sql(query_str, con=engine)
+    last_meeting = pd.read_sql(query_str, con=get_engine(DB_NAME))
 
     return last_meeting["meeting_timestamp"][0]
 
@@ -78,7 +73,7 @@ def produce_client_email_summary(state: SupervisorState) -> dict:
         and (to_emails = '{user_email}' or from_email = '{user_email}')
     """
 
-    result = pd.read_sql(query_str, con=engine)
+    result = pd.read_sql(query_str, con=get_engine(DB_NAME))
 
     recent_emails = list(result["email_body"])
 
@@ -104,15 +99,14 @@ def produce_client_email_summary(state: SupervisorState) -> dict:
     messages = [HumanMessage(content=summary_prompt)]
 
     # Use the 'invoke' method for summarization
-    email_summary = model.invoke(messages)
+    email_summary = get_default_model().invoke(messages)
 
     ############# Return the new state ###############
 
-    new_state = state.copy()
-    new_state["last_meeting_timestamp"] = last_meeting_date
-    new_state["email_summary"] = email_summary.content
-
-    return new_state
+    return {
+        "last_meeting_timestamp": last_meeting_date,
+        "email_summary": email_summary.content,
+    }
 
 
 def produce_recent_client_email_summary(state: SupervisorState) -> dict:
@@ -137,7 +131,7 @@ def produce_recent_client_email_summary(state: SupervisorState) -> dict:
         limit 5
     """
 
-    result = pd.read_sql(query_str, con=engine)
+    result = pd.read_sql(query_str, con=get_engine(DB_NAME))
 
     recent_emails = list(result["email_body"])
 
@@ -173,15 +167,14 @@ def produce_recent_client_email_summary(state: SupervisorState) -> dict:
     messages = [HumanMessage(content=summary_prompt)]
 
     # Use the 'invoke' method for summarization
-    recent_email_summary = model.invoke(messages)
+    recent_email_summary = get_default_model().invoke(messages)
 
     ############# Return the new state ###############
 
-    new_state = state.copy()
-    new_state["last_meeting_timestamp"] = last_meeting_date
-    new_state["recent_email_summary"] = recent_email_summary.content
-
-    return new_state
+    return {
+        "last_meeting_timestamp": last_meeting_date,
+        "recent_email_summary": recent_email_summary.content,
+    }
 
 
 def produce_recent_client_questions(state: SupervisorState) -> dict:
@@ -206,7 +199,7 @@ def produce_recent_client_questions(state: SupervisorState) -> dict:
         limit 5
     """
 
-    result = pd.read_sql(query_str, con=engine)
+    result = pd.read_sql(query_str, con=get_engine(DB_NAME))
 
     recent_emails = list(result["email_body"])
 
@@ -241,19 +234,29 @@ def produce_recent_client_questions(state: SupervisorState) -> dict:
     messages = [HumanMessage(content=summary_prompt)]
 
     # Use the 'invoke' method for summarization
-    recent_client_questions = model.invoke(messages)
+    recent_client_questions = get_default_model().invoke(messages)
 
     ############# Return the new state ###############
 
-    new_state = state.copy()
-    new_state["last_meeting_timestamp"] = last_meeting_date
-    new_state["recent_client_questions"] = recent_client_questions.content
-
-    return new_state
+    return {
+        "last_meeting_timestamp": last_meeting_date,
+        "recent_client_questions": recent_client_questions.content,
+    }
 
 
 ############## Pull recent emails sent to the user to add to graph ##########################
 
+
+def to_email_records(emails: pd.DataFrame) -> list[EmailRecord]:
+    """Convert an email_data query result into EmailRecords"""
+    return [
+        EmailRecord(str(row[0]), *row[1:])
+        for row in emails[list(EmailRecord.__slots__)].itertuples(
+            index=False, name=None
+        )
+    ]
+
+
 def pull_recent_client_emails(state: SupervisorState) -> dict:
     all_client_emails = state["all_client_emails"]
     meeting_timestamp = state["meeting_timestamp"]
@@ -273,8 +276,8 @@ def pull_recent_client_emails(state: SupervisorState) -> dict:
         order by email_timestamp desc
         limit 20
     """
-    result_all = pd.read_sql(query_str_all, con=engine)
-    recent_all_emails_dict = result_all.to_dict()
+    result_all = pd.read_sql(query_str_all, con=get_engine(DB_NAME))
+    recent_all_emails = to_email_records(result_all)
     
 # recent emails to the user sent from the client
     query_str_client = f"""
@@ -292,11 +295,10 @@ def pull_recent_client_emails(state: SupervisorState) -> dict:
         order by email_timestamp desc
         limit 20
     """
-    result_client = pd.read_sql(query_str_client, con=engine)
-    recent_client_emails_dict = result_client.to_dict()
-    
-    new_state = state.copy()
-    new_state["recent_all_emails_dict"] = recent_all_emails_dict
-    new_state["recent_client_emails_dict"] = recent_client_emails_dict
-    
-    return new_state
\ No newline at end of file
+    result_client = pd.read_sql(query_str_client, con=get_engine(DB_NAME))
+    recent_client_emails = to_email_records(result_client)
+
+    return {
+        "recent_all_emails": recent_all_emails,
+        "recent_client_emails": recent_client_emails,
+    }
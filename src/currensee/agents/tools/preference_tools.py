@@ -3,19 +3,13 @@ import pandas as pd
 from dotenv import load_dotenv
 
 from currensee.agents.tools.base import SupervisorState
-from currensee.core import get_model, settings
-from currensee.utils.db_utils import create_pg_engine
+from currensee.utils.db_utils import get_engine
 
 
 load_dotenv()
 
-# === Model ===
-model = get_model(settings.DEFAULT_MODEL)
-
-
 # === DB Connection ===
 DB_NAME = "crm_outlook"
-engine = create_pg_engine(db_name=DB_NAME)
 
 
 def retrieve_current_formatt_preferences(state: SupervisorState) -> dict:
@@ -32,7 +26,7 @@ def retrieve_current_formatt_preferences(state: SupervisorState) -> dict:
     FROM preferences p
     where p.email = '{user_email}'
     and as_of_date <= '{meeting_timestamp}')a
-    """, con=engine)
+    """, con=get_engine(DB_NAME))
     
     #max_dt = mx_dt_df['as_of_date'][0]
     max_dt = mx_dt_df['as_of_date'].iloc[0]
@@ -50,7 +44,7 @@ def retrieve_current_formatt_preferences(state: SupervisorState) -> dict:
     where p.email = '{user_email}' and p.as_of_date = '{max_dt}'
     """
 
-    pref_df = pd.read_sql(query_str, con=engine)
+    pref_df = pd.read_sql(query_str, con=get_engine(DB_NAME))
     #holdings_detail = pref_df["finance_detail"][0]
     #client_news_detail = pref_df["news_detail"][0]
     #macro_news_detail = pref_df["macro_news_detail"][0]
@@ -62,9 +56,9 @@ def retrieve_current_formatt_preferences(state: SupervisorState) -> dict:
     past_meeting_detail = pref_df["past_meeting_detail"].iloc[0]
 
 
-    new_state = state.copy()
-    new_state["holdings_detail"] = holdings_detail
-    new_state["client_news_detail"] = client_news_detail
-    new_state["macro_news_detail"] = macro_news_detail
-    new_state["past_meeting_detail"] = past_meeting_detail
-    return new_state
+    return {
+        "holdings_detail": holdings_detail,
+        "client_news_detail": client_news_detail,
+        "macro_news_detail": macro_news_detail,
+        "past_meeting_detail": past_meeting_detail,
+    }
@@ -0,0 +1,52 @@
+"""
+Tests for prompt serialization of news articles
+"""
+
+from datetime import datetime, timezone
+
+from currensee.agents.tools.article_serializer import (
+    serialize_articles,
+    serialize_holdings,
+)
+from currensee.agents.tools.base import NewsArticle
+
+
+def test_serialize_articles():
+    low = NewsArticle(
+        "Markets drift",
+        "Quiet session " * 100,
+        "https://cnn.com/a",
+        date="soon",
+        domain="cnn.com",
+        score=1,
+    )
+    high = NewsArticle(
+        "Compass announces record earnings",
+        "Quarterly profit up",
+        "https://www.reuters.com/b",
+        date="Mar 20, 2024",
+        published=datetime(2024, 3, 20, tzinfo=timezone.utc),
+        domain="www.reuters.com",
+        score=6,
+    )
+
+    text = serialize_articles([low, high])
+    lines = text.splitlines()
+    assert (
+        lines[0]
+        == "- Compass announces record earnings (www.reuters.com, 2024-03-20): Quarterly profit up"
+    )
+    assert lines[1].startswith(
+        "- Markets drift (cnn.com, soon): Quiet session"
+    ) and lines[1].endswith("...")
+    assert "https://" not in text
+
+    assert (
+        serialize_articles([low, high], token_budget=20).splitlines()[1]
+        == "(+1 less relevant articles omitted)"
+    )
+    assert serialize_articles([]) == "No articles."
+    assert serialize_articles("Error retrieving news") == "Error retrieving news"
+    assert serialize_holdings({"Compass": [high]}).startswith(
+        "Compass:\n- Compass announces"
+    )
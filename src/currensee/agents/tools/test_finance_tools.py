@@ -0,0 +1,87 @@
+"""
+Tests for news result parsing and scoring
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from currensee.agents.tools.finance_tools import (
+    CLIENT_INDUSTRY_NEWS,
+    HOLDINGS_NEWS,
+    aggregate_search_results,
+    to_news_article,
+)
+from currensee.agents.tools.news_ranking import rank_articles
+from currensee.utils.output_utils_dynamic import format_sources_to_html
+
+
+def test_to_news_article():
+    article = to_news_article(
+        {
+            "title": "Compass announces record earnings",
+            "snippet": "Quarterly profit up",
+            "link": "https://www.reuters.com/markets/compass",
+            "date": "Mar 20, 2024",
+        },
+        holding="Compass",
+    )
+
+    assert article.published == datetime(2024, 3, 20, tzinfo=timezone.utc)
+    assert article.domain == "www.reuters.com"
+    assert article.holding == "Compass"
+
+    undated = to_news_article(
+        {"title": "Markets", "link": "https://example.com/a", "date": "soon"}
+    )
+    assert undated.published is None and undated.date == "soon"
+
+    html = format_sources_to_html([article], "Client Industry News")
+    assert "<p><strong>Source:</strong> www.reuters.com</p>" in html
+
+
+def test_rank_articles():
+    def make(title, link, date=""):
+        return to_news_article({"title": title, "link": link, "date": date})
+
+    in_window = make(
+        "Compass announces record earnings", "https://www.reuters.com/a", "Mar 20, 2024"
+    )
+    trusted_old = make("Compass history", "https://www.WSJ.com/b", "Jan 1, 2020")
+    untrusted = make("Compass CEO steps down", "https://example.com/c", "Mar 21, 2024")
+    trusted_recent = make(
+        "Compass update", "https://finance.yahoo.com/d", "Mar 22, 2024"
+    )
+    start, end = datetime(2024, 3, 1), datetime(2024, 3, 31)
+
+    ranked = rank_articles(
+        [trusted_old, trusted_recent, untrusted, in_window],
+        start,
+        end,
+        CLIENT_INDUSTRY_NEWS,
+    )
+    assert ranked == [in_window, trusted_recent]
+    assert [a.score for a in ranked] == [6, 4]
+    assert trusted_old.score == 4  # trusted regardless of case, but outside the window
+    assert untrusted.score == 3  # keywords match regardless of case
+
+    # Holdings keep anything scoring 4 or more
+    ranked = rank_articles([trusted_old, untrusted], start, end, HOLDINGS_NEWS)
+    assert ranked == [trusted_old]
+    assert rank_articles([], start, end, HOLDINGS_NEWS) == []
+
+
+def test_aggregate_search_results_can_report_an_outage():
+    def results(query):
+        if query != "ok":
+            raise ConnectionError("serper down")
+        return {"organic": [{"link": "https://reuters.com/a"}]}
+
+    search = SimpleNamespace(results=results)
+    assert aggregate_search_results(
+        search, ["down", "ok"], raise_if_all_failed=True
+    ) == [{"link": "https://reuters.com/a"}]
+    assert aggregate_search_results(search, ["down", "down too"]) == []
+    with pytest.raises(ConnectionError):
+        aggregate_search_results(search, ["down", "down too"], raise_if_all_failed=True)
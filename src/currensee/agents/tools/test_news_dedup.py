@@ -0,0 +1,48 @@
+"""
+Tests for run-level news deduplication
+"""
+
+from currensee.agents.tools.base import NewsArticle
+from currensee.agents.tools.news_dedup import canonical_url, dedupe_news_sources
+
+
+def test_canonical_url():
+    assert (
+        canonical_url("https://www.Reuters.com/markets/story/?utm_source=x#top")
+        == "//reuters.com/markets/story"
+    )
+    assert (
+        canonical_url("http://reuters.com/markets/story?id=2")
+        == "//reuters.com/markets/story?id=2"
+    )
+
+
+def test_dedupe_news_sources():
+    title = "Fed holds rates steady as inflation cools"
+    snippet = "The Federal Reserve left its benchmark rate unchanged on Wednesday, citing slower price growth."
+    reuters = NewsArticle(title, snippet, "https://www.reuters.com/fed", score=4)
+    yahoo = NewsArticle(
+        title, snippet + " (Reuters)", "https://finance.yahoo.com/fed", score=6
+    )
+    same_url = NewsArticle(
+        "Fed holds", "", "https://reuters.com/fed/?utm_medium=rss", score=1
+    )
+    other = NewsArticle(
+        "Compass announces record earnings",
+        "Quarterly profit up",
+        "https://cnn.com/compass",
+        score=6,
+    )
+
+    new_state = dedupe_news_sources(
+        {
+            "macro_news_sources": [reuters, same_url],
+            "client_industry_sources": [other],
+            "client_holdings_sources": {"Compass": [yahoo]},
+        }
+    )
+
+    assert new_state["macro_news_sources"] == []
+    assert new_state["client_industry_sources"] == [other]
+    assert new_state["client_holdings_sources"] == {"Compass": [yahoo]}
+    assert dedupe_news_sources({}) == {}
@@ -29,9 +29,25 @@ class Settings:
     DEFAULT_REPORT_LENGTH: str = "long"
     ALLOWED_REPORT_LENGTHS: List[str] = ["short", "medium", "long"]
     
+    # Report Asset Configuration
+    # "static": HTML reports link the hashed, long-cached /static/report assets
+    # "inline": HTML reports embed the stylesheet, script and logo (PDFs always do)
+    REPORT_ASSET_MODE: str = os.getenv("REPORT_ASSET_MODE", "static")
+    STATIC_ASSET_BASE_URL: str = os.getenv("STATIC_ASSET_BASE_URL", "")
+
     # PDF Configuration
     PDF_PAGE_SIZE: str = "Letter"
-    
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", "2"))  # 0 renders in-process
+    PDF_CACHE_MAX_BYTES: int = int(
+        os.getenv("PDF_CACHE_MAX_BYTES", str(200 * 1024 * 1024))
+    )
+    PDF_CACHE_DIR: str = os.getenv(
+        "PDF_CACHE_DIR", ""
+    )  # shared by API workers when set
+    PDF_CACHE_DIR_MAX_BYTES: int = int(
+        os.getenv("PDF_CACHE_DIR_MAX_BYTES", str(1024 * 1024 * 1024))
+    )
+
     # Rate Limiting (if needed)
     RATE_LIMIT_REQUESTS: int = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
     RATE_LIMIT_PERIOD: int = int(os.getenv("RATE_LIMIT_PERIOD", "3600"))  # 1 hour
@@ -39,6 +55,78 @@ class Settings:
     # Timeout Configuration
     GRAPH_EXECUTION_TIMEOUT: int = int(os.getenv("GRAPH_EXECUTION_TIMEOUT", "300"))  # 5 minutes
 
+    # Report Job Queue Configuration
+    JOB_QUEUE_BACKEND: str = os.getenv(
+        "JOB_QUEUE_BACKEND", "memory"
+    )  # memory, sqlite or redis
+    JOB_QUEUE_SQLITE_PATH: str = os.getenv("JOB_QUEUE_SQLITE_PATH", "currensee_jobs.db")
+    JOB_QUEUE_REDIS_URL: str = os.getenv(
+        "JOB_QUEUE_REDIS_URL", "redis://localhost:6379/0"
+    )
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_RESULT_TTL: int = int(os.getenv("JOB_RESULT_TTL", "86400"))  # 1 day
+    # sqlite / redis: requeue running jobs after 5 min without a heartbeat
+    JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+
+    # Report Cache Configuration
+    REPORT_CACHE_ENABLED: bool = (
+        os.getenv("REPORT_CACHE_ENABLED", "true").lower() == "true"
+    )
+    REPORT_CACHE_TTL: int = int(os.getenv("REPORT_CACHE_TTL", "3600"))  # 1 hour
+    REPORT_CACHE_STALE_WHILE_REVALIDATE: bool = (
+        os.getenv("REPORT_CACHE_STALE_WHILE_REVALIDATE", "false").lower() == "true"
+    )
+    REPORT_CACHE_MAX_STALE: int = int(
+        os.getenv("REPORT_CACHE_MAX_STALE", "86400")
+    )  # 1 day
+    REPORT_CACHE_MAX_ENTRIES: int = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "256"))
+
+    # Batch Report Configuration
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+    BATCH_MAX_MEETINGS: int = int(os.getenv("BATCH_MAX_MEETINGS", "50"))
+
+    # Report Pre-generation Configuration
+    PREGENERATION_ENABLED: bool = (
+        os.getenv("PREGENERATION_ENABLED", "false").lower() == "true"
+    )
+    PREGENERATION_LOOKAHEAD_HOURS: int = int(
+        os.getenv("PREGENERATION_LOOKAHEAD_HOURS", "24")
+    )
+    PREGENERATION_INTERVAL: int = int(
+        os.getenv("PREGENERATION_INTERVAL", "900")
+    )  # 15 minutes
+    PREGENERATION_CONCURRENCY: int = int(os.getenv("PREGENERATION_CONCURRENCY", "2"))
+    PREGENERATION_OFF_PEAK_START: int = int(
+        os.getenv("PREGENERATION_OFF_PEAK_START", "20")
+    )
+    PREGENERATION_OFF_PEAK_END: int = int(os.getenv("PREGENERATION_OFF_PEAK_END", "6"))
+
+    # Shared Holdings News Configuration (entry max age: HOLDINGS_NEWS_MAX_AGE, see core.holdings_news)
+    HOLDINGS_NEWS_REFRESH_ENABLED: bool = (
+        os.getenv("HOLDINGS_NEWS_REFRESH_ENABLED", "false").lower() == "true"
+    )
+    HOLDINGS_NEWS_REFRESH_INTERVAL: int = int(
+        os.getenv("HOLDINGS_NEWS_REFRESH_INTERVAL", "3600")
+    )  # 1 hour
+    HOLDINGS_NEWS_CONCURRENCY: int = int(os.getenv("HOLDINGS_NEWS_CONCURRENCY", "4"))
+    HOLDINGS_NEWS_MAX_POSITIONS: int = int(
+        os.getenv("HOLDINGS_NEWS_MAX_POSITIONS", "300")
+    )
+
+    # Incremental Mailbox Sync Configuration (see currensee.ingest.sync)
+    MAILBOX_SYNC_ENABLED: bool = (
+        os.getenv("MAILBOX_SYNC_ENABLED", "false").lower() == "true"
+    )
+    MAILBOX_SYNC_SOURCE: str = os.getenv("MAILBOX_SYNC_SOURCE", "eml")  # eml or graph
+    MAILBOX_SYNC_EML_DIR: str = os.getenv("MAILBOX_SYNC_EML_DIR", "")
+    MAILBOX_SYNC_INTERVAL: int = int(
+        os.getenv("MAILBOX_SYNC_INTERVAL", "300")
+    )  # 5 minutes
+
+    # Start-up Warm-up Configuration (readiness reported on /ready)
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    WARMUP_DB_CONNECTIONS: int = int(os.getenv("WARMUP_DB_CONNECTIONS", "2"))
+
 
 # Global settings instance
 settings = Settings()
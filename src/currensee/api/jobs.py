@@ -0,0 +1,766 @@
+"""
+Asynchronous report jobs for the Currensee API.
+
+Report generation takes minutes, so instead of holding the HTTP connection
+open the API enqueues a job, returns its id straight away and lets the client
+poll for status. Job status is exposed as a `TaskData` payload and the final
+graph state is kept by the queue backend so the HTML/PDF artifacts can be
+fetched once the job is complete.
+
+Queue backends:
+- InProcessJobQueue: default, jobs live in the memory of a single API process
+- SQLiteJobQueue: shared database file, lets several uvicorn workers on one
+  host share the queue; a running job holds a lease renewed by its worker's
+  heartbeats and is requeued if the worker dies
+- RedisJobQueue: for multi-host deployments (requires the optional `redis`
+  package); jobs are moved atomically to a processing list when claimed and
+  leased the same way
+
+All backends return JSON-normalized status data and results (see `_dumps`), so
+a job looks the same whichever queue ran it.
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from currensee.agents.tools.base import state_json_default
+from currensee.core.metrics import JOBS_IN_FLIGHT
+from currensee.schema.task_data import TaskData
+
+try:
+    import redis
+
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "generate_report"
+
+
+def _dumps(value: Any) -> str:
+    """Serialize graph state to JSON (records become objects, timestamps and other objects strings)."""
+    return json.dumps(value, default=state_json_default)
+
+
+def _normalized(value: Any) -> Any:
+    """The value as it reads back from a shared backend (after a JSON round trip)."""
+    return json.loads(_dumps(value))
+
+
+class JobQueue(ABC):
+    """
+    Storage and hand-off of report jobs between the API and the job workers.
+    """
+
+    @abstractmethod
+    def submit(self, payload: Dict[str, Any], data: Optional[Dict] = None) -> TaskData:
+        """Create a new job for the given graph input and return its status."""
+
+    @abstractmethod
+    def claim(self, timeout: float = 1.0) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Block up to `timeout` seconds for the next new job and mark it running."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[TaskData]:
+        """Return the current status of a job, or None if it is unknown."""
+
+    def heartbeat(self, job_id: str) -> None:
+        """Renew the lease of a running job (for backends that requeue abandoned jobs)."""
+
+    @abstractmethod
+    def update(self, job_id: str, **changes: Any) -> None:
+        """
+        Update a job's status. `state` and `result` replace the current values,
+        `data` is merged into the existing status data.
+        """
+
+    @abstractmethod
+    def set_result(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Store the final graph state of a job."""
+
+    @abstractmethod
+    def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the final graph state of a job, or None if not available."""
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class InProcessJobQueue(JobQueue):
+    """
+    Default queue keeping jobs in memory. Only suitable for a single API process.
+    """
+
+    def __init__(self, result_ttl: int = 86400):
+        self._result_ttl = result_ttl
+        self._pending: "queue.Queue[str]" = queue.Queue()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, payload, data=None):
+        job_id = str(uuid.uuid4())
+        task = TaskData(
+            name=JOB_NAME, run_id=job_id, state="new", data=_normalized(data or {})
+        )
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = {
+                "task": task,
+                "payload": payload,
+                "output": None,
+                "updated_at": time.time(),
+            }
+        self._pending.put(job_id)
+        return task.model_copy(deep=True)
+
+    def claim(self, timeout=1.0):
+        try:
+            job_id = self._pending.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job["task"].state = "running"
+            job["updated_at"] = time.time()
+            return job_id, job["payload"]
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job["task"].model_copy(deep=True) if job else None
+
+    def update(self, job_id, **changes):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            task = job["task"]
+            if "state" in changes:
+                task.state = changes["state"]
+            if "result" in changes:
+                task.result = changes["result"]
+            if "data" in changes:
+                task.data = {**task.data, **_normalized(changes["data"])}
+            job["updated_at"] = time.time()
+
+    def set_result(self, job_id, result):
+        result = _normalized(result)
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id]["output"] = result
+
+    def get_result(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job["output"] if job else None
+
+    def _prune(self) -> None:
+        """Drop completed jobs older than the result TTL (caller holds the lock)."""
+        cutoff = time.time() - self._result_ttl
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job["task"].completed() and job["updated_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    Queue backed by a SQLite file, shared by all API worker processes on a host.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        result_ttl: int = 86400,
+        poll_interval: float = 0.5,
+        lease_seconds: float = 300,
+        max_attempts: int = 3,
+    ):
+        """
+        Args:
+            db_path: Database file shared by the API processes
+            result_ttl: Seconds to keep finished jobs and their results
+            poll_interval: Seconds between polls for new jobs
+            lease_seconds: Seconds a running job may go without a heartbeat before it is requeued
+            max_attempts: Claims of a job before an expired lease fails it instead of requeuing it
+        """
+        self._db_path = db_path
+        self._result_ttl = result_ttl
+        self._poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS report_jobs (
+                    id TEXT PRIMARY KEY,
+                    name TEXT,
+                    state TEXT NOT NULL,
+                    result TEXT,
+                    data TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    output TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(report_jobs)")}
+            for column, sql_type in (
+                ("claimed_at", "REAL"),
+                ("attempts", "INTEGER NOT NULL DEFAULT 0"),
+            ):
+                if column not in columns:
+                    conn.execute(
+                        f"ALTER TABLE report_jobs ADD COLUMN {column} {sql_type}"
+                    )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_report_jobs_state ON report_jobs (state, created_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def submit(self, payload, data=None):
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        task = TaskData(name=JOB_NAME, run_id=job_id, state="new", data=data or {})
+        conn = self._connect()
+        conn.execute(
+            "DELETE FROM report_jobs WHERE state = 'complete' AND updated_at < ?",
+            (now - self._result_ttl,),
+        )
+        conn.execute(
+            """
+            INSERT INTO report_jobs (id, name, state, data, payload, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                job_id,
+                task.name,
+                task.state,
+                _dumps(task.data),
+                _dumps(payload),
+                now,
+                now,
+            ),
+        )
+        return task
+
+    def claim(self, timeout=1.0):
+        deadline = time.time() + timeout
+        conn = self._connect()
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                self._fail_abandoned(conn, now)
+                # New jobs, and running ones whose worker stopped renewing the lease
+                row = conn.execute(
+                    """
+                    SELECT id, payload, state FROM report_jobs
+                    WHERE state = 'new' OR (state = 'running' AND claimed_at < ?)
+                    ORDER BY created_at
+                    LIMIT 1
+                    """,
+                    (now - self.lease_seconds,),
+                ).fetchone()
+                if row is not None:
+                    if row[2] == "running":
+                        logger.warning(
+                            f"Report job {row[0]} lease expired, requeuing it"
+                        )
+                    conn.execute(
+                        """
+                        UPDATE report_jobs
+                        SET state = 'running', claimed_at = ?, attempts = attempts + 1, updated_at = ?
+                        WHERE id = ?
+                        """,
+                        (now, now, row[0]),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            if row is not None:
+                return row[0], json.loads(row[1])
+            if time.time() >= deadline:
+                return None
+            time.sleep(self._poll_interval)
+
+    def _fail_abandoned(self, conn: sqlite3.Connection, now: float) -> None:
+        """Fail expired jobs that were already claimed max_attempts times (caller holds the write lock)."""
+        rows = conn.execute(
+            """
+            SELECT id, data FROM report_jobs
+            WHERE state = 'running' AND claimed_at < ? AND attempts >= ?
+            """,
+            (now - self.lease_seconds, self._max_attempts),
+        ).fetchall()
+        for job_id, data in rows:
+            logger.error(
+                f"Report job {job_id} abandoned by its workers {self._max_attempts} times, failing it"
+            )
+            error = {"error": f"Worker lost {self._max_attempts} times"}
+            conn.execute(
+                "UPDATE report_jobs SET state = 'complete', result = 'error', data = ?, updated_at = ? WHERE id = ?",
+                (_dumps({**json.loads(data), **error}), now, job_id),
+            )
+
+    def heartbeat(self, job_id):
+        self._connect().execute(
+            "UPDATE report_jobs SET claimed_at = ? WHERE id = ? AND state = 'running'",
+            (time.time(), job_id),
+        )
+
+    def get(self, job_id):
+        row = (
+            self._connect()
+            .execute(
+                "SELECT name, state, result, data FROM report_jobs WHERE id = ?",
+                (job_id,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        name, state, result, data = row
+        return TaskData(
+            name=name, run_id=job_id, state=state, result=result, data=json.loads(data)
+        )
+
+    def update(self, job_id, **changes):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT state, result, data FROM report_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is not None:
+                state = changes.get("state", row[0])
+                result = changes.get("result", row[1])
+                data = {**json.loads(row[2]), **changes.get("data", {})}
+                conn.execute(
+                    """
+                    UPDATE report_jobs SET state = ?, result = ?, data = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (state, result, _dumps(data), time.time(), job_id),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def set_result(self, job_id, result):
+        self._connect().execute(
+            "UPDATE report_jobs SET output = ?, updated_at = ? WHERE id = ?",
+            (_dumps(result), time.time(), job_id),
+        )
+
+    def get_result(self, job_id):
+        row = (
+            self._connect()
+            .execute("SELECT output FROM report_jobs WHERE id = ?", (job_id,))
+            .fetchone()
+        )
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Queue backed by Redis (or any Redis-protocol server), shared across hosts.
+
+    Claiming moves a job from the pending to the processing list in one command
+    (BLMOVE) and leases it in a sorted set of expiry times, renewed by heartbeats.
+    Jobs whose lease expired are moved back to the pending list, or failed once
+    they were claimed max_attempts times, by a script run atomically on claim.
+    """
+
+    # KEYS: pending, processing, leases; ARGV: now, lease_seconds, max_attempts, prefix
+    _EXPIRE_LEASES = """
+    local requeued, failed = {}, {}
+    for _, job_id in ipairs(redis.call('LRANGE', KEYS[2], 0, -1)) do
+        local key = ARGV[4] .. ':' .. job_id
+        local expires = redis.call('ZSCORE', KEYS[3], job_id)
+        if not expires then
+            -- Claimed but not leased yet (or the worker died in between): lease it now
+            redis.call('ZADD', KEYS[3], 'NX', tonumber(ARGV[1]) + tonumber(ARGV[2]), job_id)
+        elseif tonumber(expires) < tonumber(ARGV[1]) then
+            redis.call('LREM', KEYS[2], 0, job_id)
+            redis.call('ZREM', KEYS[3], job_id)
+            if redis.call('EXISTS', key) == 0 then
+                -- Expired with its TTL: nothing left to run
+            elseif tonumber(redis.call('HGET', key, 'attempts') or '0') >= tonumber(ARGV[3]) then
+                local data = cjson.decode(redis.call('HGET', key, 'data') or '{}')
+                data['error'] = 'Worker lost ' .. ARGV[3] .. ' times'
+                redis.call('HSET', key, 'state', 'complete', 'result', 'error', 'data', cjson.encode(data))
+                table.insert(failed, job_id)
+            else
+                redis.call('HSET', key, 'state', 'new')
+                redis.call('LPUSH', KEYS[1], job_id)
+                table.insert(requeued, job_id)
+            end
+        end
+    end
+    return {requeued, failed}
+    """
+
+    def __init__(
+        self,
+        url: str,
+        result_ttl: int = 86400,
+        prefix: str = "currensee:jobs",
+        lease_seconds: float = 300,
+        max_attempts: int = 3,
+    ):
+        """
+        Args:
+            url: Redis connection URL
+            result_ttl: Seconds to keep jobs and their results
+            prefix: Prefix of the keys of the queue
+            lease_seconds: Seconds a running job may go without a heartbeat before it is requeued
+            max_attempts: Claims of a job before an expired lease fails it instead of requeuing it
+        """
+        if not HAS_REDIS:
+            raise ImportError(
+                "The 'redis' package is required for JOB_QUEUE_BACKEND=redis"
+            )
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self._result_ttl = result_ttl
+        self._prefix = prefix
+        self.lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+        self._pending = f"{prefix}:pending"
+        self._processing = f"{prefix}:processing"
+        self._leases = f"{prefix}:leases"
+        self._expire_leases = self._client.register_script(self._EXPIRE_LEASES)
+
+    def _key(self, job_id: str) -> str:
+        return f"{self._prefix}:{job_id}"
+
+    def submit(self, payload, data=None):
+        job_id = str(uuid.uuid4())
+        task = TaskData(
+            name=JOB_NAME, run_id=job_id, state="new", data=_normalized(data or {})
+        )
+        key = self._key(job_id)
+        pipe = self._client.pipeline()
+        pipe.hset(
+            key,
+            mapping={
+                "name": task.name,
+                "state": task.state,
+                "data": _dumps(task.data),
+                "payload": _dumps(payload),
+                "attempts": 0,
+            },
+        )
+        pipe.expire(key, self._result_ttl)
+        pipe.rpush(self._pending, job_id)
+        pipe.execute()
+        return task
+
+    def claim(self, timeout=1.0):
+        requeued, failed = self._expire_leases(
+            keys=[self._pending, self._processing, self._leases],
+            args=[time.time(), self.lease_seconds, self._max_attempts, self._prefix],
+        )
+        for job_id in requeued:
+            logger.warning(f"Report job {job_id} lease expired, requeuing it")
+        for job_id in failed:
+            logger.error(
+                f"Report job {job_id} abandoned by its workers {self._max_attempts} times, failing it"
+            )
+
+        # A timeout of 0 would block forever
+        job_id = self._client.blmove(
+            self._pending, self._processing, max(timeout, 0.01), "LEFT", "RIGHT"
+        )
+        if job_id is None:
+            return None
+        key = self._key(job_id)
+        pipe = self._client.pipeline()
+        pipe.zadd(self._leases, {job_id: time.time() + self.lease_seconds})
+        pipe.hset(key, "state", "running")
+        pipe.hincrby(key, "attempts", 1)
+        pipe.hget(key, "payload")
+        payload = pipe.execute()[-1]
+        if payload is None:
+            # Expired with its TTL while queued
+            self._release(job_id)
+            self._client.delete(key)
+            return None
+        return job_id, json.loads(payload)
+
+    def heartbeat(self, job_id):
+        self._client.zadd(
+            self._leases, {job_id: time.time() + self.lease_seconds}, xx=True
+        )
+
+    def _release(self, job_id: str) -> None:
+        pipe = self._client.pipeline()
+        pipe.lrem(self._processing, 0, job_id)
+        pipe.zrem(self._leases, job_id)
+        pipe.execute()
+
+    def get(self, job_id):
+        fields = self._client.hmget(
+            self._key(job_id), "name", "state", "result", "data"
+        )
+        name, state, result, data = fields
+        if state is None:
+            return None
+        return TaskData(
+            name=name,
+            run_id=job_id,
+            state=state,
+            result=result or None,
+            data=json.loads(data) if data else {},
+        )
+
+    def update(self, job_id, **changes):
+        key = self._key(job_id)
+        mapping = {}
+        if "state" in changes:
+            mapping["state"] = changes["state"]
+        if "result" in changes:
+            mapping["result"] = changes["result"] or ""
+        if "data" in changes:
+            current = self._client.hget(key, "data")
+            merged = {**(json.loads(current) if current else {}), **changes["data"]}
+            mapping["data"] = _dumps(merged)
+        if mapping:
+            self._client.hset(key, mapping=mapping)
+        if changes.get("state") == "complete":
+            self._release(job_id)
+
+    def set_result(self, job_id, result):
+        self._client.hset(self._key(job_id), "output", _dumps(result))
+
+    def get_result(self, job_id):
+        output = self._client.hget(self._key(job_id), "output")
+        return json.loads(output) if output else None
+
+    def close(self):
+        self._client.close()
+
+
+def create_job_queue(
+    backend: str,
+    sqlite_path: str = "",
+    redis_url: str = "",
+    result_ttl: int = 86400,
+    lease_seconds: float = 300,
+) -> JobQueue:
+    """
+    Build the job queue configured for this deployment.
+
+    Args:
+        backend: One of "memory", "sqlite" or "redis"
+        sqlite_path: Database file used by the SQLite backend
+        redis_url: Connection URL used by the Redis backend
+        result_ttl: Seconds to keep finished jobs and their results
+        lease_seconds: Seconds before a running SQLite or Redis job without heartbeats is requeued
+
+    Returns:
+        JobQueue instance
+    """
+    backend = backend.lower()
+    if backend == "memory":
+        return InProcessJobQueue(result_ttl=result_ttl)
+    if backend == "sqlite":
+        return SQLiteJobQueue(
+            sqlite_path, result_ttl=result_ttl, lease_seconds=lease_seconds
+        )
+    if backend == "redis":
+        return RedisJobQueue(
+            redis_url, result_ttl=result_ttl, lease_seconds=lease_seconds
+        )
+    raise ValueError(f"Unsupported job queue backend: {backend}")
+
+
+def run_graph_with_progress(
+    graph,
+    init_state: Dict[str, Any],
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Execute the compiled graph, reporting progress after each node finishes.
+
+    Args:
+        graph: Compiled LangGraph graph
+        init_state: Initial graph state
+        on_progress: Optional callback receiving {"completed", "total", "last_node"}
+
+    Returns:
+        Final graph state
+    """
+    total = len([name for name in graph.nodes if not name.startswith("__")])
+    completed = 0
+    final_state = dict(init_state)
+
+    for mode, chunk in graph.stream(init_state, stream_mode=["updates", "values"]):
+        if mode == "values":
+            final_state = chunk
+        elif on_progress is not None:
+            completed += len(chunk)
+            on_progress(
+                {
+                    "completed": completed,
+                    "total": total,
+                    "last_node": next(reversed(chunk)),
+                }
+            )
+
+    return final_state
+
+
+class JobRunner:
+    """
+    Pool of background worker threads executing queued report jobs, plus a
+    heartbeat thread renewing the queue leases of the jobs they are running.
+    """
+
+    def __init__(
+        self,
+        job_queue: JobQueue,
+        graph,
+        workers: int = 2,
+        heartbeat_interval: Optional[float] = None,
+    ):
+        """
+        Args:
+            job_queue: Queue the jobs are claimed from
+            graph: Compiled graph, or a function returning it (called for the first job)
+            workers: Number of worker threads
+            heartbeat_interval: Seconds between lease renewals (default: a third of the queue's lease, or 60)
+        """
+        self.queue = job_queue
+        self._graph = graph
+        self.workers = workers
+        lease = getattr(job_queue, "lease_seconds", None)
+        self.heartbeat_interval = heartbeat_interval or (lease / 3 if lease else 60.0)
+        self._threads: list[threading.Thread] = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._running: set = set()
+
+    @property
+    def graph(self):
+        if not hasattr(self._graph, "stream"):
+            self._graph = self._graph()
+        return self._graph
+
+    def start(self) -> None:
+        """Start the worker threads (no-op if already running)."""
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work, name=f"report-job-worker-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            thread = threading.Thread(
+                target=self._heartbeat, name="report-job-heartbeat", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+            logger.info(f"Started {self.workers} report job workers")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Signal the workers to stop and wait for idle ones to exit."""
+        with self._lock:
+            self._stop.set()
+            for thread in self._threads:
+                thread.join(timeout=timeout)
+            self._threads = []
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            try:
+                claimed = self.queue.claim(timeout=1.0)
+            except Exception as e:
+                logger.error(f"Failed to claim report job: {e}")
+                time.sleep(1.0)
+                continue
+            if claimed is not None:
+                self.run_job(*claimed)
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(self.heartbeat_interval):
+            for job_id in list(self._running):
+                try:
+                    self.queue.heartbeat(job_id)
+                except Exception as e:
+                    logger.error(
+                        f"Failed to renew the lease of report job {job_id}: {e}"
+                    )
+
+    def run_job(self, job_id: str, init_state: Dict[str, Any]) -> None:
+        """Execute one job and record its outcome in the queue."""
+        logger.info(
+            f"Running report job {job_id} for client: {init_state.get('client_name')}"
+        )
+        start_time = time.time()
+        self.queue.update(job_id, state="running", data={"started_at": start_time})
+
+        def on_progress(progress: Dict[str, Any]) -> None:
+            self.queue.update(job_id, data={"progress": progress})
+
+        JOBS_IN_FLIGHT.inc()
+        self._running.add(job_id)
+        try:
+            result = run_graph_with_progress(self.graph, init_state, on_progress)
+            self.queue.set_result(job_id, result)
+            self.queue.update(
+                job_id,
+                state="complete",
+                result="success",
+                data={"execution_time": time.time() - start_time},
+            )
+            logger.info(
+                f"Report job {job_id} completed in {time.time() - start_time:.2f}s"
+            )
+        except Exception as e:
+            logger.exception(f"Report job {job_id} failed")
+            self.queue.update(
+                job_id,
+                state="complete",
+                result="error",
+                data={"error": str(e), "execution_time": time.time() - start_time},
+            )
+        finally:
+            self._running.discard(job_id)
+            JOBS_IN_FLIGHT.dec()
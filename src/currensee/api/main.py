@@ -1,20 +1,39 @@
 import asyncio
-import io
+import functools
 import logging
+import os
+import threading
+import time
+import traceback
+import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional, Tuple
 
 from fastapi import BackgroundTasks, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, Field, validator
 
-from currensee.agents.complete_graph import compiled_graph
 from currensee.api.config import settings
+from currensee.api.jobs import JobRunner, create_job_queue
+from currensee.api.streaming import format_sse, stream_report_events
+from currensee.core.batch import SharedComputations, run_batch
+from currensee.core import metrics
 from currensee.core.input_guardrails import CurrenSeeInputGuardrails
+from currensee.core.pregeneration import PregenerationScheduler
+from currensee.core.profiling import summarize_profile
+from currensee.core.holdings_news import HoldingsNewsService
+from currensee.core.report_cache import CacheEntry, ReportCache
+from currensee.core.warmup import Warmup, default_steps
+from currensee.ingest.sync import MailboxSyncService
+from currensee.schema.task_data import TaskData
+from currensee.utils.report_templates import preload_templates
+from currensee.utils.static_assets import CACHE_CONTROL, resolve_hashed_asset
+from currensee.utils.pdf_renderer import PdfRenderer, content_hash, iter_chunks
 from currensee.utils.security_utils import (
     process_validation_results,
     get_sanitized_inputs,
@@ -25,18 +44,116 @@ from currensee.utils.output_utils_dynamic import (
     format_news_summary_to_html,
     format_paragraph_summary_to_html,
     save_html_to_file,
-    convert_html_to_pdf,
 )
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=1)
+def get_graph():
+    """
+    The compiled report graph. Importing the agents (model clients, search and
+    database tooling) is deferred to the first report so the API starts fast.
+    """
+    from currensee.agents.complete_graph import compiled_graph
+
+    return compiled_graph
+
+
+def invoke_graph(init_state: dict) -> dict:
+    return get_graph().invoke(init_state)
+
+
+# Background report jobs (see /jobs endpoints)
+job_queue = create_job_queue(
+    settings.JOB_QUEUE_BACKEND,
+    sqlite_path=settings.JOB_QUEUE_SQLITE_PATH,
+    redis_url=settings.JOB_QUEUE_REDIS_URL,
+    result_ttl=settings.JOB_RESULT_TTL,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+)
+job_runner = JobRunner(job_queue, get_graph, workers=settings.JOB_WORKERS)
+
+# Final graph states, reused across repeat views and format switches
+report_cache = ReportCache(
+    enabled=settings.REPORT_CACHE_ENABLED,
+    ttl=settings.REPORT_CACHE_TTL,
+    stale_while_revalidate=settings.REPORT_CACHE_STALE_WHILE_REVALIDATE,
+    max_stale=settings.REPORT_CACHE_MAX_STALE,
+    max_entries=settings.REPORT_CACHE_MAX_ENTRIES,
+)
+
+# Pre-builds reports of upcoming meetings into the report cache
+pregeneration = PregenerationScheduler(
+    report_cache,
+    invoke_graph,
+    lookahead_hours=settings.PREGENERATION_LOOKAHEAD_HOURS,
+    interval=settings.PREGENERATION_INTERVAL,
+    max_concurrency=settings.PREGENERATION_CONCURRENCY,
+    off_peak_start=settings.PREGENERATION_OFF_PEAK_START,
+    off_peak_end=settings.PREGENERATION_OFF_PEAK_END,
+)
+
+# Keeps the news of the book's most held positions warm for all clients
+holdings_news = HoldingsNewsService(
+    interval=settings.HOLDINGS_NEWS_REFRESH_INTERVAL,
+    max_concurrency=settings.HOLDINGS_NEWS_CONCURRENCY,
+    max_positions=settings.HOLDINGS_NEWS_MAX_POSITIONS,
+)
+
+# Loads new mail into email_data / meeting_data and drops the affected cached reports
+mailbox_sync = MailboxSyncService(
+    settings.MAILBOX_SYNC_SOURCE,
+    report_cache,
+    interval=settings.MAILBOX_SYNC_INTERVAL,
+    eml_dir=settings.MAILBOX_SYNC_EML_DIR or None,
+)
+
+# Opens connections and loads caches before the instance reports ready (see /ready)
+warmup = Warmup(default_steps(get_graph, db_connections=settings.WARMUP_DB_CONNECTIONS))
+
+# HTML-to-PDF rendering in worker processes, memoized by content hash
+pdf_renderer = PdfRenderer(
+    workers=settings.PDF_WORKERS,
+    cache_max_bytes=settings.PDF_CACHE_MAX_BYTES,
+    cache_dir=settings.PDF_CACHE_DIR or None,
+    cache_dir_max_bytes=settings.PDF_CACHE_DIR_MAX_BYTES,
+    page_size=settings.PDF_PAGE_SIZE,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the report job workers (and background refreshes) with the app and stop them on shutdown"""
+    preload_templates()
+    if settings.WARMUP_ENABLED:
+        warmup.start()
+    job_runner.start()
+    if settings.HOLDINGS_NEWS_REFRESH_ENABLED:
+        holdings_news.start()
+    if settings.PREGENERATION_ENABLED:
+        pregeneration.start()
+    if settings.MAILBOX_SYNC_ENABLED:
+        mailbox_sync.start()
+    yield
+    mailbox_sync.stop()
+    pregeneration.stop()
+    holdings_news.stop()
+    job_runner.stop()
+    job_queue.close()
+    metrics.mark_process_dead(os.getpid())
+    report_cache.close()
+    pdf_renderer.close()
+
+
 app = FastAPI(
     title=settings.APP_NAME,
     description="API for serving Currensee agent graph results and generating PDF reports",
     version=settings.VERSION,
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware to allow requests from Outlook
@@ -49,6 +166,41 @@ app.add_middleware(
 )
 
 
+async def _observe_after_body(body_iterator, observe: Callable[[], None]):
+    """Pass a response body through, calling `observe` once it is fully sent (or abandoned)"""
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        observe()
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """
+    Observe the latency of every request, labelled by route template (not by raw path).
+    call_next returns once the headers are ready, so the observation is made when the
+    body has been sent: streamed reports, batches and PDFs record their full duration.
+    """
+    start = time.perf_counter()
+
+    def observe(status: int) -> None:
+        route = request.scope.get("route")
+        metrics.REQUEST_LATENCY.labels(
+            request.method, getattr(route, "path", "unmatched"), str(status)
+        ).observe(time.perf_counter() - start)
+
+    try:
+        response = await call_next(request)
+    except Exception:
+        observe(500)
+        raise
+    response.body_iterator = _observe_after_body(
+        response.body_iterator, lambda: observe(response.status_code)
+    )
+    return response
+
+
 class ClientRequest(BaseModel):
     """Request model for client meeting preparation"""
 
@@ -109,10 +261,38 @@ class ClientRequest(BaseModel):
         
         return validation_results
 
+    def prepare_init_state(self) -> dict:
+        """
+        Validate the request with the guardrails and build the initial graph state
+        from the sanitized inputs. Raises HTTPException if validation fails.
+        """
+        validation_results = self.validate_with_guardrails()
+        process_validation_results(validation_results, self.client_email)
+        sanitized_inputs = get_sanitized_inputs(validation_results)
 
+        return {
+            "user_email": self.user_email,  # User email already validated
+            "client_name": sanitized_inputs.get("client_name", self.client_name),
+            "client_email": self.client_email,  # Email format already validated
+            "meeting_timestamp": self.meeting_timestamp,  # Timestamp format validated
+            "meeting_description": sanitized_inputs.get(
+                "meeting_description", self.meeting_description
+            ),
+            "report_length": "long",
+        }
+
+
+class BatchReportRequest(BaseModel):
+    """Request model for generating the reports of several meetings at once"""
+
+    meetings: List[ClientRequest] = Field(..., min_length=1)
+    max_concurrency: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Reports generated in parallel (capped by the server)",
+    )
 
 
-        
 class GraphResponse(BaseModel):
     """Response model for graph execution results"""
 
@@ -120,12 +300,33 @@ class GraphResponse(BaseModel):
     data: Optional[dict] = None
     error: Optional[str] = None
     execution_time: Optional[float] = None
+    cache_status: Optional[str] = None
+    profile: Optional[dict] = (
+        None  # per-node breakdown of the run that built the report
+    )
 
 
 # Access outlook.html tempalate
 BASE_DIR = Path(__file__).resolve().parents[3]
 #templates = Jinja2Templates(directory=BASE_DIR / "ui" / "templates")
 
+@app.get("/static/report/{filename}")
+async def report_asset(filename: str):
+    """
+    Serve a content-hashed report asset (stylesheet, script or logo). The URL
+    changes whenever the content does, so it can be cached indefinitely.
+    Registered before the /static mount so it takes precedence.
+    """
+    asset = resolve_hashed_asset(filename)
+    if asset is None:
+        raise HTTPException(status_code=404, detail=f"Asset {filename} not found")
+    return Response(
+        content=asset.content,
+        media_type=asset.media_type,
+        headers={"Cache-Control": CACHE_CONTROL, "ETag": f'"{asset.digest}"'},
+    )
+
+
 # Mount static files from ui folder
 app.mount("/static", StaticFiles(directory=BASE_DIR / "ui"), name="static")
 
@@ -165,6 +366,29 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics, aggregated across workers when PROMETHEUS_MULTIPROC_DIR is set"""
+    if not metrics.HAS_PROMETHEUS:
+        raise HTTPException(
+            status_code=501, detail="prometheus_client is not installed"
+        )
+    return Response(
+        content=metrics.render_metrics(), media_type=metrics.CONTENT_TYPE_LATEST
+    )
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 200 once the start-up warm-up has finished, 503 before"""
+    if not settings.WARMUP_ENABLED:
+        return {"status": "ready", "warmup": "disabled"}
+    status = warmup.status()
+    if not status["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming_up", **status})
+    return {"status": "ready", **status}
+
+
 #@app.get("/report", response_class=HTMLResponse)
 #async def serve_html_report(
 #    client_name: str = Query(...),
@@ -188,6 +412,76 @@ async def health_check():
 #        raise HTTPException(status_code=500, detail=str(e))
 
 
+def make_pdf_filename(meeting_description: str) -> str:
+    """Build the download filename from the meeting description and current time"""
+    safe_meeting_desc = "".join(
+        c for c in meeting_description if c.isalnum() or c in (" ", "-", "_")
+    ).rstrip()
+    safe_meeting_desc = safe_meeting_desc.replace(" ", "_")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"currensee_report_{safe_meeting_desc}_{timestamp}.pdf"
+
+
+async def run_report(init_state: dict) -> Tuple[CacheEntry, str]:
+    """
+    Execute the graph for init_state in a worker thread with timeout protection,
+    serving the result from the report cache when it is still fresh.
+    Returns the cache entry and the cache status (hit, stale, miss or bypass).
+    """
+    entry, cache_status = await asyncio.wait_for(
+        asyncio.get_event_loop().run_in_executor(
+            None, report_cache.get_or_compute, init_state, invoke_graph
+        ),
+        timeout=settings.GRAPH_EXECUTION_TIMEOUT,
+    )
+    logger.info(f"Report cache {cache_status} for client: {init_state['client_name']}")
+    return entry, cache_status
+
+
+def render_html(result: dict, inline_assets: bool = False) -> str:
+    """
+    Render the HTML document for a graph result. Documents served to browsers link
+    the cached /static report assets unless REPORT_ASSET_MODE is "inline"; PDFs
+    need self-contained documents (inline_assets=True).
+    """
+    return generate_report_html_content(
+        result,
+        inline_assets=inline_assets or settings.REPORT_ASSET_MODE == "inline",
+        asset_base_url=settings.STATIC_ASSET_BASE_URL,
+    )
+
+
+async def render_report_html(entry: CacheEntry, inline_assets: bool = False) -> str:
+    """Render (once per cached report and asset mode) the HTML document for a graph result"""
+    key = "html_inline" if inline_assets else "html"
+    if key not in entry.artifacts:
+        entry.artifacts[key] = await asyncio.get_event_loop().run_in_executor(
+            None, functools.partial(render_html, entry.result, inline_assets)
+        )
+    return entry.artifacts[key]
+
+
+async def pdf_response(
+    html_content: str, filename: str, extra_headers: Optional[dict] = None
+) -> StreamingResponse:
+    """
+    Render html_content to PDF in the renderer's worker processes (or reuse the
+    PDF of identical HTML) and stream it back as a download.
+    """
+    pdf_bytes = await pdf_renderer.render_async(html_content)
+
+    return StreamingResponse(
+        iter_chunks(pdf_bytes),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Content-Length": str(len(pdf_bytes)),
+            "ETag": f'"{content_hash(html_content)}"',
+            **(extra_headers or {}),
+        },
+    )
+
+
 @app.post("/generate-report", response_model=GraphResponse)
 async def generate_report(request: ClientRequest):
     """
@@ -197,33 +491,12 @@ async def generate_report(request: ClientRequest):
         start_time = datetime.now()
         logger.info(f"Starting report generation for client: {request.client_name}")
 
-        # Run comprehensive security validation
-        validation_results = request.validate_with_guardrails()
-        
-        # Process validation results (raises HTTPException if validation fails)
-        process_validation_results(validation_results, request.client_email)
-        
-        # Get sanitized inputs for safe processing
-        sanitized_inputs = get_sanitized_inputs(validation_results)
-        
-        # Prepare the initial state for the graph using sanitized inputs
-        init_state = {
-            "user_email": request.user_email,  # User email already validated
-            "client_name": sanitized_inputs.get("client_name", request.client_name),
-            "client_email": request.client_email,  # Email format already validated
-            "meeting_timestamp": request.meeting_timestamp,  # Timestamp format validated
-            "meeting_description": sanitized_inputs.get("meeting_description", request.meeting_description),
-            "report_length": "long",
-        }
+        # Run security validation and prepare the initial state from sanitized inputs
+        init_state = request.prepare_init_state()
 
         # Execute the compiled graph with timeout
         try:
-            result = await asyncio.wait_for(
-                asyncio.get_event_loop().run_in_executor(
-                    None, compiled_graph.invoke, init_state
-                ),
-                timeout=settings.GRAPH_EXECUTION_TIMEOUT,
-            )
+            entry, cache_status = await run_report(init_state)
         except asyncio.TimeoutError:
             logger.error(f"Graph execution timeout for client: {request.client_name}")
             return GraphResponse(
@@ -238,7 +511,13 @@ async def generate_report(request: ClientRequest):
             f"Report generation completed for client: {request.client_name} in {execution_time:.2f}s"
         )
 
-        return GraphResponse(success=True, data=result, execution_time=execution_time)
+        return GraphResponse(
+            success=True,
+            data=entry.result,
+            execution_time=execution_time,
+            cache_status=cache_status,
+            profile=summarize_profile(entry.result.get("node_profile", [])),
+        )
 
     except Exception as e:
         logger.error(
@@ -252,29 +531,18 @@ async def generate_report(request: ClientRequest):
 @app.post("/generate-report/html")
 async def generate_report_html(request: ClientRequest):
     try:
-        # Run comprehensive security validation
-        validation_results = request.validate_with_guardrails()
-        
-        # Process validation results (raises HTTPException if validation fails)
-        process_validation_results(validation_results, request.client_email)
-        
-        # Get sanitized inputs for safe processing
-        sanitized_inputs = get_sanitized_inputs(validation_results)
-        
-        init_state = {
-            "user_email": request.user_email,
-            "client_name": request.client_name,
-            "client_email": request.client_email,
-            "meeting_timestamp": request.meeting_timestamp,
-            "meeting_description": request.meeting_description,
-        }
+        init_state = request.prepare_init_state()
 
-        result = compiled_graph.invoke(init_state) 
-        html_content = generate_report_html_content(result)
-        print(f"html_content type: {type(html_content)}") 
+        entry, cache_status = await run_report(init_state)
+        html_content = await render_report_html(entry)
 
-        return HTMLResponse(content=html_content)
+        return HTMLResponse(
+            content=html_content,
+            headers={"X-Report-Cache": cache_status},
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Error in generate_report_html")  # logs full traceback
         traceback_str = ''.join(traceback.format_exception(None, e, e.__traceback__))
@@ -288,62 +556,227 @@ async def generate_report_pdf(request: ClientRequest):
     Generate and return PDF report for the given client meeting
     """
     try:
-        # Run comprehensive security validation
-        validation_results = request.validate_with_guardrails()
-        
-        # Process validation results (raises HTTPException if validation fails)
-        process_validation_results(validation_results, request.client_email)
-        
-        # Get sanitized inputs for safe processing
-        sanitized_inputs = get_sanitized_inputs(validation_results)
-        
-        # Prepare the initial state for the graph
-        init_state = {
-            "user_email": request.user_email,  # User email already validated
-            "client_name": sanitized_inputs.get("client_name", request.client_name),
-            "client_email": request.client_email,  # Email format already validated
-            "meeting_timestamp": request.meeting_timestamp,  # Timestamp validated
-            "meeting_description": sanitized_inputs.get("meeting_description", request.meeting_description),
-            "report_length": "long",  # Using fixed report length for PDF
-        }
-
-        # Execute the compiled graph
-        result = compiled_graph.invoke(init_state)
-
-        # Generate HTML based on report length
-        report_length = request.report_length or "long"
+        init_state = request.prepare_init_state()
 
-        if report_length == "short":
-            html_content = generate_short_report(result)
-        elif report_length == "medium":
-            html_content = generate_med_report(result)
-        else:  # long
-            html_content = generate_long_report(result)
-
-        # Convert HTML to PDF
-        pdf_buffer = io.BytesIO()
-        convert_html_to_pdf(html_content, pdf_buffer)
-        pdf_buffer.seek(0)
+        # Execute the compiled graph (or reuse the cached result) and render HTML
+        entry, cache_status = await run_report(init_state)
+        html_content = await render_report_html(entry, inline_assets=True)
 
         # Generate filename with meeting description and timestamp
-        safe_meeting_desc = "".join(
-            c
-            for c in request.meeting_description
-            if c.isalnum() or c in (" ", "-", "_")
-        ).rstrip()
-        safe_meeting_desc = safe_meeting_desc.replace(" ", "_")
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"currensee_report_{safe_meeting_desc}_{timestamp}.pdf"
-
-        return StreamingResponse(
-            io.BytesIO(pdf_buffer.read()),
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        filename = make_pdf_filename(request.meeting_description)
+
+        return await pdf_response(
+            html_content, filename, extra_headers={"X-Report-Cache": cache_status}
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@app.post("/generate-report/stream")
+async def generate_report_stream(request: ClientRequest):
+    """
+    Execute the graph and stream node progress and each finished report
+    section as server-sent events, so the client can render the email summary
+    long before the news sourcing finishes.
+    """
+    init_state = request.prepare_init_state()
+    run_id = str(uuid.uuid4())
+    logger.info(f"Starting streamed report {run_id} for client: {request.client_name}")
+    graph = await asyncio.get_event_loop().run_in_executor(None, get_graph)
+
+    return StreamingResponse(
+        stream_report_events(graph, init_state, run_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def stream_batch_events(init_states: List[dict], max_concurrency: int):
+    """
+    Run a batch of reports in a worker thread and yield an SSE "report" event
+    as each one finishes, followed by an "end" summary. If the client goes away,
+    the reports that have not started yet are skipped.
+    """
+    loop = asyncio.get_event_loop()
+    start_time = datetime.now()
+    shared = SharedComputations()
+    stop = threading.Event()
+    outcomes = run_batch(
+        init_states,
+        invoke_graph,
+        max_concurrency=max_concurrency,
+        report_cache=report_cache,
+        shared=shared,
+        stop=stop,
+    )
+    finished: asyncio.Queue = asyncio.Queue()
+
+    def produce():
+        # The generator is advanced and closed in this one thread
+        try:
+            for outcome in outcomes:
+                loop.call_soon_threadsafe(finished.put_nowait, outcome)
+                if stop.is_set():
+                    break
+        except Exception as e:
+            loop.call_soon_threadsafe(finished.put_nowait, e)
+        finally:
+            outcomes.close()
+            loop.call_soon_threadsafe(finished.put_nowait, None)
+
+    loop.run_in_executor(None, produce)
+    succeeded = 0
+
+    try:
+        while True:
+            outcome = await finished.get()
+            if outcome is None:
+                break
+            if isinstance(outcome, Exception):
+                raise outcome
+            succeeded += outcome.success
+            yield format_sse("report", {**outcome.summary(), "data": outcome.result})
+    except Exception as e:
+        logger.exception("Batch report generation failed")
+        yield format_sse("error", str(e))
+    finally:
+        # Also reached when the client disconnects and the response is closed
+        stop.set()
+
+    yield format_sse(
+        "end",
+        {
+            "total": len(init_states),
+            "succeeded": succeeded,
+            "execution_time": (datetime.now() - start_time).total_seconds(),
+            "shared_computations": shared.stats,
+        },
+    )
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/generate-report/batch")
+async def generate_report_batch(request: BatchReportRequest):
+    """
+    Generate the reports of a list of meetings, sharing common data (macro news,
+    FRED table, news on common holdings) across them, and stream each report as
+    a server-sent event as soon as it finishes.
+    """
+    if len(request.meetings) > settings.BATCH_MAX_MEETINGS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch can contain at most {settings.BATCH_MAX_MEETINGS} meetings",
+        )
+
+    init_states = [meeting.prepare_init_state() for meeting in request.meetings]
+    max_concurrency = min(
+        request.max_concurrency or settings.BATCH_MAX_CONCURRENCY,
+        settings.BATCH_MAX_CONCURRENCY,
+    )
+    logger.info(
+        f"Starting batch of {len(init_states)} reports (concurrency {max_concurrency})"
+    )
+
+    return StreamingResponse(
+        stream_batch_events(init_states, max_concurrency),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/jobs", response_model=TaskData, status_code=202)
+async def create_report_job(request: ClientRequest):
+    """
+    Queue a report generation job and return its id immediately.
+    Poll GET /jobs/{job_id} for progress, then fetch /jobs/{job_id}/html or /pdf.
+    """
+    init_state = request.prepare_init_state()
+
+    # Queue backends block (SQLite locks, Redis round trips): kept off the event loop
+    task = await asyncio.get_event_loop().run_in_executor(
+        None,
+        lambda: job_queue.submit(
+            init_state,
+            data={
+                "client_name": init_state["client_name"],
+                "meeting_timestamp": init_state["meeting_timestamp"],
+            },
+        ),
+    )
+    logger.info(f"Queued report job {task.run_id} for client: {request.client_name}")
+    return task
+
+
+@app.get("/jobs/{job_id}", response_model=TaskData)
+async def get_report_job(job_id: str):
+    """
+    Return the status and progress of a report job
+    """
+    task = await asyncio.get_event_loop().run_in_executor(None, job_queue.get, job_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return task
+
+
+def get_completed_job_result(job_id: str) -> dict:
+    """
+    Return the final graph state of a successful job, raising HTTPException
+    if the job is unknown, still running or failed. Blocks on the job queue:
+    run it in an executor.
+    """
+    task = job_queue.get(job_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if task.completed_with_error():
+        raise HTTPException(
+            status_code=500, detail=task.data.get("error", "Report generation failed")
+        )
+    if not task.completed():
+        raise HTTPException(
+            status_code=409, detail=f"Job {job_id} is still {task.state}"
+        )
+
+    result = job_queue.get_result(job_id)
+    if result is None:
+        raise HTTPException(
+            status_code=404, detail=f"Result for job {job_id} has expired"
+        )
+    return result
+
+
+@app.get("/jobs/{job_id}/html", response_class=HTMLResponse)
+async def get_report_job_html(job_id: str):
+    """
+    Return the HTML report of a completed job
+    """
+    result = await asyncio.get_event_loop().run_in_executor(
+        None, get_completed_job_result, job_id
+    )
+    html_content = await asyncio.get_event_loop().run_in_executor(
+        None, render_html, result
+    )
+    return HTMLResponse(content=html_content)
+
+
+@app.get("/jobs/{job_id}/pdf")
+async def get_report_job_pdf(job_id: str):
+    """
+    Return the PDF report of a completed job as a download
+    """
+    result = await asyncio.get_event_loop().run_in_executor(
+        None, get_completed_job_result, job_id
+    )
+    html_content = await asyncio.get_event_loop().run_in_executor(
+        None, render_html, result, True
+    )
+    filename = make_pdf_filename(result.get("meeting_description", ""))
+
+    return await pdf_response(html_content, filename)
+
+
 @app.get("/outlook", response_class=HTMLResponse)
 async def serve_outlook():
     """Serve the Outlook HTML UI at /outlook"""
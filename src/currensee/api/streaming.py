@@ -0,0 +1,150 @@
+"""
+Server-sent-events streaming of report generation progress.
+
+Drives the compiled graph with `astream` and turns its debug/update events into
+SSE messages, following the same `data: {"type": ..., "content": ...}` framing
+as the StreamInput/ChatMessage schemas:
+- {"type": "task", "content": TaskData}       node started / finished
+- {"type": "message", "content": ChatMessage} a finished report section (HTML)
+- {"type": "end", "content": {...}}           run summary
+- {"type": "error", "content": "..."}         run failed
+followed by a final `data: [DONE]`.
+"""
+
+import json
+import logging
+import time
+from typing import Any, AsyncGenerator, Callable, Dict
+
+from currensee.agents.tools.base import state_json_default
+from currensee.core.output_guardrails import validate_output_before_rendering
+from currensee.core.profiling import summarize_profile
+from currensee.schema import ChatMessage
+from currensee.schema.task_data import TaskData
+from currensee.utils.output_utils_dynamic import (
+    format_holdings_to_html,
+    format_paragraph_summary_to_html,
+    format_sources_to_html,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def render_summary_section(summary: str, title: str) -> str:
+    """Render an LLM-written summary section"""
+    return f"<h2>{title}</h2>" + format_paragraph_summary_to_html(summary)
+
+
+# State keys that make up a report section, in the order they become available
+REPORT_SECTIONS: Dict[str, tuple[str, Callable[[Any, str], str]]] = {
+    "email_summary": ("Email Summary", render_summary_section),
+    "recent_email_summary": ("Recent Email", render_summary_section),
+    "recent_client_questions": ("Client Questions", render_summary_section),
+    "macro_news_sources": ("Macro Economic News", format_sources_to_html),
+    "client_industry_sources": ("Client Industry News", format_sources_to_html),
+    "client_holdings_sources": ("Client Holdings News", format_holdings_to_html),
+    "summary_client_comms": ("Client Interactions", render_summary_section),
+    "client_news_summary_sourced": (
+        "Client News & Developments",
+        render_summary_section,
+    ),
+    "fin_hold_summary_sourced": ("Portfolio & Market Overview", render_summary_section),
+}
+
+
+def format_sse(event_type: str, content: Any) -> str:
+    """Frame one event as a server-sent-events message"""
+    return f"data: {json.dumps({'type': event_type, 'content': content}, default=state_json_default)}\n\n"
+
+
+def render_section(key: str, value: Any, run_id: str) -> ChatMessage:
+    """
+    Render a finished state value as an HTML report section message.
+    Text sections go through the output guardrails (PII redaction) first.
+    """
+    title, renderer = REPORT_SECTIONS[key]
+    if isinstance(value, str):
+        validation = validate_output_before_rendering({key: value})
+        value = validation.get("sanitized_report", {}).get(key, value)
+
+    return ChatMessage(
+        type="custom",
+        content=renderer(value, title),
+        run_id=run_id,
+        custom_data={"section": key, "title": title},
+    )
+
+
+async def stream_report_events(
+    graph, init_state: Dict[str, Any], run_id: str
+) -> AsyncGenerator[str, None]:
+    """
+    Execute the graph and yield SSE messages for node progress and finished sections.
+
+    Args:
+        graph: Compiled LangGraph graph
+        init_state: Initial graph state (already validated)
+        run_id: Identifier attached to every event of this run
+
+    Yields:
+        SSE-framed strings
+    """
+    start_time = time.time()
+    sent_sections = set()
+    node_profiles = []
+
+    try:
+        async for mode, chunk in graph.astream(
+            init_state, stream_mode=["debug", "updates"]
+        ):
+            if mode == "debug":
+                payload = chunk["payload"]
+                if chunk["type"] == "task":
+                    task = TaskData(
+                        name=payload["name"],
+                        run_id=run_id,
+                        state="new",
+                        data={"step": chunk["step"]},
+                    )
+                elif chunk["type"] == "task_result":
+                    task = TaskData(
+                        name=payload["name"],
+                        run_id=run_id,
+                        state="complete",
+                        result="error" if payload.get("error") else "success",
+                        data={
+                            "step": chunk["step"],
+                            "elapsed": round(time.time() - start_time, 2),
+                        },
+                    )
+                else:
+                    continue
+                yield format_sse("task", task.model_dump())
+                continue
+
+            for node_update in chunk.values():
+                if not isinstance(node_update, dict):
+                    continue
+                node_profiles.extend(node_update.get("node_profile", []))
+                for key, value in node_update.items():
+                    if key in REPORT_SECTIONS and key not in sent_sections and value:
+                        sent_sections.add(key)
+                        message = render_section(key, value, run_id)
+                        yield format_sse("message", message.model_dump())
+
+        execution_time = time.time() - start_time
+        logger.info(f"Streamed report run {run_id} completed in {execution_time:.2f}s")
+        yield format_sse(
+            "end",
+            {
+                "run_id": run_id,
+                "execution_time": execution_time,
+                "sections": sorted(sent_sections),
+                "profile": summarize_profile(node_profiles),
+            },
+        )
+    except Exception as e:
+        logger.exception(f"Streamed report run {run_id} failed")
+        yield format_sse("error", str(e))
+
+    yield "data: [DONE]\n\n"
@@ -85,6 +85,84 @@ def test_demo_endpoints():
     assert response.status_code == 200
     assert response.headers["content-type"] == "application/pdf"
 
+
+def test_report_jobs_validation():
+    """Test input validation and unknown ids for the report job endpoints"""
+    response = client.post("/jobs", json={})
+    assert response.status_code == 422
+
+    response = client.get("/jobs/does-not-exist")
+    assert response.status_code == 404
+
+    response = client.get("/jobs/does-not-exist/html")
+    assert response.status_code == 404
+
+
+def test_generate_report_stream_validation():
+    """Test input validation for the streaming endpoint"""
+    response = client.post("/generate-report/stream", json={})
+    assert response.status_code == 422
+
+
+def test_generate_report_batch_validation():
+    """Test input validation for the batch endpoint"""
+    response = client.post("/generate-report/batch", json={"meetings": []})
+    assert response.status_code == 422
+
+    response = client.post(
+        "/generate-report/batch", json={"meetings": [{"client_name": "Test"}]}
+    )
+    assert response.status_code == 422
+
+
+def test_report_assets():
+    """Test the content-hashed report assets are served with long-lived cache headers"""
+    from currensee.utils.static_assets import asset_urls
+
+    for url in asset_urls().values():
+        response = client.get(url)
+        assert response.status_code == 200
+        assert "immutable" in response.headers["cache-control"]
+
+    response = client.get("/static/report/report.0000000000000000.css")
+    assert response.status_code == 404
+
+
+def test_request_latency_covers_streamed_bodies(monkeypatch):
+    """Streaming responses are observed when their body is sent, not when the headers are"""
+    import asyncio
+    from types import SimpleNamespace
+
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+
+    from currensee.api import main
+
+    observed = []
+    histogram = SimpleNamespace(observe=observed.append)
+    monkeypatch.setattr(
+        main.metrics,
+        "REQUEST_LATENCY",
+        SimpleNamespace(labels=lambda *labels: histogram),
+    )
+
+    streaming_app = FastAPI()
+    streaming_app.middleware("http")(main.record_request_latency)
+
+    @streaming_app.get("/stream")
+    async def stream():
+        async def body():
+            for chunk in (b"a", b"b"):
+                await asyncio.sleep(0.1)
+                yield chunk
+
+        return StreamingResponse(body())
+
+    response = TestClient(streaming_app).get("/stream")
+    assert response.content == b"ab"
+    assert len(observed) == 1 and observed[0] >= 0.2
+
+
 if __name__ == "__main__":
     print("Running API tests...")
     
@@ -0,0 +1,146 @@
+"""
+Tests for the report job queues and runner
+"""
+
+import time
+from datetime import datetime
+from typing import Optional, TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+
+from currensee.api import jobs
+from currensee.api.jobs import (
+    InProcessJobQueue,
+    JobRunner,
+    RedisJobQueue,
+    SQLiteJobQueue,
+)
+
+
+class DemoState(TypedDict):
+    client_name: str
+    greeting: Optional[str]
+
+
+def build_demo_graph(fail: bool = False):
+    def greet(state):
+        if fail:
+            raise RuntimeError("boom")
+        return {"greeting": f"Hello {state['client_name']}"}
+
+    def shout(state):
+        return {"greeting": state["greeting"].upper()}
+
+    graph = StateGraph(DemoState)
+    graph.add_node("greet", greet)
+    graph.add_node("shout", shout)
+    graph.add_edge(START, "greet")
+    graph.add_edge("greet", "shout")
+    graph.add_edge("shout", END)
+    return graph.compile()
+
+
+def make_queue(backend, tmp_path, monkeypatch, **options):
+    if backend == "memory":
+        return InProcessJobQueue()
+    if backend == "sqlite":
+        return SQLiteJobQueue(str(tmp_path / "jobs.db"), poll_interval=0.01, **options)
+    if not jobs.HAS_REDIS:
+        pytest.skip("redis is not installed")
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # Lua scripting of fakeredis
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        jobs.redis.Redis,
+        "from_url",
+        lambda url, **kwargs: fakeredis.FakeRedis(server=server, **kwargs),
+    )
+    return RedisJobQueue("redis://localhost", **options)
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def job_queue(request, tmp_path, monkeypatch):
+    q = make_queue(request.param, tmp_path, monkeypatch)
+    yield q
+    q.close()
+
+
+def test_job_lifecycle(job_queue):
+    """A submitted job is claimed, run and its result stored"""
+    task = job_queue.submit(
+        {"client_name": "Adam Clay"}, data={"client_name": "Adam Clay"}
+    )
+    assert task.state == "new"
+    assert job_queue.get(task.run_id).state == "new"
+
+    job_id, payload = job_queue.claim(timeout=0.1)
+    assert job_id == task.run_id
+    assert job_queue.get(job_id).state == "running"
+    assert job_queue.claim(timeout=0.05) is None
+
+    JobRunner(job_queue, build_demo_graph()).run_job(job_id, payload)
+
+    status = job_queue.get(job_id)
+    assert status.completed()
+    assert status.result == "success"
+    assert status.data["client_name"] == "Adam Clay"
+    assert status.data["progress"] == {"completed": 2, "total": 2, "last_node": "shout"}
+    assert job_queue.get_result(job_id)["greeting"] == "HELLO ADAM CLAY"
+
+
+def test_failed_job(job_queue):
+    """Graph errors are recorded on the job instead of propagating"""
+    task = job_queue.submit({"client_name": "Adam Clay"})
+    job_id, payload = job_queue.claim(timeout=0.1)
+
+    JobRunner(job_queue, build_demo_graph(fail=True)).run_job(job_id, payload)
+
+    status = job_queue.get(task.run_id)
+    assert status.completed_with_error()
+    assert status.data["error"] == "boom"
+    assert job_queue.get_result(task.run_id) is None
+
+
+def test_unknown_job(job_queue):
+    assert job_queue.get("missing") is None
+    assert job_queue.get_result("missing") is None
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "redis"])
+def test_expired_lease_requeues_the_job(backend, tmp_path, monkeypatch):
+    """A job whose worker stops renewing the lease is claimed again, then failed after max_attempts"""
+    q = make_queue(backend, tmp_path, monkeypatch, lease_seconds=0.1, max_attempts=2)
+    task = q.submit({"client_name": "Adam Clay"})
+
+    assert q.claim(timeout=0.05)[0] == task.run_id
+    time.sleep(0.05)
+    q.heartbeat(task.run_id)
+    time.sleep(0.07)
+    assert q.claim(timeout=0.01) is None  # renewed 70ms ago, still leased
+
+    time.sleep(0.05)
+    assert q.claim(timeout=0.01)[0] == task.run_id
+    assert q.get(task.run_id).state == "running"
+
+    time.sleep(0.15)
+    assert q.claim(timeout=0.01) is None
+    status = q.get(task.run_id)
+    assert status.completed_with_error()
+    assert status.data["error"] == "Worker lost 2 times"
+    q.close()
+
+
+def test_results_are_json_normalized(job_queue):
+    """Every backend returns status data and results as they read back from JSON"""
+    task = job_queue.submit({}, data={"meeting": datetime(2024, 3, 1, 10)})
+    job_id, _ = job_queue.claim(timeout=0.1)
+    job_queue.set_result(
+        job_id, {"holdings": ("AAPL", "MSFT"), "at": datetime(2024, 3, 1)}
+    )
+
+    assert job_queue.get(task.run_id).data == {"meeting": "2024-03-01 10:00:00"}
+    assert job_queue.get_result(job_id) == {
+        "holdings": ["AAPL", "MSFT"],
+        "at": "2024-03-01 00:00:00",
+    }
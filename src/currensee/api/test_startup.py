@@ -0,0 +1,52 @@
+"""
+Import-time budget of the API process.
+
+Heavy libraries (plotting, data readers, PDF rendering, cloud and model
+clients) and the agent graph must only be imported when a report needs them,
+so API containers start quickly.
+"""
+
+import json
+import re
+import subprocess
+import sys
+
+IMPORT_BUDGET_SECONDS = 1.0
+
+DEFERRED_MODULES = [
+    "matplotlib",
+    "pandas_datareader",
+    "sklearn",
+    "weasyprint",
+    "google.cloud.secretmanager",
+    "langchain_google_genai",
+    "langgraph",
+    "currensee.agents.complete_graph",
+]
+
+SCRIPT = f"""
+import json, sys
+import currensee.api.main
+print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))
+"""
+
+
+def test_api_import_budget():
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+    assert loaded == [], f"Imported at API startup: {loaded}"
+
+    # Cumulative import time (microseconds) of the API module, from -X importtime
+    cumulative = [
+        int(m.group(1))
+        for m in re.finditer(
+            r"import time:\s+\d+ \|\s+(\d+) \| currensee\.api\.main$", proc.stderr, re.M
+        )
+    ]
+    assert cumulative and cumulative[0] / 1e6 < IMPORT_BUDGET_SECONDS
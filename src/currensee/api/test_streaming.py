@@ -0,0 +1,103 @@
+"""
+Tests for the server-sent-events report stream
+"""
+
+import asyncio
+import json
+import operator
+from typing import Annotated, List, Optional, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from currensee.api.streaming import stream_report_events
+from currensee.core.profiling import add_profiled_node
+
+
+class DemoState(TypedDict):
+    client_name: str
+    email_summary: Optional[str]
+    node_profile: Annotated[List[dict], operator.add]
+
+
+def build_demo_graph(fail: bool = False):
+    def fetch(state):
+        return {}
+
+    def summarize(state):
+        if fail:
+            raise RuntimeError("boom")
+        return {"email_summary": f"{state['client_name']} asked about bonds."}
+
+    graph = StateGraph(DemoState)
+    add_profiled_node(graph, "fetch", fetch)
+    add_profiled_node(graph, "summarize", summarize)
+    graph.add_edge(START, "fetch")
+    graph.add_edge("fetch", "summarize")
+    graph.add_edge("summarize", END)
+    return graph.compile()
+
+
+def collect_events(graph, init_state, run_id="run-1"):
+    async def collect():
+        return [
+            chunk async for chunk in stream_report_events(graph, init_state, run_id)
+        ]
+
+    chunks = asyncio.run(collect())
+    assert chunks[-1] == "data: [DONE]\n\n"
+    events = []
+    for chunk in chunks[:-1]:
+        assert chunk.startswith("data: ") and chunk.endswith("\n\n")
+        events.append(json.loads(chunk[len("data: ") :]))
+    return events
+
+
+def test_stream_sends_tasks_sections_and_summary():
+    events = collect_events(build_demo_graph(), {"client_name": "Acme"})
+
+    assert [event["type"] for event in events] == [
+        "task",
+        "task",
+        "task",
+        "message",
+        "task",
+        "end",
+    ]
+
+    tasks = [event["content"] for event in events if event["type"] == "task"]
+    assert [(task["name"], task["state"]) for task in tasks] == [
+        ("fetch", "new"),
+        ("fetch", "complete"),
+        ("summarize", "new"),
+        ("summarize", "complete"),
+    ]
+    assert all(task["run_id"] == "run-1" for task in tasks)
+    assert all(task["result"] == "success" for task in tasks[1::2])
+    assert tasks[0]["data"]["step"] < tasks[2]["data"]["step"]
+
+    message = events[3]["content"]
+    assert message["type"] == "custom"
+    assert message["run_id"] == "run-1"
+    assert message["custom_data"] == {
+        "section": "email_summary",
+        "title": "Email Summary",
+    }
+    assert "<h2>Email Summary</h2>" in message["content"]
+    assert "Acme asked about bonds." in message["content"]
+
+    end = events[-1]["content"]
+    assert end["run_id"] == "run-1"
+    assert end["sections"] == ["email_summary"]
+    assert sorted(node["node"] for node in end["profile"]["nodes"]) == [
+        "fetch",
+        "summarize",
+    ]
+    assert end["execution_time"] >= 0
+
+
+def test_failed_run_ends_with_an_error_event():
+    events = collect_events(build_demo_graph(fail=True), {"client_name": "Acme"})
+
+    assert events[-1] == {"type": "error", "content": "boom"}
+    assert "end" not in [event["type"] for event in events]
+    assert "message" not in [event["type"] for event in events]
@@ -1,5 +1,5 @@
-from currensee.core.llm import get_model
+from currensee.core.llm import get_default_model, get_model
 from currensee.core.secrets import get_secret, get_secret_str
 from currensee.core.settings import settings
 
-__all__ = ["settings", "get_model", "get_secret", "get_secret_str"]
+__all__ = ["settings", "get_model", "get_default_model", "get_secret", "get_secret_str"]
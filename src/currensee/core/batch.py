@@ -0,0 +1,336 @@
+"""
+Batch report generation for a list of meetings (e.g. a banker's morning briefing pack).
+
+Reports in a batch share a lot of work: the macro news searches are identical
+for every meeting, popular holdings are searched for several clients and the
+FRED macro table is the same for every report. While a batch is running,
+`shared_call` memoizes such computations across all of its reports (computing
+each one once, even when several reports ask for it at the same time), and the
+reports themselves run in parallel up to a concurrency cap. Results are yielded
+as soon as each report finishes.
+
+Also available as a command line tool:
+
+    currensee-batch meetings.json --format pdf --output-dir briefings
+    currensee-batch --date 2024-03-26 --user jane.moneypenny@bankwell.com
+"""
+
+import argparse
+import copy
+import json
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from currensee.agents.tools.base import state_json_default
+
+logger = logging.getLogger(__name__)
+
+
+class SharedComputations:
+    """
+    Single-flight memo of computations shared by the reports of a batch.
+    """
+
+    def __init__(self):
+        self._futures: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"computed": 0, "reused": 0}
+
+    def get_or_compute(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._futures[key] = future
+                self.stats["computed"] += 1
+            else:
+                self.stats["reused"] += 1
+
+        if owner:
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+
+        # Callers (e.g. the news scoring) annotate results in place, so each gets its own copy
+        return copy.deepcopy(future.result())
+
+
+_active_batch: ContextVar[Optional[SharedComputations]] = ContextVar(
+    "currensee_active_batch", default=None
+)
+
+
+def shared_call(key: Hashable, fn: Callable[[], Any]) -> Any:
+    """
+    Return fn(), reusing the value computed for the same key by another report
+    of the running batch. Outside of a batch this is simply fn().
+    """
+    shared = _active_batch.get()
+    if shared is None:
+        return fn()
+    return shared.get_or_compute(key, fn)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one report in a batch"""
+
+    index: int
+    init_state: Dict[str, Any]
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    execution_time: float = 0.0
+    cache_status: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-serializable description of the outcome, without the report data"""
+        return {
+            "index": self.index,
+            "client_name": self.init_state.get("client_name"),
+            "client_email": self.init_state.get("client_email"),
+            "meeting_timestamp": self.init_state.get("meeting_timestamp"),
+            "success": self.success,
+            "error": self.error,
+            "execution_time": round(self.execution_time, 2),
+            "cache_status": self.cache_status,
+        }
+
+
+def run_batch(
+    init_states: List[Dict[str, Any]],
+    compute: Callable[[Dict[str, Any]], Dict[str, Any]],
+    max_concurrency: int = 4,
+    report_cache=None,
+    shared: Optional[SharedComputations] = None,
+    stop: Optional[threading.Event] = None,
+) -> Iterator[BatchResult]:
+    """
+    Generate the reports of a batch of meetings in parallel. Closing the iterator
+    (or setting `stop`) skips the reports that have not started yet.
+
+    Args:
+        init_states: Initial graph states, one per meeting
+        compute: Function running the graph for an initial state
+        max_concurrency: Maximum number of reports generated at the same time
+        report_cache: Optional ReportCache to read from and store results in
+        shared: Memo of shared computations (a new one per batch by default)
+        stop: Optional event that, once set, makes the remaining reports fail as cancelled
+
+    Yields:
+        BatchResult for each report, in order of completion
+    """
+    shared = shared or SharedComputations()
+
+    def run_one(index: int, init_state: Dict[str, Any]) -> BatchResult:
+        token = _active_batch.set(shared)
+        start_time = time.time()
+        outcome = BatchResult(index=index, init_state=init_state)
+        if stop is not None and stop.is_set():
+            outcome.error = "Cancelled"
+            return outcome
+        try:
+            if report_cache is not None:
+                entry, outcome.cache_status = report_cache.get_or_compute(
+                    init_state, compute
+                )
+                outcome.result = entry.result
+            else:
+                outcome.result = compute(init_state)
+        except Exception as e:
+            logger.error(
+                f"Batch report {index} failed for {init_state.get('client_name')}: {e}"
+            )
+            outcome.error = str(e)
+        finally:
+            _active_batch.reset(token)
+        outcome.execution_time = time.time() - start_time
+        return outcome
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, max_concurrency), thread_name_prefix="report-batch"
+    )
+    try:
+        futures = [
+            executor.submit(run_one, i, state) for i, state in enumerate(init_states)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # Closed early: queued reports are dropped, running ones are waited for
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    logger.info(
+        f"Batch of {len(init_states)} report(s) done; shared computations: "
+        f"{shared.stats['computed']} computed, {shared.stats['reused']} reused"
+    )
+
+
+def _rejected(index: int, meeting: Dict[str, Any], error: Exception) -> BatchResult:
+    """Outcome of a meeting whose input was rejected before any report was generated"""
+    reason = getattr(error, "detail", None) or str(error)
+    logger.warning(
+        f"Skipping meeting {index} for {meeting.get('client_name')}: {reason}"
+    )
+    return BatchResult(index=index, init_state=meeting, error=f"Rejected: {reason}")
+
+
+def load_meetings(path: str) -> Tuple[List[Dict[str, Any]], List[BatchResult]]:
+    """
+    Read meetings (a JSON list of request payloads) from a file, or stdin for '-',
+    and validate them like the API's requests (ClientRequest.prepare_init_state).
+
+    Returns:
+        Initial states of the valid meetings, and the outcomes of the rejected ones
+    """
+    # The API's request model: same field checks, input guardrails and sanitization
+    from currensee.api.main import ClientRequest
+
+    if path == "-":
+        meetings = json.load(sys.stdin)
+    else:
+        with open(path, encoding="utf-8") as f:
+            meetings = json.load(f)
+    if isinstance(meetings, dict):
+        meetings = meetings.get("meetings", [])
+
+    init_states, rejected = [], []
+    for index, meeting in enumerate(meetings):
+        try:
+            init_states.append(ClientRequest(**meeting).prepare_init_state())
+        except Exception as e:
+            rejected.append(_rejected(index, meeting, e))
+    return init_states, rejected
+
+
+def meetings_for_day(
+    day: str, user_email: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], List[BatchResult]]:
+    """
+    Initial states for the client meetings on a day (YYYY-MM-DD), optionally for one
+    banker. Meetings rejected by the input guardrails are skipped.
+
+    Returns:
+        Initial states of the valid meetings, and the outcomes of the rejected ones
+    """
+    from currensee.core.pregeneration import fetch_upcoming_meetings
+
+    start = datetime.strptime(day, "%Y-%m-%d")
+    meetings = [
+        meeting
+        for meeting in fetch_upcoming_meetings(start, start + timedelta(days=1))
+        if user_email is None or meeting.user_email.lower() == user_email.lower()
+    ]
+    init_states, rejected = [], []
+    for index, meeting in enumerate(meetings):
+        try:
+            init_states.append(meeting.init_state())
+        except ValueError as e:
+            rejected.append(_rejected(index, asdict(meeting), e))
+    return init_states, rejected
+
+
+def write_report(result: Dict[str, Any], output_dir: Path, name: str, fmt: str) -> Path:
+    """Write one report as JSON, HTML or PDF and return its path"""
+    path = output_dir / f"{name}.{fmt}"
+    if fmt == "json":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result, f, default=state_json_default, indent=2)
+        return path
+
+    from currensee.utils.output_utils_dynamic import (
+        convert_html_to_pdf,
+        generate_report,
+        save_html_to_file,
+    )
+
+    html_content = generate_report(result)
+    if fmt == "html":
+        save_html_to_file(html_content, str(path))
+    else:
+        convert_html_to_pdf(html_content, str(path))
+    return path
+
+
+def report_name(init_state: Dict[str, Any], index: int) -> str:
+    """File name (without extension) of a report in the output directory"""
+    parts = [init_state.get("meeting_timestamp", ""), init_state.get("client_name", "")]
+    safe = "".join(c if c.isalnum() else "_" for c in "_".join(parts)).strip("_")
+    return f"{index:03d}_{safe}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate Currensee briefing reports for a batch of meetings"
+    )
+    parser.add_argument(
+        "meetings",
+        nargs="?",
+        help="JSON file with a list of meetings ('-' for stdin), same fields as /generate-report",
+    )
+    parser.add_argument(
+        "--date",
+        help="Generate reports for the client meetings on this day (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--user", help="With --date, only meetings hosted by this user email"
+    )
+    parser.add_argument("--format", choices=["json", "html", "pdf"], default="html")
+    parser.add_argument("--output-dir", default="briefings")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    if bool(args.meetings) == bool(args.date):
+        parser.error("pass either a meetings file or --date")
+
+    logging.basicConfig(level=logging.INFO)
+    init_states, rejected = (
+        load_meetings(args.meetings)
+        if args.meetings
+        else meetings_for_day(args.date, args.user)
+    )
+    for outcome in rejected:
+        print(json.dumps(outcome.summary()), flush=True)
+    if not init_states:
+        logger.info("No meetings to generate reports for")
+        return 1 if rejected else 0
+
+    from currensee.agents.complete_graph import compiled_graph
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    failures = len(rejected)
+    for outcome in run_batch(
+        init_states, compiled_graph.invoke, max_concurrency=args.concurrency
+    ):
+        summary = outcome.summary()
+        if outcome.success:
+            try:
+                name = report_name(outcome.init_state, outcome.index)
+                summary["path"] = str(
+                    write_report(outcome.result, output_dir, name, args.format)
+                )
+            except Exception as e:
+                summary.update(success=False, error=f"Rendering failed: {e}")
+        failures += not summary["success"]
+        print(json.dumps(summary), flush=True)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
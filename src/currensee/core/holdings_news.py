@@ -0,0 +1,246 @@
+"""
+Holdings news shared across clients.
+
+Clients mostly hold the same few hundred positions from `fund_detail`, so
+searching news per holding for every report repeats the same Serper queries
+over and over. Articles are kept per position in a process-wide
+`HoldingsNewsStore`, which `retrieve_holdings_news` reads before searching.
+The `HoldingsNewsService` keeps the store warm: it periodically refreshes the
+most held positions of the whole book with a bounded number of concurrent
+searches.
+
+Stored articles are unranked; each report scores and filters them for its own
+meeting window. Entries older than HOLDINGS_NEWS_MAX_AGE seconds (default 6
+hours) are searched again on lookup, and searches that found nothing only
+HOLDINGS_NEWS_EMPTY_MAX_AGE seconds (default 15 minutes) later. A failed search
+is not stored: lookups fall back to the previous (expired) articles of the
+position and the refresh keeps them.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional
+
+from currensee.agents.tools.base import NewsArticle
+from currensee.core.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+DB_NAME = "crm"
+
+
+@dataclass
+class PositionNews:
+    articles: List[NewsArticle]
+    fetched_at: float = field(default_factory=time.time)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class HoldingsNewsStore:
+    """Thread-safe articles per position name, shared by all reports of the process"""
+
+    def __init__(self, max_age: float = 6 * 3600, empty_max_age: float = 15 * 60):
+        self.max_age = max_age
+        self.empty_max_age = empty_max_age
+        self._entries: Dict[str, PositionNews] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expired(self, entry: PositionNews, within: Optional[float] = None) -> bool:
+        max_age = self.max_age if entry.articles else self.empty_max_age
+        return entry.age > (max_age if within is None else min(max_age, within))
+
+    def get(
+        self, position: str, allow_expired: bool = False
+    ) -> Optional[List[NewsArticle]]:
+        """
+        Fresh articles of a position, or None if missing or expired (older than
+        max_age, or empty_max_age for a search that found nothing). Copies are
+        returned, so reports can score them independently.
+
+        Args:
+            position: Position name
+            allow_expired: Return expired articles too (not counted as a lookup)
+        """
+        with self._lock:
+            entry = self._entries.get(position)
+            if not allow_expired:
+                fresh = entry is not None and not self._expired(entry)
+                self.stats["hits" if fresh else "misses"] += 1
+                record_cache_lookup("holdings_news", "hit" if fresh else "miss")
+                if not fresh:
+                    return None
+        if entry is None:
+            return None
+        return [replace(article) for article in entry.articles]
+
+    def put(self, position: str, articles: List[NewsArticle]) -> None:
+        with self._lock:
+            self._entries[position] = PositionNews(list(articles))
+
+    def age(self, position: str) -> Optional[float]:
+        with self._lock:
+            entry = self._entries.get(position)
+        return entry.age if entry else None
+
+    def is_fresh(self, position: str, within: float) -> bool:
+        """Whether the position was stored less than `within` seconds ago and has not expired"""
+        with self._lock:
+            entry = self._entries.get(position)
+        return entry is not None and not self._expired(entry, within)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+holdings_news_store = HoldingsNewsStore(
+    max_age=int(os.getenv("HOLDINGS_NEWS_MAX_AGE", str(6 * 3600))),
+    empty_max_age=int(os.getenv("HOLDINGS_NEWS_EMPTY_MAX_AGE", str(15 * 60))),
+)
+
+
+def search_position_news(position: str) -> List[NewsArticle]:
+    # Imported here: finance_tools imports this module, and the agents load lazily
+    from currensee.agents.tools.finance_tools import search_holding_news
+
+    return search_holding_news(position)
+
+
+def get_position_news(
+    position: str,
+    store: HoldingsNewsStore = holdings_news_store,
+    search_fn: Callable[[str], List[NewsArticle]] = search_position_news,
+) -> List[NewsArticle]:
+    """
+    Articles of a position from the store, searching (and storing) them on a miss.
+    If the search fails, the expired articles of the position are used, if any.
+    """
+    articles = store.get(position)
+    if articles is None:
+        try:
+            articles = search_fn(position)
+        except Exception as e:
+            logger.warning(f"Holdings news search failed for {position}: {e}")
+            return store.get(position, allow_expired=True) or []
+        store.put(position, articles)
+        articles = [replace(article) for article in articles]
+    return articles
+
+
+def _get_engine():
+    from currensee.utils.db_utils import get_engine
+
+    return get_engine(DB_NAME)
+
+
+def fetch_book_positions(limit: int) -> List[str]:
+    """
+    Equity positions held across the whole book, largest total exposure first.
+
+    Args:
+        limit: Maximum number of positions to return
+    """
+    from currensee.ingest.exposure import book_positions
+
+    return book_positions(_get_engine(), limit)
+
+
+class HoldingsNewsService:
+    """
+    Background thread refreshing the news of the book's positions into a HoldingsNewsStore.
+    """
+
+    def __init__(
+        self,
+        store: HoldingsNewsStore = holdings_news_store,
+        interval: int = 3600,
+        max_concurrency: int = 4,
+        max_positions: int = 300,
+        positions_fn: Callable[[int], List[str]] = fetch_book_positions,
+        search_fn: Callable[[str], List[NewsArticle]] = search_position_news,
+    ):
+        """
+        Args:
+            store: Store the articles are kept in
+            interval: Seconds between refreshes
+            max_concurrency: Maximum number of positions searched at the same time
+            max_positions: Number of most held positions kept warm
+            positions_fn: Function returning the positions to refresh
+            search_fn: Function searching the articles of a position
+        """
+        self.store = store
+        self.interval = interval
+        self.max_concurrency = max_concurrency
+        self.max_positions = max_positions
+        self._positions_fn = positions_fn
+        self._search_fn = search_fn
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self, positions: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Search and store the news of the given positions (by default the most held ones).
+        Positions refreshed less than half an interval ago are skipped, and positions
+        whose search fails keep their previous articles.
+
+        Returns:
+            Counts of refreshed, skipped and failed positions
+        """
+        if positions is None:
+            positions = self._positions_fn(self.max_positions)
+        counts = {"refreshed": 0, "skipped": 0, "failed": 0}
+
+        def refresh_position(position: str) -> str:
+            if self._stop.is_set():
+                return "skipped"
+            if self.store.is_fresh(position, self.interval / 2):
+                return "skipped"
+            try:
+                self.store.put(position, self._search_fn(position))
+                return "refreshed"
+            except Exception as e:
+                logger.error(f"Holdings news refresh failed for {position}: {e}")
+                return "failed"
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="holdings-news"
+        ) as executor:
+            for outcome in executor.map(refresh_position, positions):
+                counts[outcome] += 1
+
+        logger.info(f"Holdings news refresh: {counts}")
+        return counts
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Holdings news refresh failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="holdings-news", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -1,9 +1,7 @@
 from functools import cache
-from typing import TypeAlias
-
-from langchain_community.chat_models import FakeListChatModel
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import TYPE_CHECKING, TypeAlias
 
+from currensee.core.profiling import llm_callback
 from currensee.core.settings import settings
 from currensee.schema.models import (AllModelEnum, FakeModelName,
                                      GoogleModelName)
@@ -14,15 +12,21 @@ _MODEL_TABLE = {
     FakeModelName.FAKE: "fake",
 }
 
-ModelT: TypeAlias = ChatGoogleGenerativeAI
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+ModelT: TypeAlias = "ChatGoogleGenerativeAI"
+
 
+def _fake_tool_model(responses: list[str]):
+    # Deferred like the provider clients: langchain pulls in langsmith at import
+    from langchain_community.chat_models import FakeListChatModel
 
-class FakeToolModel(FakeListChatModel):
-    def __init__(self, responses: list[str]):
-        super().__init__(responses=responses)
+    class FakeToolModel(FakeListChatModel):
+        def bind_tools(self, tools):
+            return self
 
-    def bind_tools(self, tools):
-        return self
+    return FakeToolModel(responses=responses, callbacks=[llm_callback()])
 
 
 @cache
@@ -34,6 +38,16 @@ def get_model(model_name: AllModelEnum, /) -> ModelT:
         raise ValueError(f"Unsupported model: {model_name}")
 
     if model_name in GoogleModelName:
-        return ChatGoogleGenerativeAI(model=api_model_name, temperature=0.5)
+        # Deferred: the Google client libraries take most of the import time
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        return ChatGoogleGenerativeAI(
+            model=api_model_name, temperature=0.5, callbacks=[llm_callback()]
+        )
     if model_name in FakeModelName:
-        return FakeToolModel(responses=["This is a test response from the fake model."])
+        return _fake_tool_model(["This is a test response from the fake model."])
+
+
+def get_default_model() -> ModelT:
+    """The configured default model, created on first use"""
+    return get_model(settings.DEFAULT_MODEL)
@@ -0,0 +1,172 @@
+"""
+Prometheus metrics of the Currensee API.
+
+Metrics are recorded where the work happens (graph nodes, LLM and Serper calls,
+caches, database pools, guardrails and report jobs) and exported on /metrics.
+Recording a metric is a few atomic increments, cheap enough for every request.
+
+Running several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory shared by the workers (before they start): each worker then writes
+its samples there and /metrics aggregates all of them, whichever worker
+serves the scrape.
+
+Requires the optional `prometheus_client` package; without it every metric is
+a no-op and /metrics is unavailable.
+"""
+
+import os
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        multiprocess,
+    )
+
+    HAS_PROMETHEUS = True
+except ImportError:
+    HAS_PROMETHEUS = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _NullMetric:
+    """Stand-in for metrics when prometheus_client is not installed"""
+
+    def labels(self, *args, **kwargs) -> "_NullMetric":
+        return self
+
+    def observe(self, value: float) -> None:
+        pass
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def dec(self, amount: float = 1) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+
+def _metric(cls_name: str, name: str, documentation: str, labels=(), **kwargs):
+    if not HAS_PROMETHEUS:
+        return _NullMetric()
+    cls = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}[cls_name]
+    return cls(name, documentation, list(labels), **kwargs)
+
+
+# Report generation takes minutes, API calls seconds
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+REQUEST_LATENCY = _metric(
+    "histogram",
+    "currensee_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route", "status"),
+    buckets=SLOW_BUCKETS,
+)
+NODE_DURATION = _metric(
+    "histogram",
+    "currensee_graph_node_duration_seconds",
+    "Wall time of report graph nodes",
+    ("node",),
+    buckets=SLOW_BUCKETS,
+)
+NODE_ERRORS = _metric(
+    "counter",
+    "currensee_graph_node_errors_total",
+    "Failed report graph nodes",
+    ("node",),
+)
+LLM_LATENCY = _metric(
+    "histogram",
+    "currensee_llm_call_duration_seconds",
+    "LLM call latency",
+    buckets=SLOW_BUCKETS,
+)
+LLM_ERRORS = _metric("counter", "currensee_llm_call_errors_total", "Failed LLM calls")
+LLM_TOKENS = _metric(
+    "counter",
+    "currensee_llm_tokens_total",
+    "LLM tokens by kind (prompt or completion)",
+    ("kind",),
+)
+SEARCH_LATENCY = _metric(
+    "histogram",
+    "currensee_serper_call_duration_seconds",
+    "Serper search latency",
+    buckets=SLOW_BUCKETS,
+)
+SEARCH_ERRORS = _metric(
+    "counter", "currensee_serper_call_errors_total", "Failed Serper searches"
+)
+CACHE_LOOKUPS = _metric(
+    "counter",
+    "currensee_cache_lookups_total",
+    "Cache lookups by cache and status (hit, stale, miss or bypass)",
+    ("cache", "status"),
+)
+DB_POOL_CONNECTIONS = _metric(
+    "gauge",
+    "currensee_db_pool_connections",
+    "Database pool connections by state (checked_out or size)",
+    ("database", "state"),
+    multiprocess_mode="livesum",
+)
+GUARDRAIL_LATENCY = _metric(
+    "histogram",
+    "currensee_guardrail_validation_duration_seconds",
+    "Input guardrail validation time",
+    ("valid",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+JOBS_IN_FLIGHT = _metric(
+    "gauge",
+    "currensee_jobs_in_flight",
+    "Report jobs being executed",
+    multiprocess_mode="livesum",
+)
+
+
+def record_cache_lookup(cache: str, status: str) -> None:
+    CACHE_LOOKUPS.labels(cache, status).inc()
+
+
+def instrument_pool(engine, database: str) -> None:
+    """Track the checked out connections and the size of an engine's pool"""
+    from sqlalchemy import event
+
+    checked_out = DB_POOL_CONNECTIONS.labels(database, "checked_out")
+    size = getattr(engine.pool, "size", None)
+    if callable(size):
+        DB_POOL_CONNECTIONS.labels(database, "size").set(size())
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+
+def render_metrics() -> bytes:
+    """Metrics in the Prometheus text format, aggregated across workers in multiprocess mode"""
+    if not HAS_PROMETHEUS:
+        raise RuntimeError("prometheus_client is not installed")
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop the live gauges of a stopped worker (multiprocess mode only)"""
+    if HAS_PROMETHEUS and os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
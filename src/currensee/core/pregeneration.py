@@ -0,0 +1,294 @@
+"""
+Calendar-driven pre-generation of briefing reports.
+
+Reports are normally built when the banker opens a briefing, which means
+waiting minutes for the graph. The scheduler periodically scans `meeting_data`
+for meetings starting within a lookahead window and runs the graph for them
+ahead of time, storing the results in the report cache so the briefing is
+ready when it is requested.
+
+Meetings are processed in order of start time with a bounded number of
+concurrent graph runs. Runs are kept to off-peak hours, except for meetings
+that would start before the next off-peak slot opens.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from currensee.core.input_guardrails import CurrenSeeInputGuardrails
+from currensee.core.report_cache import ReportCache
+from currensee.utils.security_utils import get_sanitized_inputs, log_security_metrics
+
+logger = logging.getLogger(__name__)
+
+DB_NAME = "crm_outlook"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@dataclass
+class UpcomingMeeting:
+    """A client meeting found in the calendar"""
+
+    user_email: str
+    client_name: str
+    client_email: str
+    meeting_timestamp: str
+    meeting_description: str
+
+    def init_state(self) -> Dict[str, Any]:
+        """
+        Initial graph state, validated and sanitized by the input guardrails like the
+        API's (ClientRequest.prepare_init_state), since pre-generated reports are served
+        from the cache to API requests. Raises ValueError if validation fails.
+        """
+        start = time.time()
+        validation_results = CurrenSeeInputGuardrails().validate_comprehensive(
+            user_email=self.user_email,
+            client_name=self.client_name,
+            client_email=self.client_email,
+            meeting_timestamp=self.meeting_timestamp,
+            meeting_description=self.meeting_description,
+        )
+        log_security_metrics(validation_results, (time.time() - start) * 1000)
+        if not validation_results["overall_valid"]:
+            issues = [
+                issue
+                for result in validation_results["validation_details"].values()
+                if not result.get("valid", True)
+                for issue in result.get("issues", [])
+            ]
+            raise ValueError(
+                f"Meeting rejected by the input guardrails: {'; '.join(issues)}"
+            )
+        sanitized_inputs = get_sanitized_inputs(validation_results)
+
+        return {
+            "user_email": self.user_email,
+            "client_name": sanitized_inputs.get("client_name", self.client_name),
+            "client_email": self.client_email,
+            "meeting_timestamp": self.meeting_timestamp,
+            "meeting_description": sanitized_inputs.get(
+                "meeting_description", self.meeting_description
+            ),
+            "report_length": "long",
+        }
+
+
+def _get_engine():
+    from currensee.utils.db_utils import get_engine
+
+    return get_engine(DB_NAME)
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [
+        part.strip()
+        for part in (value or "").replace(";", ",").split(",")
+        if part.strip()
+    ]
+
+
+def fetch_upcoming_meetings(start: datetime, end: datetime) -> List[UpcomingMeeting]:
+    """
+    Find client meetings starting between start and end.
+
+    Meetings without a host and internal meetings (all invitees share the host's
+    domain) are skipped; for meetings with several external invitees the first
+    one is used as the client.
+
+    Args:
+        start: Start of the window
+        end: End of the window
+
+    Returns:
+        Meetings ordered by start time
+    """
+    with _get_engine().connect() as conn:
+        rows = conn.execute(
+            text(
+                """
+                SELECT meeting_timestamp, host_email, invitees, invitee_emails, meeting_subject
+                FROM meeting_data
+                WHERE meeting_timestamp >= :start
+                AND meeting_timestamp < :end
+                ORDER BY meeting_timestamp
+                """
+            ),
+            {
+                "start": start.strftime(TIMESTAMP_FORMAT),
+                "end": end.strftime(TIMESTAMP_FORMAT),
+            },
+        ).fetchall()
+
+    meetings = []
+    for meeting_timestamp, host_email, invitees, invitee_emails, subject in rows:
+        if not host_email:
+            # e.g. ICS events without an organizer, loaded without --host-email
+            logger.warning(f"Skipping meeting at {meeting_timestamp} without a host")
+            continue
+        host_domain = host_email.split("@", 1)[-1].lower()
+        names = _split(invitees)
+        for i, email in enumerate(_split(invitee_emails)):
+            if email.split("@", 1)[-1].lower() == host_domain:
+                continue
+            meetings.append(
+                UpcomingMeeting(
+                    user_email=host_email,
+                    client_name=names[i] if i < len(names) else email,
+                    client_email=email,
+                    meeting_timestamp=str(meeting_timestamp),
+                    meeting_description=subject,
+                )
+            )
+            break
+
+    return meetings
+
+
+class PregenerationScheduler:
+    """
+    Background thread that pre-builds reports for upcoming meetings into a ReportCache.
+    """
+
+    def __init__(
+        self,
+        report_cache: ReportCache,
+        compute: Callable[[Dict[str, Any]], Dict[str, Any]],
+        lookahead_hours: int = 24,
+        interval: int = 900,
+        max_concurrency: int = 2,
+        off_peak_start: int = 20,
+        off_peak_end: int = 6,
+        fetch_fn: Callable[
+            [datetime, datetime], List[UpcomingMeeting]
+        ] = fetch_upcoming_meetings,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        """
+        Args:
+            report_cache: Cache the reports are stored in
+            compute: Function running the graph for an initial state
+            lookahead_hours: How far ahead to look for meetings
+            interval: Seconds between calendar scans
+            max_concurrency: Maximum number of concurrent graph runs
+            off_peak_start: Hour (0-23) the off-peak slot starts
+            off_peak_end: Hour (0-23) the off-peak slot ends
+            fetch_fn: Function returning the meetings in a time window
+            clock: Function returning the current time
+        """
+        self.report_cache = report_cache
+        self.compute = compute
+        self.lookahead = timedelta(hours=lookahead_hours)
+        self.interval = interval
+        self.max_concurrency = max_concurrency
+        self.off_peak_start = off_peak_start
+        self.off_peak_end = off_peak_end
+        self._fetch_fn = fetch_fn
+        self._clock = clock
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def is_off_peak(self, when: datetime) -> bool:
+        if self.off_peak_start <= self.off_peak_end:
+            return self.off_peak_start <= when.hour < self.off_peak_end
+        return when.hour >= self.off_peak_start or when.hour < self.off_peak_end
+
+    def next_off_peak(self, when: datetime) -> datetime:
+        """Start of the next off-peak slot (when itself if already off-peak)"""
+        if self.is_off_peak(when):
+            return when
+        start = when.replace(
+            hour=self.off_peak_start, minute=0, second=0, microsecond=0
+        )
+        return start if start > when else start + timedelta(days=1)
+
+    def due_meetings(self, now: Optional[datetime] = None) -> List[UpcomingMeeting]:
+        """
+        Meetings in the lookahead window that should be generated now, earliest first.
+        Outside off-peak hours only meetings starting before the next off-peak slot are due.
+        """
+        now = now or self._clock()
+        end = now + self.lookahead
+        if not self.is_off_peak(now):
+            end = min(end, self.next_off_peak(now))
+
+        meetings = sorted(self._fetch_fn(now, end), key=lambda m: m.meeting_timestamp)
+        due = []
+        for meeting in meetings:
+            try:
+                init_state = meeting.init_state()
+            except ValueError as e:
+                logger.warning(
+                    f"Skipping pre-generation for {meeting.client_email}: {e}"
+                )
+                continue
+            entry, status = self.report_cache.lookup(init_state)
+            if status != "hit":
+                due.append(meeting)
+        return due
+
+    def run_once(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Generate the reports of all due meetings.
+
+        Returns:
+            Counts of generated and failed reports
+        """
+        meetings = self.due_meetings(now)
+        counts = {"generated": 0, "failed": 0}
+        if not meetings:
+            return counts
+
+        logger.info(f"Pre-generating {len(meetings)} report(s) for upcoming meetings")
+
+        def generate(meeting: UpcomingMeeting) -> bool:
+            if self._stop.is_set():
+                return False
+            try:
+                self.report_cache.refresh(meeting.init_state(), self.compute)
+                logger.info(
+                    f"Pre-generated report for {meeting.client_name} at {meeting.meeting_timestamp}"
+                )
+                return True
+            except Exception as e:
+                logger.error(f"Pre-generation failed for {meeting.client_email}: {e}")
+                return False
+
+        # The executor picks up work in submission order, so earlier meetings go first
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="pregeneration"
+        ) as executor:
+            for ok in executor.map(generate, meetings):
+                counts["generated" if ok else "failed"] += 1
+
+        return counts
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Pre-generation scan failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="pregeneration", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,227 @@
+"""
+Per-node profiling of the report graph.
+
+Every node of `complete_graph` is registered through `add_profiled_node`, which
+times the node and counts what it spends while it runs: LLM calls and their
+prompt/completion tokens, Serper searches, and database queries with the rows
+they return. The tools report these through `record_llm_call`,
+`record_search_call` and `record_db_query` (the LLM and database hooks are
+installed on the model clients and engines, so the tools themselves only count
+searches). Calls made outside a profiled node are not attributed to a node,
+but, like node durations, still feed the Prometheus metrics (core.metrics).
+
+Each node appends its `NodeProfile` to the `node_profile` key of the graph state;
+`summarize_profile` turns that list into the per-run breakdown returned by the
+API. When OpenTelemetry is installed, every node also emits a span carrying the
+same counters.
+"""
+
+import functools
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from opentelemetry import trace
+
+    HAS_OTEL = True
+except ImportError:
+    HAS_OTEL = False
+
+from currensee.core import metrics
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = (
+    "llm_calls",
+    "prompt_tokens",
+    "completion_tokens",
+    "serper_calls",
+    "db_queries",
+    "db_rows",
+)
+
+
+@dataclass
+class NodeProfile:
+    node: str
+    wall_time: float = 0.0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    serper_calls: int = 0
+    db_queries: int = 0
+    db_rows: int = 0
+    error: Optional[str] = None
+
+
+# Profile of the node running in the current context (None outside graph nodes)
+_current_node: ContextVar[Optional[NodeProfile]] = ContextVar(
+    "current_node_profile", default=None
+)
+
+
+def record_llm_call(
+    prompt_tokens: int = 0, completion_tokens: int = 0, duration: Optional[float] = None
+) -> None:
+    if duration is not None:
+        metrics.LLM_LATENCY.observe(duration)
+    metrics.LLM_TOKENS.labels("prompt").inc(prompt_tokens)
+    metrics.LLM_TOKENS.labels("completion").inc(completion_tokens)
+    profile = _current_node.get()
+    if profile is not None:
+        profile.llm_calls += 1
+        profile.prompt_tokens += prompt_tokens
+        profile.completion_tokens += completion_tokens
+
+
+def record_search_call(duration: Optional[float] = None, failed: bool = False) -> None:
+    if duration is not None:
+        metrics.SEARCH_LATENCY.observe(duration)
+    if failed:
+        metrics.SEARCH_ERRORS.inc()
+    profile = _current_node.get()
+    if profile is not None:
+        profile.serper_calls += 1
+
+
+def record_db_query(rows: int = 0) -> None:
+    profile = _current_node.get()
+    if profile is not None:
+        profile.db_queries += 1
+        profile.db_rows += max(rows, 0)
+
+
+def _start_span(name: str):
+    if not HAS_OTEL:
+        return None
+    return trace.get_tracer("currensee").start_span(f"graph.node.{name}")
+
+
+def _end_span(span, profile: NodeProfile) -> None:
+    if span is None:
+        return
+    span.set_attribute("currensee.node", profile.node)
+    span.set_attribute("currensee.wall_time", profile.wall_time)
+    for counter in COUNTERS:
+        span.set_attribute(f"currensee.{counter}", getattr(profile, counter))
+    if profile.error:
+        span.set_status(trace.Status(trace.StatusCode.ERROR, profile.error))
+    span.end()
+
+
+def profile_node(name: str, fn: Callable[[Dict[str, Any]], Dict[str, Any]]):
+    """
+    Wrap a graph node so its timing and counters are added to the state's `node_profile`.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(state):
+        profile = NodeProfile(node=name)
+        token = _current_node.set(profile)
+        span = _start_span(name)
+        start = time.perf_counter()
+        try:
+            update = fn(state)
+        except Exception as e:
+            profile.error = str(e)
+            metrics.NODE_ERRORS.labels(name).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.NODE_DURATION.labels(name).observe(elapsed)
+            profile.wall_time = round(elapsed, 4)
+            _current_node.reset(token)
+            _end_span(span, profile)
+            logger.debug(f"Node {name}: {profile}")
+
+        update = dict(update or {})
+        update["node_profile"] = [asdict(profile)]
+        return update
+
+    return wrapper
+
+
+def add_profiled_node(
+    graph, name: str, fn: Callable[[Dict[str, Any]], Dict[str, Any]]
+) -> None:
+    """Register a node on a StateGraph, wrapped by `profile_node`"""
+    graph.add_node(name, profile_node(name, fn))
+
+
+def summarize_profile(node_profiles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Per-run breakdown of a report from the state's `node_profile` list.
+
+    Returns:
+        Dict with the node profiles (slowest first), the run totals and the slowest node
+    """
+    nodes = sorted(node_profiles, key=lambda p: p["wall_time"], reverse=True)
+    totals = {counter: sum(p[counter] for p in nodes) for counter in COUNTERS}
+    totals["wall_time"] = round(sum(p["wall_time"] for p in nodes), 4)
+    return {
+        "nodes": nodes,
+        "totals": totals,
+        "slowest_node": nodes[0]["node"] if nodes else None,
+    }
+
+
+def _token_usage(response) -> tuple[int, int]:
+    """Prompt and completion tokens of a LangChain LLMResult"""
+    prompt_tokens = completion_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = (
+                getattr(getattr(generation, "message", None), "usage_metadata", None)
+                or {}
+            )
+            prompt_tokens += usage.get("input_tokens", 0)
+            completion_tokens += usage.get("output_tokens", 0)
+    if not (prompt_tokens or completion_tokens):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+    return prompt_tokens, completion_tokens
+
+
+@functools.lru_cache(maxsize=1)
+def llm_callback():
+    """LangChain callback handler timing and counting the calls and tokens of a model client"""
+    # Deferred: langchain is only needed once a model client is created
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class ProfilingCallbackHandler(BaseCallbackHandler):
+        def __init__(self):
+            self._started: Dict[Any, float] = {}
+
+        def on_chat_model_start(
+            self, serialized, messages, *, run_id, **kwargs
+        ) -> None:
+            self._started[run_id] = time.perf_counter()
+
+        def on_llm_start(self, serialized, prompts, *, run_id, **kwargs) -> None:
+            self._started[run_id] = time.perf_counter()
+
+        def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+            started = self._started.pop(run_id, None)
+            duration = time.perf_counter() - started if started is not None else None
+            record_llm_call(*_token_usage(response), duration=duration)
+
+        def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+            self._started.pop(run_id, None)
+            metrics.LLM_ERRORS.inc()
+
+    return ProfilingCallbackHandler()
+
+
+def instrument_engine(engine, database: str) -> None:
+    """Count the queries and returned rows of a SQLAlchemy engine and track its pool"""
+    from sqlalchemy import event
+
+    metrics.instrument_pool(engine, database)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        record_db_query(cursor.rowcount)
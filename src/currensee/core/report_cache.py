@@ -0,0 +1,342 @@
+"""
+Result cache for generated briefing reports.
+
+Running the graph takes minutes, while opening the same briefing twice (for
+example as HTML and then as PDF) needs exactly the same final state. Entries
+are keyed on (user_email, client_email, meeting_timestamp, preference version)
+and remember the latest client email timestamp seen when they were built, so an
+entry is invalidated as soon as new client emails or a new preference version
+arrive.
+
+With stale-while-revalidate enabled, an entry older than its TTL is still
+served (within `max_stale` seconds) while a fresh copy is built in the
+background.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from currensee.core.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+DB_NAME = "crm_outlook"
+
+
+@dataclass
+class DataVersion:
+    """Freshness markers of the data a report is built from."""
+
+    preference_version: Optional[str]
+    email_watermark: Optional[str]
+
+
+@dataclass
+class CacheEntry:
+    """A cached final graph state and the artifacts rendered from it."""
+
+    key: str
+    user_email: str
+    client_email: str
+    result: Dict[str, Any]
+    email_watermark: Optional[str]
+    created_at: float = field(default_factory=time.time)
+    artifacts: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+
+def _get_engine():
+    from currensee.utils.db_utils import get_engine
+
+    return get_engine(DB_NAME)
+
+
+def fetch_data_version(
+    user_email: str, client_email: str, meeting_timestamp: str
+) -> DataVersion:
+    """
+    Look up the preference version and the latest email exchanged with the
+    client's company before the meeting.
+
+    Args:
+        user_email: Email of the banker
+        client_email: Email of the client (its domain identifies the company)
+        meeting_timestamp: Meeting time (YYYY-MM-DD HH:MM:SS)
+
+    Returns:
+        DataVersion for the report inputs
+    """
+    client_domain = client_email.split("@", 1)[-1]
+    with _get_engine().connect() as conn:
+        preference_version = conn.execute(
+            text(
+                """
+                SELECT max(as_of_date)
+                FROM preferences
+                WHERE email = :user_email
+                AND as_of_date <= :meeting_timestamp
+                """
+            ),
+            {"user_email": user_email, "meeting_timestamp": meeting_timestamp},
+        ).scalar()
+        email_watermark = conn.execute(
+            text(
+                """
+                SELECT max(email_timestamp)
+                FROM email_data
+                WHERE email_timestamp <= :meeting_timestamp
+                AND (from_email ILIKE :domain OR to_emails ILIKE :domain)
+                AND (from_email = :user_email OR to_emails = :user_email)
+                """
+            ),
+            {
+                "user_email": user_email,
+                "meeting_timestamp": meeting_timestamp,
+                "domain": f"%@{client_domain}",
+            },
+        ).scalar()
+
+    return DataVersion(
+        preference_version=str(preference_version) if preference_version else None,
+        email_watermark=str(email_watermark) if email_watermark else None,
+    )
+
+
+def make_cache_key(
+    init_state: Dict[str, Any], preference_version: Optional[str]
+) -> str:
+    """Build the cache key of a report request"""
+    parts = (
+        init_state["user_email"].lower(),
+        init_state["client_email"].lower(),
+        init_state["meeting_timestamp"],
+        preference_version or "",
+    )
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """
+    In-process LRU cache of final report states.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        ttl: int = 3600,
+        stale_while_revalidate: bool = False,
+        max_stale: int = 86400,
+        max_entries: int = 256,
+        version_fn: Callable[[str, str, str], DataVersion] = fetch_data_version,
+    ):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self._version_fn = version_fn
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._revalidating: set[str] = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="report-cache"
+        )
+        self.stats = {"hit": 0, "stale": 0, "miss": 0}
+
+    def _data_version(self, init_state: Dict[str, Any]) -> Optional[DataVersion]:
+        try:
+            return self._version_fn(
+                init_state["user_email"],
+                init_state["client_email"],
+                init_state["meeting_timestamp"],
+            )
+        except Exception as e:
+            logger.warning(
+                f"Could not determine report data version, bypassing cache: {e}"
+            )
+            return None
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[entry.key] = entry
+            self._entries.move_to_end(entry.key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._key_locks.pop(evicted, None)
+
+    def lookup(self, init_state: Dict[str, Any]) -> Tuple[Optional[CacheEntry], str]:
+        """
+        Look up a report without computing it.
+
+        Returns:
+            (entry, status) where status is "hit", "stale" or "miss"
+        """
+        version = self._data_version(init_state) if self.enabled else None
+        if version is None:
+            return None, "miss"
+        entry = self.get(make_cache_key(init_state, version.preference_version))
+        return entry, self._status(entry, version)
+
+    def _status(self, entry: Optional[CacheEntry], version: DataVersion) -> str:
+        if entry is None or entry.email_watermark != version.email_watermark:
+            return "miss"
+        if entry.age <= self.ttl:
+            return "hit"
+        if self.stale_while_revalidate and entry.age <= self.ttl + self.max_stale:
+            return "stale"
+        return "miss"
+
+    def get_or_compute(
+        self,
+        init_state: Dict[str, Any],
+        compute: Callable[[Dict[str, Any]], Dict[str, Any]],
+    ) -> Tuple[CacheEntry, str]:
+        """
+        Return the cached report for init_state, computing it if needed.
+
+        Args:
+            init_state: Initial graph state
+            compute: Function running the graph for init_state
+
+        Returns:
+            (entry, status) where status is "hit", "stale", "miss" or "bypass"
+        """
+        version = self._data_version(init_state) if self.enabled else None
+        if version is None:
+            record_cache_lookup("report", "bypass")
+            result = compute(init_state)
+            return self._new_entry("", init_state, result, None), "bypass"
+
+        key = make_cache_key(init_state, version.preference_version)
+        entry = self.get(key)
+        status = self._status(entry, version)
+
+        if status == "hit":
+            self.stats["hit"] += 1
+            record_cache_lookup("report", "hit")
+            return entry, status
+        if status == "stale":
+            self.stats["stale"] += 1
+            record_cache_lookup("report", "stale")
+            self._revalidate(key, init_state, compute, version)
+            return entry, status
+
+        # Only one thread builds a given report; others wait and reuse it
+        with self._key_lock(key):
+            entry = self.get(key)
+            if self._status(entry, version) in ("hit", "stale"):
+                self.stats["hit"] += 1
+                record_cache_lookup("report", "hit")
+                return entry, "hit"
+            self.stats["miss"] += 1
+            record_cache_lookup("report", "miss")
+            return self.refresh(init_state, compute, version), "miss"
+
+    def refresh(
+        self,
+        init_state: Dict[str, Any],
+        compute: Callable[[Dict[str, Any]], Dict[str, Any]],
+        version: Optional[DataVersion] = None,
+    ) -> CacheEntry:
+        """Compute the report for init_state and store it, replacing any cached copy"""
+        version = version or self._data_version(init_state)
+        result = compute(init_state)
+        if version is None:
+            return self._new_entry("", init_state, result, None)
+        key = make_cache_key(init_state, version.preference_version)
+        entry = self._new_entry(key, init_state, result, version.email_watermark)
+        if self.enabled:
+            self.put(entry)
+        return entry
+
+    def _revalidate(self, key, init_state, compute, version) -> None:
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def task():
+            try:
+                self.refresh(init_state, compute, version)
+                logger.info(
+                    f"Revalidated cached report for client: {init_state.get('client_name')}"
+                )
+            except Exception as e:
+                logger.error(f"Background revalidation failed: {e}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        self._executor.submit(task)
+
+    @staticmethod
+    def _new_entry(key, init_state, result, email_watermark) -> CacheEntry:
+        return CacheEntry(
+            key=key,
+            user_email=init_state["user_email"],
+            client_email=init_state["client_email"],
+            result=result,
+            email_watermark=email_watermark,
+        )
+
+    def invalidate(
+        self,
+        user_email: Optional[str] = None,
+        client_email: Optional[str] = None,
+        client_domain: Optional[str] = None,
+    ) -> int:
+        """
+        Drop cached reports for a user and/or client (all reports if none is given),
+        e.g. after new preferences or client emails are loaded. `client_domain`
+        matches every client of a company, as emails from any of its contacts
+        feed the report.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [
+                key
+                for key, entry in self._entries.items()
+                if (
+                    user_email is None or entry.user_email.lower() == user_email.lower()
+                )
+                and (
+                    client_email is None
+                    or entry.client_email.lower() == client_email.lower()
+                )
+                and (
+                    client_domain is None
+                    or entry.client_email.lower().rsplit("@", 1)[-1]
+                    == client_domain.lower()
+                )
+            ]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -13,8 +13,6 @@ import sys
 from typing import Dict, Optional
 
 from dotenv import load_dotenv
-from google.auth import exceptions as auth_exceptions
-from google.cloud import secretmanager
 from pydantic import SecretStr
 
 # Configure logging
@@ -62,6 +60,10 @@ class SecretManager:
     def client(self):
         """Lazy initialization of the Secret Manager client."""
         if self._client is None:
+            # Deferred: the Google Cloud client libraries are slow to import
+            from google.auth import exceptions as auth_exceptions
+            from google.cloud import secretmanager
+
             try:
                 logger.info("Initializing Secret Manager client...")
                 self._client = secretmanager.SecretManagerServiceClient()
@@ -97,15 +97,9 @@ class Settings(BaseSettings):
         return f"postgresql+psycopg2://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD.get_secret_value()}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}"
 
     def model_post_init(self, __context: Any) -> None:
-        # Try to load SERPER_API_KEY from Secret Manager if available
-        if HAS_SECRET_MANAGER:
-            # Only set if not already provided through environment variables
-            if self.SERPER_API_KEY is None:
-                serper_key = get_secret_str("SERPER_API_KEY")
-                if serper_key:
-                    self.SERPER_API_KEY = serper_key
-
-        # Continue with normal initialization
+        # SERPER_API_KEY is not read from Secret Manager here: that imports the Google
+        # Cloud client and authenticates, so it is deferred to the first search
+        # (see get_serper_api_key)
         api_keys = {
             Provider.GOOGLE: self.GOOGLE_API_KEY,
             Provider.FAKE: self.USE_FAKE_MODEL,
@@ -134,3 +128,15 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
+
+
+def get_serper_api_key() -> Optional[str]:
+    """
+    The Serper API key from the environment or, looked up on first use and then
+    kept in the settings, from Secret Manager.
+    """
+    if settings.SERPER_API_KEY is None and HAS_SECRET_MANAGER:
+        settings.SERPER_API_KEY = get_secret_str("SERPER_API_KEY")
+    if settings.SERPER_API_KEY is None:
+        return None
+    return settings.SERPER_API_KEY.get_secret_value()
@@ -0,0 +1,140 @@
+"""
+Tests for batch report generation
+"""
+
+import json
+import threading
+import time
+
+from currensee.agents.tools.base import EmailRecord, NewsArticle
+from currensee.api.streaming import format_sse
+from currensee.core import batch, pregeneration
+from currensee.core.batch import (
+    SharedComputations,
+    load_meetings,
+    meetings_for_day,
+    run_batch,
+    shared_call,
+    write_report,
+)
+from currensee.core.pregeneration import UpcomingMeeting
+
+MEETING = {
+    "user_email": "jane.moneypenny@bankwell.com",
+    "client_name": "Adam Clay",
+    "client_email": "adam.clay@compass.com",
+    "meeting_timestamp": "2024-03-26 09:00:00",
+    "meeting_description": "Compass - Annual Credit Facility Review Meeting",
+}
+INJECTED = {**MEETING, "meeting_description": "Review'; DROP TABLE portfolio; --"}
+
+
+def test_batch_shares_computations_and_reports_failures():
+    fetches = []
+    lock = threading.Lock()
+
+    def fetch_macro_news():
+        with lock:
+            fetches.append("macro")
+        return [{"title": "Rates on hold"}]
+
+    def compute(init_state):
+        if init_state["client_name"] == "broken":
+            raise ValueError("no CRM record")
+        news = shared_call(("serper", "macro"), fetch_macro_news)
+        news[0]["client"] = init_state[
+            "client_name"
+        ]  # callers may annotate results in place
+        return {**init_state, "macro_news_sources": news}
+
+    init_states = [{"client_name": name} for name in ("a", "b", "broken", "c")]
+    shared = SharedComputations()
+    outcomes = sorted(
+        run_batch(init_states, compute, max_concurrency=3, shared=shared),
+        key=lambda o: o.index,
+    )
+
+    assert [o.success for o in outcomes] == [True, True, False, True]
+    assert outcomes[2].error == "no CRM record"
+    assert outcomes[1].result["macro_news_sources"][0]["client"] == "b"
+    assert fetches == ["macro"]
+    assert shared.stats == {"computed": 1, "reused": 2}
+
+    # Outside of a batch nothing is shared
+    shared_call(("serper", "macro"), fetch_macro_news)
+    assert fetches == ["macro", "macro"]
+
+
+def test_batch_results_serialize_records_as_objects(tmp_path):
+    email = EmailRecord(
+        "2024-03-01 09:30:00",
+        "Jane",
+        "jane@bankwell.com",
+        "Ann",
+        "ann@acme.com",
+        "Hi",
+        "Body",
+    )
+    article = NewsArticle(
+        title="Rates on hold",
+        snippet="s",
+        link="https://news.example/1",
+        domain="news.example",
+    )
+    result = {
+        "client_name": "Ann",
+        "relevant_client_emails": [email],
+        "macro_news_sources": [article],
+    }
+
+    written = json.loads(write_report(result, tmp_path, "ann", "json").read_text())
+    assert written["relevant_client_emails"][0]["from_email"] == "ann@acme.com"
+    assert written["macro_news_sources"][0]["title"] == "Rates on hold"
+    assert written["macro_news_sources"][0]["published"] is None
+
+    event = json.loads(format_sse("report", result)[len("data: ") :])
+    assert event["content"] == written
+
+
+def test_closing_a_batch_skips_the_reports_not_started():
+    started = []
+
+    def compute(init_state):
+        started.append(init_state["client_name"])
+        time.sleep(0.05)
+        return init_state
+
+    outcomes = run_batch(
+        [{"client_name": str(i)} for i in range(10)], compute, max_concurrency=1
+    )
+    next(outcomes)
+    outcomes.close()
+    assert len(started) <= 2
+
+
+def test_meetings_file_goes_through_the_api_validation(tmp_path):
+    path = tmp_path / "meetings.json"
+    path.write_text(json.dumps([MEETING, INJECTED, {**MEETING, "client_email": "x"}]))
+
+    init_states, rejected = load_meetings(str(path))
+
+    assert [state["client_name"] for state in init_states] == ["Adam Clay"]
+    assert init_states[0]["report_length"] == "long"
+    assert [outcome.index for outcome in rejected] == [1, 2]
+    assert all(outcome.error.startswith("Rejected") for outcome in rejected)
+
+
+def test_date_batch_skips_meetings_rejected_by_the_guardrails(monkeypatch, capsys):
+    meetings = [UpcomingMeeting(**MEETING), UpcomingMeeting(**INJECTED)]
+    monkeypatch.setattr(
+        pregeneration, "fetch_upcoming_meetings", lambda start, end: meetings
+    )
+
+    init_states, rejected = meetings_for_day("2024-03-26")
+    assert len(init_states) == 1
+    assert rejected[0].summary()["success"] is False
+
+    # The command line tool reports them and fails
+    meetings.pop(0)
+    assert batch.main(["--date", "2024-03-26"]) == 1
+    assert '"success": false' in capsys.readouterr().out
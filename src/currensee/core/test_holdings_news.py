@@ -0,0 +1,93 @@
+"""
+Tests for the shared holdings news store and its refresh service
+"""
+
+from currensee.agents.tools.base import NewsArticle
+from currensee.core.holdings_news import (
+    HoldingsNewsService,
+    HoldingsNewsStore,
+    get_position_news,
+)
+
+
+def make_search(calls):
+    def search(position):
+        calls.append(position)
+        if position == "Broken":
+            raise RuntimeError("search failed")
+        return [
+            NewsArticle(
+                f"{position} news",
+                "",
+                f"https://reuters.com/{position}",
+                holding=position,
+            )
+        ]
+
+    return search
+
+
+def test_get_position_news_searches_once():
+    calls = []
+    store = HoldingsNewsStore()
+    first = get_position_news("Apple", store, make_search(calls))
+    second = get_position_news("Apple", store, make_search(calls))
+
+    assert calls == ["Apple"]
+    assert first == second and first[0] is not second[0]  # reports get their own copies
+    assert store.stats == {"hits": 1, "misses": 1}
+
+    store.max_age = -1
+    get_position_news("Apple", store, make_search(calls))
+    assert calls == ["Apple", "Apple"]
+
+
+def test_refresh():
+    calls = []
+    store = HoldingsNewsStore()
+    service = HoldingsNewsService(
+        store,
+        max_concurrency=2,
+        positions_fn=lambda limit: ["Apple", "Microsoft", "Broken"][:limit],
+        search_fn=make_search(calls),
+    )
+
+    assert service.refresh() == {"refreshed": 2, "skipped": 0, "failed": 1}
+    assert store.get("Microsoft")[0].title == "Microsoft news"
+    # Recently refreshed positions are not searched again
+    assert service.refresh(["Apple"]) == {"refreshed": 0, "skipped": 1, "failed": 0}
+    assert sorted(calls) == ["Apple", "Broken", "Microsoft"]
+
+
+def test_failed_and_empty_searches_are_not_kept():
+    calls = []
+    store = HoldingsNewsStore()
+    search = make_search(calls)
+    get_position_news("Apple", store, search)
+
+    # Serper down: the expired articles are used, and not replaced
+    store.max_age = -1
+    assert (
+        get_position_news("Apple", store, lambda position: 1 / 0)[0].title
+        == "Apple news"
+    )
+    assert store.get("Apple", allow_expired=True)[0].title == "Apple news"
+    assert get_position_news("Broken", store, search) == []
+    assert store.age("Broken") is None
+
+    # Nothing found: searched again after empty_max_age rather than max_age
+    store.max_age = 3600
+    store.put("Nvidia", [])
+    assert store.get("Nvidia") == []
+    store.empty_max_age = -1
+    assert store.get("Nvidia") is None
+    assert not store.is_fresh("Nvidia", 3600)
+
+
+def test_refresh_keeps_articles_when_the_search_fails():
+    store = HoldingsNewsStore()
+    store.put("Broken", [NewsArticle("Broken news", "", "https://reuters.com/b")])
+    service = HoldingsNewsService(store, interval=0, search_fn=make_search([]))
+
+    assert service.refresh(["Broken"]) == {"refreshed": 0, "skipped": 0, "failed": 1}
+    assert store.get("Broken")[0].title == "Broken news"
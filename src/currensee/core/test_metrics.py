@@ -0,0 +1,40 @@
+"""
+Tests for the Prometheus metrics
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from currensee.core import metrics
+
+
+def test_metrics_record_without_errors():
+    # No-ops when prometheus_client is missing, real samples otherwise
+    metrics.record_cache_lookup("report", "hit")
+    metrics.NODE_DURATION.labels("retrieve_client_metadata").observe(0.2)
+    metrics.JOBS_IN_FLIGHT.inc()
+    metrics.JOBS_IN_FLIGHT.dec()
+
+    engine = create_engine("sqlite://", poolclass=QueuePool)
+    metrics.instrument_pool(engine, "test")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def test_render_metrics():
+    pytest.importorskip("prometheus_client")
+
+    metrics.record_cache_lookup("holdings_news", "miss")
+    output = metrics.render_metrics().decode()
+
+    assert (
+        'currensee_cache_lookups_total{cache="holdings_news",status="miss"}' in output
+    )
+    assert "currensee_http_request_duration_seconds" in output
+
+
+def test_render_metrics_requires_prometheus_client(monkeypatch):
+    monkeypatch.setattr(metrics, "HAS_PROMETHEUS", False)
+    with pytest.raises(RuntimeError):
+        metrics.render_metrics()
@@ -0,0 +1,131 @@
+"""
+Tests for the report pre-generation scheduler
+"""
+
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+from currensee.core import pregeneration
+from currensee.core.pregeneration import (
+    PregenerationScheduler,
+    UpcomingMeeting,
+    fetch_upcoming_meetings,
+)
+from currensee.core.report_cache import DataVersion, ReportCache
+
+
+def make_meeting(timestamp, client="adam.clay@compass.com"):
+    return UpcomingMeeting(
+        user_email="jane.moneypenny@bankwell.com",
+        client_name="Adam Clay",
+        client_email=client,
+        meeting_timestamp=timestamp,
+        meeting_description="Compass - Annual Credit Facility Review Meeting",
+    )
+
+
+MEETINGS = [
+    make_meeting("2024-03-26 15:00:00", "cynthia.hobbs@abbvie.com"),
+    make_meeting("2024-03-26 09:00:00"),
+    make_meeting("2024-03-27 10:00:00", "kyle.waters@amedisys.com"),
+]
+
+
+def fetch_meetings(start, end):
+    fmt = "%Y-%m-%d %H:%M:%S"
+    return [
+        m
+        for m in MEETINGS
+        if start.strftime(fmt) <= m.meeting_timestamp < end.strftime(fmt)
+    ]
+
+
+def make_scheduler(calls):
+    def compute(init_state):
+        calls.append(init_state["meeting_timestamp"])
+        return dict(init_state)
+
+    cache = ReportCache(
+        version_fn=lambda *args: DataVersion(
+            preference_version="v1", email_watermark="w1"
+        )
+    )
+    return PregenerationScheduler(
+        cache, compute, max_concurrency=1, fetch_fn=fetch_meetings
+    )
+
+
+def test_off_peak_run_fills_cache_in_start_order():
+    calls = []
+    scheduler = make_scheduler(calls)
+
+    assert scheduler.run_once(now=datetime(2024, 3, 25, 22, 0)) == {
+        "generated": 2,
+        "failed": 0,
+    }
+    assert calls == ["2024-03-26 09:00:00", "2024-03-26 15:00:00"]
+    assert scheduler.report_cache.lookup(MEETINGS[1].init_state())[1] == "hit"
+
+    # Already cached meetings are not generated again
+    assert scheduler.run_once(now=datetime(2024, 3, 25, 23, 0)) == {
+        "generated": 0,
+        "failed": 0,
+    }
+
+
+def test_peak_hours_only_generate_meetings_before_next_off_peak_slot():
+    calls = []
+    scheduler = make_scheduler(calls)
+
+    scheduler.run_once(now=datetime(2024, 3, 26, 8, 0))
+    assert calls == ["2024-03-26 09:00:00", "2024-03-26 15:00:00"]
+
+    scheduler.run_once(now=datetime(2024, 3, 26, 16, 0))
+    assert "2024-03-27 10:00:00" not in calls
+
+
+def test_meetings_go_through_the_input_guardrails():
+    meeting = make_meeting("2024-03-26 12:00:00")
+    meeting.client_name = "Adam <b>Clay</b>"
+    assert meeting.init_state()["client_name"] == "Adam Clay"
+
+    # Calendar entries are user-controlled input too: rejected ones are not generated
+    injected = make_meeting("2024-03-26 11:00:00")
+    injected.meeting_description = "Review'; DROP TABLE portfolio; --"
+    calls = []
+    scheduler = make_scheduler(calls)
+    scheduler._fetch_fn = lambda start, end: [injected, *fetch_meetings(start, end)]
+
+    assert scheduler.run_once(now=datetime(2024, 3, 25, 22, 0)) == {
+        "generated": 2,
+        "failed": 0,
+    }
+    assert "2024-03-26 11:00:00" not in calls
+
+
+def test_meetings_without_a_host_are_skipped(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'outlook.db'}")
+    pd.DataFrame(
+        [
+            {
+                "meeting_timestamp": "2024-03-26 09:00:00",
+                "host_email": None,  # ICS event without an organizer
+                "invitees": "Adam Clay",
+                "invitee_emails": "adam.clay@compass.com",
+                "meeting_subject": "Compass review",
+            },
+            {
+                "meeting_timestamp": "2024-03-26 10:00:00",
+                "host_email": "jane.moneypenny@bankwell.com",
+                "invitees": "Adam Clay",
+                "invitee_emails": "adam.clay@compass.com",
+                "meeting_subject": "Compass review",
+            },
+        ]
+    ).to_sql("meeting_data", engine, index=False)
+    monkeypatch.setattr(pregeneration, "_get_engine", lambda: engine)
+
+    meetings = fetch_upcoming_meetings(datetime(2024, 3, 26), datetime(2024, 3, 27))
+    assert [m.meeting_timestamp for m in meetings] == ["2024-03-26 10:00:00"]
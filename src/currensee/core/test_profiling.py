@@ -0,0 +1,93 @@
+"""
+Tests for the per-node profiling of the report graph
+"""
+
+import operator
+from typing import Annotated, Any, Dict, List, TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+from sqlalchemy import create_engine, text
+
+from currensee.core.llm import _fake_tool_model
+from currensee.core.profiling import (
+    add_profiled_node,
+    instrument_engine,
+    record_search_call,
+    summarize_profile,
+)
+
+
+class State(TypedDict):
+    value: int
+    node_profile: Annotated[List[Dict[str, Any]], operator.add]
+
+
+def test_graph_nodes_record_their_usage():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, "test")
+    model = _fake_tool_model(["first", "second"])
+
+    def search_and_query(state):
+        record_search_call()
+        record_search_call()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1 UNION ALL SELECT 2")).fetchall()
+        return {"value": state["value"] + 1}
+
+    def summarize(state):
+        model.invoke("Summarize")
+        return {"value": state["value"] * 2}
+
+    graph = StateGraph(State)
+    add_profiled_node(graph, "search_and_query", search_and_query)
+    add_profiled_node(graph, "summarize", summarize)
+    graph.add_edge(START, "search_and_query")
+    graph.add_edge("search_and_query", "summarize")
+    graph.add_edge("summarize", END)
+
+    result = graph.compile().invoke({"value": 1})
+
+    assert result["value"] == 4
+    profiles = {p["node"]: p for p in result["node_profile"]}
+    assert profiles["search_and_query"]["serper_calls"] == 2
+    assert profiles["search_and_query"]["db_queries"] == 1
+    assert profiles["search_and_query"]["llm_calls"] == 0
+    assert profiles["summarize"]["llm_calls"] == 1
+    assert profiles["summarize"]["serper_calls"] == 0
+
+    summary = summarize_profile(result["node_profile"])
+    assert summary["totals"]["serper_calls"] == 2
+    assert summary["totals"]["llm_calls"] == 1
+    assert summary["slowest_node"] == summary["nodes"][0]["node"]
+
+
+def test_usage_outside_nodes_is_ignored():
+    record_search_call()  # no profiled node running: nothing to attribute it to
+    assert summarize_profile([]) == {
+        "nodes": [],
+        "totals": {
+            "llm_calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "serper_calls": 0,
+            "db_queries": 0,
+            "db_rows": 0,
+            "wall_time": 0,
+        },
+        "slowest_node": None,
+    }
+
+
+def test_failing_node_raises():
+    graph = StateGraph(State)
+
+    def broken(state):
+        raise RuntimeError("node failed")
+
+    add_profiled_node(graph, "broken", broken)
+    graph.add_edge(START, "broken")
+    graph.add_edge("broken", END)
+
+    with pytest.raises(RuntimeError, match="node failed"):
+        graph.compile().invoke({"value": 1})
@@ -0,0 +1,90 @@
+"""
+Tests for the report result cache
+"""
+
+import time
+
+from currensee.core.report_cache import DataVersion, ReportCache
+
+INIT_STATE = {
+    "user_email": "jane.moneypenny@bankwell.com",
+    "client_name": "Adam Clay",
+    "client_email": "adam.clay@compass.com",
+    "meeting_timestamp": "2024-03-26 11:00:00",
+}
+
+
+class FakeVersions:
+    def __init__(self):
+        self.version = DataVersion(
+            preference_version="2024-01-01", email_watermark="2024-03-01"
+        )
+
+    def __call__(self, user_email, client_email, meeting_timestamp):
+        return self.version
+
+
+class CountingGraph:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, init_state):
+        self.calls += 1
+        return {**init_state, "run": self.calls}
+
+
+def test_repeat_requests_hit_cache():
+    graph = CountingGraph()
+    cache = ReportCache(version_fn=FakeVersions())
+
+    entry, status = cache.get_or_compute(INIT_STATE, graph)
+    assert status == "miss"
+    entry, status = cache.get_or_compute(dict(INIT_STATE), graph)
+    assert status == "hit"
+    assert entry.result["run"] == 1
+    assert graph.calls == 1
+
+
+def test_new_emails_and_preferences_invalidate():
+    graph = CountingGraph()
+    versions = FakeVersions()
+    cache = ReportCache(version_fn=versions)
+    cache.get_or_compute(INIT_STATE, graph)
+
+    versions.version = DataVersion(
+        preference_version="2024-01-01", email_watermark="2024-03-20"
+    )
+    entry, status = cache.get_or_compute(INIT_STATE, graph)
+    assert status == "miss"
+    assert entry.result["run"] == 2
+
+    versions.version = DataVersion(
+        preference_version="2024-03-25", email_watermark="2024-03-20"
+    )
+    assert cache.get_or_compute(INIT_STATE, graph)[1] == "miss"
+    assert graph.calls == 3
+
+
+def test_stale_while_revalidate():
+    graph = CountingGraph()
+    cache = ReportCache(ttl=0, stale_while_revalidate=True, version_fn=FakeVersions())
+    cache.get_or_compute(INIT_STATE, graph)
+    time.sleep(0.01)
+
+    entry, status = cache.get_or_compute(INIT_STATE, graph)
+    assert status == "stale"
+    assert entry.result["run"] == 1
+    cache._executor.shutdown(wait=True)
+    assert graph.calls == 2
+
+
+def test_invalidate_and_bypass():
+    graph = CountingGraph()
+    cache = ReportCache(version_fn=FakeVersions())
+    cache.get_or_compute(INIT_STATE, graph)
+    assert cache.invalidate(client_email="ADAM.CLAY@compass.com") == 1
+    assert cache.lookup(INIT_STATE) == (None, "miss")
+
+    disabled = ReportCache(enabled=False, version_fn=FakeVersions())
+    assert disabled.get_or_compute(INIT_STATE, graph)[1] == "bypass"
+    assert disabled.get_or_compute(INIT_STATE, graph)[1] == "bypass"
@@ -0,0 +1,51 @@
+"""
+Tests for the start-up warm-up and its readiness reporting
+"""
+
+from currensee.core.input_guardrails import CurrenSeeInputGuardrails
+from currensee.core.warmup import SAMPLE_REQUEST, Warmup, WarmupStep
+
+
+def fail():
+    raise RuntimeError("unavailable")
+
+
+def test_warmup_ready_after_required_steps():
+    calls = []
+    warmup = Warmup(
+        [
+            WarmupStep("first", lambda: calls.append("first")),
+            WarmupStep("optional", fail, required=False),
+            WarmupStep("second", lambda: calls.append("second")),
+        ]
+    )
+    assert not warmup.ready
+    assert warmup.status()["steps"]["first"]["status"] == "pending"
+
+    warmup.start()
+    assert warmup.wait(timeout=5)
+    assert calls == ["first", "second"]
+
+    status = warmup.status()
+    assert status["ready"] and status["finished"]
+    assert status["steps"]["optional"]["status"] == "failed"
+    assert status["steps"]["optional"]["error"] == "unavailable"
+
+
+def test_warmup_not_ready_when_required_step_fails():
+    calls = []
+    warmup = Warmup(
+        [
+            WarmupStep("database", fail),
+            WarmupStep("graph", lambda: calls.append("graph")),
+        ]
+    )
+
+    assert warmup.run() is False
+    assert calls == ["graph"]  # later steps still run
+    assert warmup.status()["steps"]["database"]["status"] == "failed"
+
+
+def test_sample_request_passes_input_guardrails():
+    result = CurrenSeeInputGuardrails().validate_comprehensive(**SAMPLE_REQUEST)
+    assert result["overall_valid"], result["validation_details"]
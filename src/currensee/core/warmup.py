@@ -0,0 +1,166 @@
+"""
+Start-up warm-up of the API process.
+
+The first report after a deploy would otherwise pay for opening database
+connections, fetching secrets, creating the model client, importing the agent
+graph, downloading the FRED macro table and compiling templates and guardrail
+patterns. `Warmup` runs these steps in a background thread when the API
+starts; the /ready endpoint reports whether they have finished, so load
+balancers only route traffic to warm instances (/health stays a liveness
+check).
+
+A failing required step keeps the instance not ready; optional steps (external
+data sources) are only logged.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_REQUEST = {
+    "user_email": "warmup@bankwell.com",
+    "client_name": "Warm Up",
+    "client_email": "warm.up@example.com",
+    "meeting_timestamp": "2024-01-02 09:00:00",
+    "meeting_description": "Warm-up - Annual Review",
+}
+
+
+@dataclass
+class WarmupStep:
+    name: str
+    fn: Callable[[], Any]
+    required: bool = True
+    status: str = "pending"  # pending, running, ok or failed
+    duration: Optional[float] = None
+    error: Optional[str] = None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "required": self.required,
+            "duration": round(self.duration, 3) if self.duration is not None else None,
+            "error": self.error,
+        }
+
+
+class Warmup:
+    """Runs warm-up steps once, in order, and tracks readiness"""
+
+    def __init__(self, steps: List[WarmupStep]):
+        self.steps = steps
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set() and all(
+            step.status == "ok" for step in self.steps if step.required
+        )
+
+    def run(self) -> bool:
+        """Run all steps (each even if an earlier one failed); return readiness"""
+        for step in self.steps:
+            step.status = "running"
+            start = time.time()
+            try:
+                step.fn()
+                step.status = "ok"
+            except Exception as e:
+                step.status = "failed"
+                step.error = str(e)
+                log = logger.error if step.required else logger.warning
+                log(f"Warm-up step {step.name} failed: {e}")
+            step.duration = time.time() - start
+            logger.info(
+                f"Warm-up step {step.name}: {step.status} in {step.duration:.2f}s"
+            )
+        self._done.set()
+        return self.ready
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        self._done.wait(timeout)
+        return self.ready
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "finished": self._done.is_set(),
+            "steps": {step.name: step.summary() for step in self.steps},
+        }
+
+
+def open_db_connections(db_names: List[str], connections: int) -> None:
+    """Open `connections` pooled connections per database (returned to the pool afterwards)"""
+    from sqlalchemy import text
+
+    from currensee.utils.db_utils import get_engine
+
+    for db_name in db_names:
+        engine = get_engine(db_name)
+        opened = [engine.connect() for _ in range(connections)]
+        try:
+            for conn in opened:
+                conn.execute(text("SELECT 1"))
+        finally:
+            for conn in opened:
+                conn.close()
+
+
+def preload_secrets() -> None:
+    """Resolve the search API key (from Secret Manager if it is not in the environment)"""
+    from currensee.core.settings import get_serper_api_key
+
+    get_serper_api_key()
+
+
+def compile_guardrails() -> None:
+    """Run the input and output guardrails once, compiling their patterns"""
+    from currensee.core.input_guardrails import CurrenSeeInputGuardrails
+    from currensee.core.output_guardrails import validate_output_before_rendering
+
+    CurrenSeeInputGuardrails().validate_comprehensive(**SAMPLE_REQUEST)
+    validate_output_before_rendering({"summary_client_news": "Warm-up report section."})
+
+
+def prime_macro_table() -> None:
+    from currensee.agents.tools.finance_tools import get_macro_table
+
+    get_macro_table()
+
+
+def default_steps(
+    get_graph: Callable[[], Any], db_connections: int = 2
+) -> List[WarmupStep]:
+    """
+    Warm-up steps of the API.
+
+    Args:
+        get_graph: Function returning the compiled report graph
+        db_connections: Connections to open per database
+    """
+    from currensee.core.llm import get_default_model
+    from currensee.utils.report_templates import preload_templates
+
+    return [
+        WarmupStep("templates", preload_templates),
+        WarmupStep("guardrails", compile_guardrails),
+        WarmupStep("secrets", preload_secrets, required=False),
+        WarmupStep("model", get_default_model),
+        WarmupStep("graph", get_graph),
+        WarmupStep(
+            "database",
+            lambda: open_db_connections(["crm", "crm_outlook"], db_connections),
+        ),
+        WarmupStep("macro_table", prime_macro_table, required=False),
+    ]
@@ -0,0 +1,4 @@
+from currensee.ingest.loader import LoadStats, ingest, load_rows, prepare_table
+from currensee.ingest.tables import TABLES, TableSpec
+
+__all__ = ["TABLES", "TableSpec", "LoadStats", "ingest", "load_rows", "prepare_table"]
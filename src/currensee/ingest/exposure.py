@@ -0,0 +1,242 @@
+"""
+Materialized look-through exposure of every client to the positions of the
+funds it holds.
+
+`client_exposure` has one row per (company, fund, position) with the exposure
+`fund_balance * weight` and the position's rank within the company's holdings
+of the same fund type, indexed on (company, fund_type, position_rank). The top
+holdings of a client become an index range scan instead of a join and sort of
+`portfolio` and `fund_detail` on every request, and the same rows serve the
+per-fund and book-wide breakdowns.
+
+The table is refreshed by the loader whenever `portfolio` (for the companies
+loaded) or `fund_detail` (in full) change, or with `currensee-ingest
+--refresh-exposure`. Each refresh records a fingerprint of the source tables
+(a hash of every row's columns read by the refresh) in `derived_refreshes`. Lookups check
+it at most every FRESHNESS_CHECK_SECONDS and fall back to the live join, with
+a warning, when the sources were written some other way (e.g. the notebooks'
+`to_sql`) since the last refresh, or when the table was never materialized.
+"""
+
+import hashlib
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, inspect, text
+
+from currensee.ingest.loader import create_indexes, prepare_table, upsert_sql
+from currensee.ingest.tables import TABLES
+
+logger = logging.getLogger(__name__)
+
+EXPOSURE_TABLE = "client_exposure"
+# Tables whose changes require a refresh
+SOURCE_TABLES = ("portfolio", "fund_detail")
+# How long a freshness check is trusted before the source tables are fingerprinted again
+FRESHNESS_CHECK_SECONDS = 60
+
+_EXPOSURE_SELECT = """
+    SELECT po.company, fd.fund, fd.position_name, po.fund_type,
+           SUM(po.fund_balance * fd.weight) AS exposure,
+           ROW_NUMBER() OVER (
+               PARTITION BY po.company, po.fund_type
+               ORDER BY SUM(po.fund_balance * fd.weight) DESC, fd.position_name
+           ) AS position_rank
+    FROM portfolio po
+    JOIN fund_detail fd ON po.symbol = fd.fund
+    {where}
+    GROUP BY po.company, fd.fund, fd.position_name, po.fund_type
+"""
+
+# Exposure rows computed on the fly, with the columns of client_exposure that are read
+_LIVE_EXPOSURE = """(
+    SELECT po.company, fd.fund, fd.position_name, po.fund_type, po.fund_balance * fd.weight AS exposure
+    FROM portfolio po
+    JOIN fund_detail fd ON po.symbol = fd.fund
+) live"""
+
+# Database URL -> (checked at, materialized table is current)
+_freshness: Dict[str, Tuple[float, bool]] = {}
+
+
+# Columns of each source table the exposure is computed from
+SOURCE_COLUMNS = {
+    "portfolio": ("company", "symbol", "fund_type", "fund_balance"),
+    "fund_detail": ("fund", "position_name", "weight"),
+}
+
+
+def _table_hash(conn, table: str) -> str:
+    columns = SOURCE_COLUMNS[table]
+    if conn.dialect.name == "postgresql":
+        row = " || chr(31) || ".join(f"coalesce({c}::text, '')" for c in columns)
+        return conn.execute(
+            text(
+                f"SELECT md5(coalesce(string_agg({row}, chr(30) ORDER BY {', '.join(columns)}), '')) "
+                f"FROM {table}"
+            )
+        ).scalar_one()
+    digest = hashlib.md5()
+    rows = conn.execute(
+        text(f"SELECT {', '.join(columns)} FROM {table} ORDER BY {', '.join(columns)}")
+    )
+    for row in rows:
+        digest.update(repr(tuple(row)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def source_fingerprint(conn) -> str:
+    """
+    Hash of the rows of the source tables (ordered, over every column the exposure
+    reads), which changes with any write that can change the exposure
+    """
+    return "|".join(f"{table}:{_table_hash(conn, table)}" for table in SOURCE_TABLES)
+
+
+def refresh_client_exposure(engine, companies: Optional[Iterable[str]] = None) -> int:
+    """
+    Recompute the exposure rows of the given companies (all if None) in one transaction,
+    so readers see either the previous or the new rows.
+
+    Returns:
+        Number of rows written
+    """
+    spec = TABLES[EXPOSURE_TABLE]
+    prepare_table(engine, spec)
+    prepare_table(engine, TABLES["derived_refreshes"])
+    columns = ", ".join(spec.column_names)
+    params = {}
+    delete = text(f"DELETE FROM {EXPOSURE_TABLE}")
+    insert = text(
+        f"INSERT INTO {EXPOSURE_TABLE} ({columns}) " + _EXPOSURE_SELECT.format(where="")
+    )
+    if companies is not None:
+        params["companies"] = sorted(set(companies))
+        if not params["companies"]:
+            return 0
+        delete = text(f"DELETE FROM {EXPOSURE_TABLE} WHERE company IN :companies")
+        insert = text(
+            f"INSERT INTO {EXPOSURE_TABLE} ({columns}) "
+            + _EXPOSURE_SELECT.format(where="WHERE po.company IN :companies")
+        )
+        delete = delete.bindparams(bindparam("companies", expanding=True))
+        insert = insert.bindparams(bindparam("companies", expanding=True))
+    with engine.begin() as conn:
+        conn.execute(delete, params)
+        written = conn.execute(insert, params).rowcount
+        refresh = {
+            "name": EXPOSURE_TABLE,
+            "source_fingerprint": source_fingerprint(conn),
+            "refreshed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        conn.execute(
+            text(upsert_sql(TABLES["derived_refreshes"], engine.dialect.name)), refresh
+        )
+    create_indexes(engine, spec, analyze=companies is None)
+    _freshness[str(engine.url)] = (time.monotonic(), True)
+    logger.info(f"Refreshed client exposure: {written} rows")
+    return written
+
+
+def is_current(engine) -> bool:
+    """Whether client_exposure exists and was refreshed from the current source tables"""
+    key = str(engine.url)
+    checked_at, current = _freshness.get(key, (None, False))
+    if (
+        checked_at is not None
+        and time.monotonic() - checked_at < FRESHNESS_CHECK_SECONDS
+    ):
+        return current
+
+    current = False
+    if inspect(engine).has_table("derived_refreshes"):
+        with engine.connect() as conn:
+            refresh = conn.execute(
+                text(
+                    "SELECT source_fingerprint, refreshed_at FROM derived_refreshes WHERE name = :name"
+                ),
+                {"name": EXPOSURE_TABLE},
+            ).one_or_none()
+            current = refresh is not None and refresh[0] == source_fingerprint(conn)
+        if refresh is not None and not current:
+            logger.warning(
+                f"{', '.join(SOURCE_TABLES)} changed since client exposure was refreshed ({refresh[1]}); "
+                "using the live join until `currensee-ingest --refresh-exposure` is run"
+            )
+    _freshness[key] = (time.monotonic(), current)
+    return current
+
+
+def _exposure_source(engine) -> str:
+    return EXPOSURE_TABLE if is_current(engine) else _LIVE_EXPOSURE
+
+
+def top_positions(
+    engine, company: str, limit: int = 5, fund_type: str = "Equity Fund"
+) -> List[str]:
+    """Positions of a client's funds of a type, largest exposure first"""
+    if is_current(engine):
+        query = """
+            SELECT position_name
+            FROM client_exposure
+            WHERE company = :company
+            AND fund_type = :fund_type
+            AND position_rank <= :limit
+            ORDER BY position_rank
+        """
+    else:
+        query = """
+            SELECT fd.position_name
+            FROM portfolio po
+            JOIN fund_detail fd ON po.symbol = fd.fund
+            WHERE po.company = :company
+            AND po.fund_type = :fund_type
+            ORDER BY (po.fund_balance * fd.weight) DESC
+            LIMIT :limit
+        """
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(query), {"company": company, "fund_type": fund_type, "limit": limit}
+        )
+        return [row[0] for row in rows]
+
+
+def exposure_by_fund(engine, company: str) -> Dict[str, float]:
+    """Total look-through exposure of a client per fund, largest first"""
+    source = _exposure_source(engine)
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                f"""
+                SELECT fund, SUM(exposure) AS exposure
+                FROM {source}
+                WHERE company = :company
+                GROUP BY fund
+                ORDER BY exposure DESC
+                """
+            ),
+            {"company": company},
+        )
+        return {fund: float(exposure) for fund, exposure in rows}
+
+
+def book_positions(engine, limit: int, fund_type: str = "Equity Fund") -> List[str]:
+    """Positions held across the whole book, largest total exposure first"""
+    source = _exposure_source(engine)
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                f"""
+                SELECT position_name
+                FROM {source}
+                WHERE fund_type = :fund_type
+                GROUP BY position_name
+                ORDER BY SUM(exposure) DESC
+                LIMIT :limit
+                """
+            ),
+            {"fund_type": fund_type, "limit": limit},
+        )
+        return [row[0] for row in rows]
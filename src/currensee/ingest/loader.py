@@ -0,0 +1,394 @@
+"""
+Bulk loader of CRM and Outlook data (replaces the pandas writes of the
+notebooks/1.0-data_loading notebooks).
+
+Files are streamed in batches. On Postgres each batch is COPYed into a
+temporary staging table and upserted into the target with
+INSERT ... ON CONFLICT on the table's key, skipping rows that did not change,
+and committed on its own; other databases (SQLite for local runs) get the same
+upsert with executemany. Reloading the same files is therefore a no-op, and an
+interrupted load can simply be rerun.
+
+Tables are created if missing (existing ones gain the synthetic key column of
+email_data / meeting_data, backfilled for the rows already there), the unique
+key index is created before loading and the lookup indexes the tools filter on
+afterwards. Loading portfolio or fund_detail also refreshes the client exposure
+table (see currensee.ingest.exposure).
+
+    currensee-ingest data/outlook/eml_files data/outlook/meetings.ics
+    currensee-ingest exports/clients_contact.csv exports/portfolio.csv
+    currensee-ingest --table email_data fake_emails.csv --database-url sqlite:///outlook.db
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import create_engine, inspect, text
+
+from currensee.ingest.sources import batched, iter_files, read_rows, table_for_file
+from currensee.ingest.tables import TABLES, TableSpec, row_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50_000
+
+
+@dataclass
+class LoadStats:
+    """Outcome of loading one table"""
+
+    table: str
+    rows_read: int = 0
+    rows_written: int = 0
+    batches: int = 0
+    duration: float = 0.0
+
+
+def _quote(name: str) -> str:
+    return f'"{name}"'
+
+
+def _index_name(spec: TableSpec, columns, unique: bool = False) -> str:
+    return f"{'ux' if unique else 'ix'}_{spec.name}_{'_'.join(columns)}"
+
+
+def _row_id(engine) -> str:
+    """Physical row identifier, to address rows of tables without a usable key"""
+    return "ctid" if engine.dialect.name == "postgresql" else "rowid"
+
+
+def _backfill_keys(conn, spec: TableSpec, row_id: str) -> int:
+    """Fill the synthetic key of rows written without one (e.g. by the notebooks' `to_sql`)"""
+    if not spec.key_source:
+        return 0
+    (key,) = spec.key
+    rows = conn.execute(
+        text(
+            f"SELECT {row_id} AS _row, {', '.join(map(_quote, spec.key_source))} "
+            f"FROM {_quote(spec.name)} WHERE {_quote(key)} IS NULL"
+        )
+    ).mappings()
+    keys = [{"_row": str(row["_row"]), "_key": row_key(spec, row)} for row in rows]
+    if keys:
+        target = "CAST(:_row AS tid)" if row_id == "ctid" else ":_row"
+        conn.execute(
+            text(
+                f"UPDATE {_quote(spec.name)} SET {_quote(key)} = :_key "
+                f"WHERE {row_id} = {target}"
+            ),
+            keys,
+        )
+        logger.info("%s: backfilled the key of %d existing rows", spec.name, len(keys))
+    return len(keys)
+
+
+def _deduplicate(conn, spec: TableSpec, row_id: str) -> int:
+    """Delete all but the first row of each key, so the unique key index can be built"""
+    same_key = " AND ".join(f"a.{_quote(c)} = b.{_quote(c)}" for c in spec.key)
+    if row_id == "ctid":
+        statement = (
+            f"DELETE FROM {_quote(spec.name)} a USING {_quote(spec.name)} b "
+            f"WHERE a.ctid > b.ctid AND {same_key}"
+        )
+    else:
+        statement = (
+            f"DELETE FROM {_quote(spec.name)} AS a WHERE EXISTS ("
+            f"SELECT 1 FROM {_quote(spec.name)} AS b WHERE b.rowid < a.rowid AND {same_key})"
+        )
+    deleted = max(conn.execute(text(statement)).rowcount, 0)
+    if deleted:
+        logger.warning("%s: deleted %d rows duplicating a key", spec.name, deleted)
+    return deleted
+
+
+def prepare_table(engine, spec: TableSpec) -> None:
+    """
+    Create the table (or add its missing columns) and its unique key index.
+
+    A table created outside the loader gets its key index on the first run: rows
+    without a synthetic key are given theirs and duplicate keys are dropped, so
+    the upserts conflict with the existing rows instead of adding them again.
+    """
+    # Inspected before the transaction rather than within it: the inspector would check out a second
+    # connection, and SQLite could then prepare the upserts against a schema without the new key index
+    existing = inspect(engine)
+    unique_index = _index_name(spec, spec.key, unique=True)
+    present = (
+        {column["name"] for column in existing.get_columns(spec.name)}
+        if existing.has_table(spec.name)
+        else None
+    )
+    indexed = present is not None and any(
+        index["name"] == unique_index for index in existing.get_indexes(spec.name)
+    )
+    with engine.begin() as conn:
+        if present is None:
+            columns = ", ".join(
+                f"{_quote(name)} {sql_type}" for name, sql_type in spec.columns
+            )
+            conn.execute(text(f"CREATE TABLE {_quote(spec.name)} ({columns})"))
+        else:
+            for name, sql_type in spec.columns:
+                if name not in present:
+                    conn.execute(
+                        text(
+                            f"ALTER TABLE {_quote(spec.name)} ADD COLUMN {_quote(name)} {sql_type}"
+                        )
+                    )
+            if not indexed:
+                _backfill_keys(conn, spec, _row_id(engine))
+                _deduplicate(conn, spec, _row_id(engine))
+        conn.execute(
+            text(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {unique_index} "
+                f"ON {_quote(spec.name)} ({', '.join(map(_quote, spec.key))})"
+            )
+        )
+
+
+def create_indexes(engine, spec: TableSpec, analyze: bool = True) -> None:
+    """Lookup indexes of the table (built after a bulk load, when it is cheapest)"""
+    with engine.begin() as conn:
+        for columns in spec.indexes:
+            conn.execute(
+                text(
+                    f"CREATE INDEX IF NOT EXISTS {_index_name(spec, columns)} "
+                    f"ON {_quote(spec.name)} ({', '.join(map(_quote, columns))})"
+                )
+            )
+        if analyze and engine.dialect.name == "postgresql":
+            conn.execute(text(f"ANALYZE {_quote(spec.name)}"))
+
+
+def upsert_sql(spec: TableSpec, dialect: str, source: Optional[str] = None) -> str:
+    """
+    INSERT into the table of the rows of a `source` table (Postgres staging) or of
+    bound parameters, updating rows whose key exists and that changed.
+    """
+    columns = ", ".join(map(_quote, spec.column_names))
+    key = ", ".join(map(_quote, spec.key))
+    values = spec.value_columns
+    if source:
+        # Last occurrence of a key in the batch wins (ON CONFLICT cannot touch a row twice)
+        select = f"SELECT DISTINCT ON ({key}) {columns} FROM {source} ORDER BY {key}, _seq DESC"
+    else:
+        select = f"VALUES ({', '.join(':' + c for c in spec.column_names)})"
+    if dialect == "postgresql":
+        changed = f"({', '.join(f't.{_quote(c)}' for c in values)}) IS DISTINCT FROM ({', '.join(f'EXCLUDED.{_quote(c)}' for c in values)})"
+    else:
+        changed = " OR ".join(
+            f"t.{_quote(c)} IS NOT excluded.{_quote(c)}" for c in values
+        )
+    statement = f"INSERT INTO {_quote(spec.name)} AS t ({columns}) {select} ON CONFLICT ({key}) "
+    if not values:
+        return statement + "DO NOTHING"
+    assignments = ", ".join(f"{_quote(c)} = EXCLUDED.{_quote(c)}" for c in values)
+    return statement + f"DO UPDATE SET {assignments} WHERE {changed}"
+
+
+def _copy_batch(engine, spec: TableSpec, rows: List[Dict]) -> int:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(row[column] for column in spec.column_names)
+    buffer.seek(0)
+
+    columns = ", ".join(map(_quote, spec.column_names))
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE _ingest_staging (LIKE {_quote(spec.name)}) ON COMMIT DROP; "
+                "ALTER TABLE _ingest_staging ADD COLUMN _seq BIGSERIAL"
+            )
+            cursor.copy_expert(
+                f"COPY _ingest_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+            cursor.execute(upsert_sql(spec, "postgresql", "_ingest_staging"))
+            written = cursor.rowcount
+        connection.commit()
+        return written
+    except BaseException:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def _insert_batch(engine, spec: TableSpec, rows: List[Dict]) -> int:
+    with engine.begin() as conn:
+        before = (
+            conn.connection.total_changes if engine.dialect.name == "sqlite" else None
+        )
+        result = conn.execute(text(upsert_sql(spec, engine.dialect.name)), rows)
+        if before is not None:
+            return conn.connection.total_changes - before
+        return max(result.rowcount, 0)
+
+
+def load_rows(
+    engine,
+    table: str,
+    rows: Iterable[Dict],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_batch: Optional[Callable[[List[Dict]], None]] = None,
+) -> LoadStats:
+    """
+    Upsert rows into an existing (prepared) table, one transaction per batch.
+    `on_batch` is called with every batch once it is committed.
+
+    Returns:
+        LoadStats with the rows read and the rows inserted or changed
+    """
+    spec = TABLES[table]
+    write = _copy_batch if engine.dialect.name == "postgresql" else _insert_batch
+    stats = LoadStats(table=table)
+    start = time.perf_counter()
+    for batch in batched(rows, batch_size):
+        stats.rows_written += write(engine, spec, batch)
+        stats.rows_read += len(batch)
+        stats.batches += 1
+        if on_batch is not None:
+            on_batch(batch)
+        logger.info(
+            "%s: %d rows read, %d written", table, stats.rows_read, stats.rows_written
+        )
+    stats.duration = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def batch_hook(table: str, companies: set) -> Optional[Callable[[List[Dict]], None]]:
+    """What to update after a batch of `table` is loaded (`companies` collects the loaded portfolios)"""
+    if table == "portfolio":
+        return lambda batch: companies.update(row["company"] for row in batch)
+    return None
+
+
+def refresh_derived(engine, table: str, companies: set) -> None:
+    """Refresh the tables derived from `table` once it is loaded"""
+    from currensee.ingest.exposure import refresh_client_exposure
+
+    if table == "fund_detail":
+        refresh_client_exposure(engine)
+    elif table == "portfolio":
+        refresh_client_exposure(engine, companies)
+
+
+def ingest(
+    paths: Iterable[str],
+    engines: Dict[str, object],
+    table: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    host_email: Optional[str] = None,
+) -> List[LoadStats]:
+    """
+    Load files into their tables.
+
+    Args:
+        paths: CSV, EML and ICS files or directories of them
+        engines: Engine of each database ("crm", "crm_outlook"), or a callable returning it
+        table: Target table of every file (default: from the file's extension or name)
+        batch_size: Rows per COPY / transaction
+        host_email: Organizer of ICS events that do not name one
+
+    Returns:
+        LoadStats of each loaded table
+    """
+    files: Dict[str, List[Path]] = {}
+    for path in iter_files(paths, [".csv", ".eml", ".ics"]):
+        target = table or table_for_file(path)
+        if target is None:
+            raise ValueError(
+                f"Cannot tell which table {path} belongs to; name it <table>.csv or pass --table"
+            )
+        files.setdefault(target, []).append(path)
+
+    results = []
+    for target, table_files in files.items():
+        spec = TABLES[target]
+        engine = (
+            engines[spec.database]
+            if isinstance(engines, dict)
+            else engines(spec.database)
+        )
+        prepare_table(engine, spec)
+        rows = (
+            row for path in table_files for row in read_rows(path, target, host_email)
+        )
+        companies: set = set()
+        stats = load_rows(
+            engine, target, rows, batch_size, batch_hook(target, companies)
+        )
+        create_indexes(engine, spec)
+        refresh_derived(engine, target, companies)
+        logger.info(
+            "Loaded %s from %d file(s) in %.1fs",
+            target,
+            len(table_files),
+            stats.duration,
+        )
+        results.append(stats)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Bulk load CRM and Outlook files into the Currensee databases"
+    )
+    parser.add_argument(
+        "paths", nargs="*", help="CSV, EML or ICS files, or directories of them"
+    )
+    parser.add_argument(
+        "--table", choices=sorted(TABLES), help="Target table of every file"
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--host-email", help="Organizer of ICS events that do not name one"
+    )
+    parser.add_argument(
+        "--database-url",
+        help="SQLAlchemy URL to load every table into (default: the configured Cloud SQL databases)",
+    )
+    parser.add_argument(
+        "--refresh-exposure",
+        action="store_true",
+        help="Recompute the client exposure table (e.g. after portfolio changes made outside the loader)",
+    )
+    args = parser.parse_args(argv)
+    if not args.paths and not args.refresh_exposure:
+        parser.error("give files to load and/or --refresh-exposure")
+
+    logging.basicConfig(level=logging.INFO)
+    if args.database_url:
+        engine = create_engine(args.database_url)
+        engines = lambda database: engine  # noqa: E731
+    else:
+        from currensee.utils.db_utils import get_engine
+
+        engines = get_engine
+
+    for stats in ingest(
+        args.paths, engines, args.table, args.batch_size, args.host_email
+    ):
+        print(json.dumps(asdict(stats)), flush=True)
+    if args.refresh_exposure:
+        from currensee.ingest.exposure import refresh_client_exposure
+
+        written = refresh_client_exposure(engines(TABLES["client_exposure"].database))
+        print(
+            json.dumps({"table": "client_exposure", "rows_written": written}),
+            flush=True,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Streaming readers of the files the ingest pipeline loads.
+
+Every reader yields one dict per row with the columns of the target table, so
+directories of millions of .eml files or multi-GB CSV exports are never held in
+memory at once.
+
+- CSV: one file per table (named after it, or given with --table); columns
+  beyond the table's are ignored
+- EML: one message per file, as written by utils/data_generation/outlook_csv_to_eml.py
+- ICS: calendars as written by utils/data_generation/outlook_event_csv_to_ics.py
+  (needs the optional `icalendar` package)
+"""
+
+import os
+from datetime import datetime
+from email import policy
+from email.parser import BytesParser
+from email.utils import getaddresses, parsedate_to_datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from currensee.ingest.tables import TABLES, TableSpec, row_key
+
+try:
+    import icalendar
+
+    HAS_ICALENDAR = True
+except ImportError:
+    HAS_ICALENDAR = False
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Table loaded from each file type; CSV files are matched on their name
+EXTENSION_TABLES = {".eml": "email_data", ".ics": "meeting_data"}
+
+Row = Dict[str, Any]
+
+
+def iter_files(paths: Iterable[str], extensions: Iterable[str]) -> Iterator[Path]:
+    """Files with one of the extensions, walking directories recursively in name order"""
+    extensions = {extension.lower() for extension in extensions}
+    for path in map(Path, paths):
+        if path.is_dir():
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if Path(name).suffix.lower() in extensions:
+                        yield Path(root) / name
+        elif path.suffix.lower() in extensions:
+            yield path
+
+
+def table_for_file(path: Path) -> Optional[str]:
+    """Target table of a file from its extension (EML, ICS) or name (CSV)"""
+    suffix = path.suffix.lower()
+    if suffix in EXTENSION_TABLES:
+        return EXTENSION_TABLES[suffix]
+    if suffix == ".csv" and path.stem in TABLES:
+        return path.stem
+    return None
+
+
+def complete_row(spec: TableSpec, row: Row) -> Row:
+    """Restrict a row to the table's columns and fill in its synthetic key if missing"""
+    completed = {column: row.get(column) for column in spec.column_names}
+    for column in spec.key:
+        if completed[column] is None and spec.key_source:
+            completed[column] = row_key(spec, completed)
+    return completed
+
+
+def read_csv(path: Path, spec: TableSpec, chunksize: int = 50_000) -> Iterator[Row]:
+    import pandas as pd
+
+    for chunk in pd.read_csv(
+        path, chunksize=chunksize, dtype=str, keep_default_na=False
+    ):
+        chunk = chunk.reindex(
+            columns=[c for c in spec.column_names if c in chunk.columns]
+        )
+        for row in chunk.to_dict("records"):
+            yield complete_row(
+                spec, {k: (v if v != "" else None) for k, v in row.items()}
+            )
+
+
+def _addresses(values: List[str]) -> tuple:
+    pairs = getaddresses(values)
+    return ", ".join(name for name, _ in pairs if name), ", ".join(
+        address for _, address in pairs if address
+    )
+
+
+def parse_eml(data: bytes) -> Row:
+    """Row of email_data for one message"""
+    message = BytesParser(policy=policy.default).parsebytes(data)
+    to_names, to_emails = _addresses(message.get_all("To", []))
+    from_name, from_email = _addresses(message.get_all("From", []))
+    timestamp = None
+    if message["Date"]:
+        # Wall-clock time as written, like the timestamps of the CSV exports
+        timestamp = (
+            parsedate_to_datetime(str(message["Date"]))
+            .replace(tzinfo=None)
+            .strftime(TIMESTAMP_FORMAT)
+        )
+    body = message.get_body(preferencelist=("plain", "html"))
+    row = {
+        "message_id": (
+            (str(message["Message-ID"]).strip() or None)
+            if message["Message-ID"]
+            else None
+        ),
+        "email_timestamp": timestamp,
+        "to_names": to_names or None,
+        "to_emails": to_emails or None,
+        "from_name": from_name or None,
+        "from_email": from_email or None,
+        "email_subject": str(message["Subject"]) if message["Subject"] else None,
+        "email_body": body.get_content().strip() if body is not None else None,
+    }
+    return complete_row(TABLES["email_data"], row)
+
+
+def read_eml(path: Path) -> Iterator[Row]:
+    yield parse_eml(path.read_bytes())
+
+
+def _mailto(value) -> str:
+    return (
+        str(value).split(":", 1)[-1]
+        if str(value).lower().startswith("mailto:")
+        else str(value)
+    )
+
+
+def _common_name(value) -> Optional[str]:
+    params = getattr(value, "params", {})
+    return str(params["CN"]) if params.get("CN") else None
+
+
+def parse_ics(data: bytes, host_email: Optional[str] = None) -> Iterator[Row]:
+    """Rows of meeting_data for the events of a calendar"""
+    if not HAS_ICALENDAR:
+        raise ImportError(
+            "Loading .ics files requires icalendar (pip install icalendar)"
+        )
+    calendar = icalendar.Calendar.from_ical(data)
+    for event in calendar.walk("VEVENT"):
+        start = event.decoded("dtstart")
+        if not isinstance(start, datetime):  # all-day event
+            start = datetime.combine(start, datetime.min.time())
+        attendees = event.get("attendee", [])
+        if not isinstance(attendees, list):
+            attendees = [attendees]
+        organizer = event.get("organizer")
+        row = {
+            "meeting_id": str(event.get("uid")) if event.get("uid") else None,
+            "meeting_timestamp": start.replace(tzinfo=None).strftime(TIMESTAMP_FORMAT),
+            "host": _common_name(organizer) if organizer else None,
+            "host_email": _mailto(organizer) if organizer else host_email,
+            # Positional with invitee_emails: an attendee without a CN is named by its address
+            "invitees": ", ".join(_common_name(a) or _mailto(a) for a in attendees)
+            or None,
+            "invitee_emails": ", ".join(_mailto(attendee) for attendee in attendees)
+            or None,
+            "meeting_subject": (
+                str(event.get("summary")) if event.get("summary") else None
+            ),
+        }
+        yield complete_row(TABLES["meeting_data"], row)
+
+
+def read_ics(path: Path, host_email: Optional[str] = None) -> Iterator[Row]:
+    yield from parse_ics(path.read_bytes(), host_email)
+
+
+def read_rows(
+    path: Path, table: str, host_email: Optional[str] = None
+) -> Iterator[Row]:
+    """Rows of `table` in a file of any supported type"""
+    suffix = path.suffix.lower()
+    if suffix == ".eml":
+        return read_eml(path)
+    if suffix == ".ics":
+        return read_ics(path, host_email)
+    return read_csv(path, TABLES[table])
+
+
+def batched(rows: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
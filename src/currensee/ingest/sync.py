@@ -0,0 +1,485 @@
+"""
+Incremental mailbox sync of `email_data` and `meeting_data`.
+
+Instead of reloading every mailbox wholesale, each sync asks a source for the
+messages and events of a mailbox that are new or changed since its high-water
+mark (stored per source and mailbox in `sync_watermarks`), upserts only those
+and drops the cached reports of the clients they involve. Ingestion cost is therefore proportional to the
+new mail, not to the size of the mailbox.
+
+Sources:
+- `EmlDirectorySource`: one directory per mailbox (named after its address)
+  of .eml and .ics files; the watermark is the latest file change time
+- `GraphSource`: Microsoft Graph through the `O365` package; the watermark is
+  the latest lastModifiedDateTime of the mailbox's messages and events
+
+The watermark only moves once the changes are committed; a failed sync is
+retried from the previous mark, which the idempotent upserts make safe.
+
+    currensee-sync --eml-dir data/outlook/mailboxes
+    currensee-sync --source graph --watch 300
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Union
+
+from sqlalchemy import create_engine, text
+
+from currensee.ingest.loader import create_indexes, load_rows, prepare_table, upsert_sql
+from currensee.ingest.sources import (
+    EXTENSION_TABLES,
+    TIMESTAMP_FORMAT,
+    complete_row,
+    iter_files,
+    read_rows,
+)
+from currensee.ingest.tables import TABLES
+
+logger = logging.getLogger(__name__)
+
+DB_NAME = "crm_outlook"
+SYNC_TABLES = ("email_data", "meeting_data")
+DEFAULT_BATCH_SIZE = 1000
+
+
+@dataclass
+class Change:
+    """A new or changed row of a mailbox, with its position in the source"""
+
+    table: str
+    row: Dict[str, Any]
+    # Sortable string (see the sources): max() of the synced changes becomes the new mark
+    watermark: str
+
+
+class MailboxSource(ABC):
+    """Where mailbox contents come from"""
+
+    name: str = "source"
+
+    @abstractmethod
+    def mailboxes(self) -> List[str]:
+        """Addresses of the mailboxes to sync"""
+
+    @abstractmethod
+    def changes(self, mailbox: str, since: Optional[str]) -> Iterator[Change]:
+        """Rows of the mailbox added or changed at or after the `since` watermark (all if None)"""
+
+
+class EmlDirectorySource(MailboxSource):
+    """
+    Mailboxes exported as files: <root>/<mailbox address>/**/*.eml and *.ics.
+    Files are stat'ed on every sync but only new or modified ones are parsed.
+
+    A file's position is the later of its modification and inode change times:
+    the mtime of a file copied in with its timestamps preserved (cp -p,
+    rsync -t, unzip) predates the mark, but its ctime is when it arrived.
+    """
+
+    name = "eml"
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def mailboxes(self) -> List[str]:
+        return sorted(
+            path.name
+            for path in self.root.iterdir()
+            if path.is_dir() and "@" in path.name
+        )
+
+    def changes(self, mailbox: str, since: Optional[str]) -> Iterator[Change]:
+        for path in iter_files([self.root / mailbox], EXTENSION_TABLES):
+            # Files changed in the same tick as the mark are read again (and upserted as no-ops)
+            stat = path.stat()
+            watermark = f"{max(stat.st_mtime_ns, stat.st_ctime_ns):020d}"
+            if since is not None and watermark < since:
+                continue
+            table = EXTENSION_TABLES[path.suffix.lower()]
+            for row in read_rows(path, table, host_email=mailbox):
+                yield Change(table, row, watermark)
+
+
+def _graph_timestamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class GraphSource(MailboxSource):
+    """
+    Mailboxes read from Microsoft Graph with an authenticated `O365.Account`
+    (application permissions Mail.Read and Calendars.Read for other mailboxes).
+    """
+
+    name = "graph"
+
+    def __init__(
+        self, account, mailboxes: List[str], page_size: int = 100, calendar: bool = True
+    ):
+        self.account = account
+        self._mailboxes = list(mailboxes)
+        self.page_size = page_size
+        self.calendar = calendar
+
+    @classmethod
+    def from_env(cls) -> "GraphSource":
+        """
+        Client credentials from O365_CLIENT_ID, O365_CLIENT_SECRET and O365_TENANT_ID;
+        mailboxes from O365_MAILBOXES (comma separated).
+        """
+        from O365 import Account
+
+        account = Account(
+            (os.environ["O365_CLIENT_ID"], os.environ["O365_CLIENT_SECRET"]),
+            auth_flow_type="credentials",
+            tenant_id=os.environ["O365_TENANT_ID"],
+        )
+        if not account.is_authenticated and not account.authenticate():
+            raise RuntimeError("Microsoft Graph authentication failed")
+        mailboxes = [
+            m.strip() for m in os.getenv("O365_MAILBOXES", "").split(",") if m.strip()
+        ]
+        return cls(account, mailboxes)
+
+    def mailboxes(self) -> List[str]:
+        return self._mailboxes
+
+    def _query(self, resource, since: Optional[str]):
+        builder = resource.new_query()
+        order = builder.orderby("lastModifiedDateTime")
+        if since is None:
+            return order
+        start = datetime.strptime(since, "%Y-%m-%dT%H:%M:%SZ").replace(
+            tzinfo=timezone.utc
+        )
+        return builder.greater_equal("lastModifiedDateTime", start) & order
+
+    def changes(self, mailbox: str, since: Optional[str]) -> Iterator[Change]:
+        inbox = self.account.mailbox(resource=mailbox)
+        for message in inbox.get_messages(
+            limit=None, query=self._query(inbox, since), batch=self.page_size
+        ):
+            row = {
+                "message_id": message.internet_message_id or message.object_id,
+                "email_timestamp": (
+                    message.received.replace(tzinfo=None).strftime(TIMESTAMP_FORMAT)
+                    if message.received
+                    else None
+                ),
+                "to_names": ", ".join(r.name for r in message.to if r.name) or None,
+                "to_emails": ", ".join(r.address for r in message.to if r.address)
+                or None,
+                "from_name": message.sender.name if message.sender else None,
+                "from_email": message.sender.address if message.sender else None,
+                "email_subject": message.subject,
+                "email_body": message.get_body_text(),
+            }
+            yield Change(
+                "email_data",
+                complete_row(TABLES["email_data"], row),
+                _graph_timestamp(message.modified),
+            )
+
+        if not self.calendar:
+            return
+        calendar = self.account.schedule(resource=mailbox).get_default_calendar()
+        query = self._query(calendar, since)
+        for event in calendar.get_events(
+            limit=None, query=query, batch=self.page_size, include_recurring=False
+        ):
+            attendees = [attendee for attendee in event.attendees if attendee.address]
+            row = {
+                "meeting_id": event.ical_uid or event.object_id,
+                "meeting_timestamp": event.start.replace(tzinfo=None).strftime(
+                    TIMESTAMP_FORMAT
+                ),
+                "host": event.organizer.name if event.organizer else None,
+                "host_email": event.organizer.address if event.organizer else mailbox,
+                # Positional with invitee_emails: an attendee without a name is named by its address
+                "invitees": ", ".join(a.name or a.address for a in attendees) or None,
+                "invitee_emails": ", ".join(a.address for a in attendees) or None,
+                "meeting_subject": event.subject,
+            }
+            yield Change(
+                "meeting_data",
+                complete_row(TABLES["meeting_data"], row),
+                _graph_timestamp(event.modified),
+            )
+
+
+def create_source(kind: str, eml_dir: Optional[str] = None) -> MailboxSource:
+    if kind == "eml":
+        if not eml_dir:
+            raise ValueError("The eml source needs a directory of mailboxes")
+        return EmlDirectorySource(eml_dir)
+    if kind == "graph":
+        return GraphSource.from_env()
+    raise ValueError(f"Unknown mailbox source: {kind}")
+
+
+def get_watermark(engine, source: str, mailbox: str) -> Optional[str]:
+    with engine.connect() as conn:
+        return conn.execute(
+            text(
+                "SELECT watermark FROM sync_watermarks WHERE source = :source AND mailbox = :mailbox"
+            ),
+            {"source": source, "mailbox": mailbox},
+        ).scalar()
+
+
+def set_watermark(engine, source: str, mailbox: str, watermark: str) -> None:
+    row = {
+        "source": source,
+        "mailbox": mailbox,
+        "watermark": watermark,
+        "synced_at": datetime.now().strftime(TIMESTAMP_FORMAT),
+    }
+    with engine.begin() as conn:
+        conn.execute(
+            text(upsert_sql(TABLES["sync_watermarks"], engine.dialect.name)), row
+        )
+
+
+def prepare_sync_tables(engine) -> None:
+    """Tables and indexes the sync writes to (cheap no-ops once they exist)"""
+    for table in SYNC_TABLES:
+        prepare_table(engine, TABLES[table])
+    prepare_table(engine, TABLES["sync_watermarks"])
+    for table in SYNC_TABLES:
+        create_indexes(engine, TABLES[table], analyze=False)
+
+
+@dataclass
+class SyncStats:
+    """Outcome of syncing one mailbox"""
+
+    source: str
+    mailbox: str
+    changes: int = 0
+    emails_written: int = 0
+    meetings_written: int = 0
+    reports_invalidated: int = 0
+    watermark: Optional[str] = None
+    duration: float = 0.0
+
+
+def client_domains(mailbox: str, change: Change) -> Set[str]:
+    """Domains of the other parties of a change, except the mailbox's own organization"""
+    own = mailbox.lower().rsplit("@", 1)[-1]
+    columns = (
+        ("from_email", "to_emails")
+        if change.table == "email_data"
+        else ("invitee_emails",)
+    )
+    addresses = [
+        a.strip().lower()
+        for column in columns
+        for a in (change.row.get(column) or "").split(",")
+    ]
+    return {a.rsplit("@", 1)[-1] for a in addresses if "@" in a} - {own}
+
+
+def sync_mailbox(
+    engine,
+    source: MailboxSource,
+    mailbox: str,
+    report_cache=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> SyncStats:
+    """
+    Load the changes of one mailbox since its watermark and advance the watermark.
+
+    Args:
+        engine: Engine of the crm_outlook database (tables prepared, see prepare_sync_tables)
+        source: Where the mailbox contents come from
+        mailbox: Address of the mailbox
+        report_cache: ReportCache whose reports for the affected clients are dropped
+        batch_size: Rows per upsert transaction
+
+    Returns:
+        SyncStats of the mailbox
+    """
+    start = time.perf_counter()
+    since = get_watermark(engine, source.name, mailbox)
+    stats = SyncStats(source=source.name, mailbox=mailbox, watermark=since)
+    pending: Dict[str, List[Dict[str, Any]]] = {table: [] for table in SYNC_TABLES}
+    domains: Set[str] = set()
+
+    def flush(table: str) -> None:
+        rows, pending[table] = pending[table], []
+        if rows:
+            written = load_rows(engine, table, rows, len(rows)).rows_written
+            if table == "email_data":
+                stats.emails_written += written
+            else:
+                stats.meetings_written += written
+
+    for change in source.changes(mailbox, since):
+        pending[change.table].append(change.row)
+        domains |= client_domains(mailbox, change)
+        stats.changes += 1
+        if stats.watermark is None or change.watermark > stats.watermark:
+            stats.watermark = change.watermark
+        if len(pending[change.table]) >= batch_size:
+            flush(change.table)
+    for table in SYNC_TABLES:
+        flush(table)
+
+    if stats.watermark is not None and stats.watermark != since:
+        set_watermark(engine, source.name, mailbox, stats.watermark)
+    if report_cache is not None:
+        for domain in sorted(domains):
+            stats.reports_invalidated += report_cache.invalidate(
+                user_email=mailbox, client_domain=domain
+            )
+
+    stats.duration = round(time.perf_counter() - start, 3)
+    if stats.changes:
+        logger.info(
+            f"Synced {mailbox}: {stats.changes} changes, {stats.emails_written} emails and "
+            f"{stats.meetings_written} meetings written, {stats.reports_invalidated} reports invalidated"
+        )
+    return stats
+
+
+def _get_engine():
+    from currensee.utils.db_utils import get_engine
+
+    return get_engine(DB_NAME)
+
+
+class MailboxSyncService:
+    """
+    Background thread syncing every mailbox of a source, so the report cache of
+    the process it runs in is invalidated as new mail arrives.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, MailboxSource] = "eml",
+        report_cache=None,
+        interval: int = 300,
+        eml_dir: Optional[str] = None,
+        engine_fn: Callable[[], Any] = _get_engine,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        """
+        Args:
+            source: A MailboxSource, or the kind of source to create on first sync ("eml", "graph")
+            report_cache: ReportCache to invalidate for the synced clients
+            interval: Seconds between syncs
+            eml_dir: Directory of mailboxes of the "eml" source
+            engine_fn: Function returning the crm_outlook engine
+            batch_size: Rows per upsert transaction
+        """
+        self._source = source
+        self.report_cache = report_cache
+        self.interval = interval
+        self.eml_dir = eml_dir
+        self._engine_fn = engine_fn
+        self.batch_size = batch_size
+        self._prepared = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def source(self) -> MailboxSource:
+        if isinstance(self._source, str):
+            self._source = create_source(self._source, self.eml_dir)
+        return self._source
+
+    def run_once(self) -> List[SyncStats]:
+        engine = self._engine_fn()
+        if not self._prepared:
+            prepare_sync_tables(engine)
+            self._prepared = True
+        results = []
+        for mailbox in self.source.mailboxes():
+            if self._stop.is_set():
+                break
+            try:
+                results.append(
+                    sync_mailbox(
+                        engine, self.source, mailbox, self.report_cache, self.batch_size
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Mailbox sync failed for {mailbox}: {e}")
+        return results
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Mailbox sync failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="mailbox-sync", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Incrementally sync mailboxes into email_data and meeting_data"
+    )
+    parser.add_argument("--source", choices=["eml", "graph"], default="eml")
+    parser.add_argument(
+        "--eml-dir",
+        help="Directory with one sub-directory of .eml/.ics files per mailbox",
+    )
+    parser.add_argument("--mailbox", action="append", help="Only sync these mailboxes")
+    parser.add_argument(
+        "--database-url",
+        help="SQLAlchemy URL of the outlook database (default: Cloud SQL)",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--watch", type=int, default=0, help="Keep syncing every this many seconds"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    engine = create_engine(args.database_url) if args.database_url else _get_engine()
+    source = create_source(args.source, args.eml_dir)
+    prepare_sync_tables(engine)
+    while True:
+        for mailbox in args.mailbox or source.mailboxes():
+            print(
+                json.dumps(
+                    asdict(
+                        sync_mailbox(
+                            engine, source, mailbox, batch_size=args.batch_size
+                        )
+                    )
+                ),
+                flush=True,
+            )
+        if not args.watch:
+            return 0
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
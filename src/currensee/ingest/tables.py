@@ -0,0 +1,185 @@
+"""
+Tables loaded by the ingest pipeline: their database, columns, upsert key and
+lookup indexes.
+
+Outlook exports carry no natural key, so `email_data` and `meeting_data` get a
+synthetic one (the Message-ID / event UID when the source has it, otherwise a
+hash of the identifying columns, see `row_key`). Reloading the same files
+therefore updates rows in place instead of duplicating them.
+
+`client_exposure` (see currensee.ingest.exposure), `derived_refreshes` (the
+state of the source tables each derived table was last refreshed from) and
+`sync_watermarks` (the incremental sync position of each mailbox) are
+maintained by the loader and currensee.ingest.sync rather than loaded from
+files.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Schema of a loaded table"""
+
+    name: str
+    database: str
+    # (column, SQL type) in load order
+    columns: Tuple[Tuple[str, str], ...]
+    key: Tuple[str, ...]
+    # Columns hashed into the synthetic key column, when the key is synthetic
+    key_source: Tuple[str, ...] = ()
+    indexes: Tuple[Tuple[str, ...], ...] = field(default_factory=tuple)
+
+    @property
+    def column_names(self) -> List[str]:
+        return [name for name, _ in self.columns]
+
+    @property
+    def value_columns(self) -> List[str]:
+        return [name for name in self.column_names if name not in self.key]
+
+
+TABLES: Dict[str, TableSpec] = {
+    spec.name: spec
+    for spec in [
+        TableSpec(
+            name="accounts_alignment",
+            database="crm",
+            columns=(("company", "TEXT"), ("industry", "TEXT")),
+            key=("company",),
+        ),
+        TableSpec(
+            name="clients_contact",
+            database="crm",
+            columns=(
+                ("company", "TEXT"),
+                ("first_name", "TEXT"),
+                ("last_name", "TEXT"),
+                ("email", "TEXT"),
+                ("title", "TEXT"),
+            ),
+            key=("email",),
+            indexes=(("company",),),
+        ),
+        TableSpec(
+            name="portfolio",
+            database="crm",
+            columns=(
+                ("company", "TEXT"),
+                ("symbol", "TEXT"),
+                ("fund_type", "TEXT"),
+                ("fund_balance", "DOUBLE PRECISION"),
+            ),
+            key=("company", "symbol"),
+        ),
+        TableSpec(
+            name="fund_detail",
+            database="crm",
+            columns=(
+                ("fund", "TEXT"),
+                ("position_name", "TEXT"),
+                ("weight", "DOUBLE PRECISION"),
+            ),
+            key=("fund", "position_name"),
+        ),
+        TableSpec(
+            name="client_exposure",
+            database="crm",
+            columns=(
+                ("company", "TEXT"),
+                ("fund", "TEXT"),
+                ("position_name", "TEXT"),
+                ("fund_type", "TEXT"),
+                ("exposure", "DOUBLE PRECISION"),
+                ("position_rank", "INTEGER"),
+            ),
+            key=("company", "fund", "position_name"),
+            indexes=(("company", "fund_type", "position_rank"),),
+        ),
+        TableSpec(
+            name="derived_refreshes",
+            database="crm",
+            columns=(
+                ("name", "TEXT"),
+                ("source_fingerprint", "TEXT"),
+                ("refreshed_at", "TEXT"),
+            ),
+            key=("name",),
+        ),
+        TableSpec(
+            name="email_data",
+            database="crm_outlook",
+            columns=(
+                ("message_id", "TEXT"),
+                ("email_timestamp", "TEXT"),
+                ("to_names", "TEXT"),
+                ("to_emails", "TEXT"),
+                ("from_name", "TEXT"),
+                ("from_email", "TEXT"),
+                ("email_subject", "TEXT"),
+                ("email_body", "TEXT"),
+            ),
+            key=("message_id",),
+            key_source=("email_timestamp", "from_email", "to_emails", "email_subject"),
+            indexes=(
+                ("from_email", "email_timestamp"),
+                ("to_emails", "email_timestamp"),
+            ),
+        ),
+        TableSpec(
+            name="meeting_data",
+            database="crm_outlook",
+            columns=(
+                ("meeting_id", "TEXT"),
+                ("meeting_timestamp", "TEXT"),
+                ("host", "TEXT"),
+                ("host_email", "TEXT"),
+                ("invitees", "TEXT"),
+                ("invitee_emails", "TEXT"),
+                ("meeting_subject", "TEXT"),
+            ),
+            key=("meeting_id",),
+            key_source=("meeting_timestamp", "host_email", "invitee_emails"),
+            indexes=(("host_email", "meeting_timestamp"),),
+        ),
+        TableSpec(
+            name="sync_watermarks",
+            database="crm_outlook",
+            columns=(
+                ("source", "TEXT"),
+                ("mailbox", "TEXT"),
+                ("watermark", "TEXT"),
+                ("synced_at", "TEXT"),
+            ),
+            key=("source", "mailbox"),
+        ),
+        TableSpec(
+            name="preferences",
+            database="crm_outlook",
+            columns=(
+                ("as_of_date", "TEXT"),
+                ("employee_first_name", "TEXT"),
+                ("employee_last_name", "TEXT"),
+                ("finance_detail", "TEXT"),
+                ("news_detail", "TEXT"),
+                ("macro_news_detail", "TEXT"),
+                ("past_meeting_detail", "TEXT"),
+                ("email", "TEXT"),
+            ),
+            key=("email", "as_of_date"),
+        ),
+    ]
+}
+
+
+def row_key(spec: TableSpec, row: Dict[str, object]) -> Optional[str]:
+    """Synthetic key of a row built from the table's `key_source` columns"""
+    if not spec.key_source:
+        return None
+    parts: Sequence[str] = [
+        "" if row.get(column) is None else str(row[column])
+        for column in spec.key_source
+    ]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
@@ -0,0 +1,136 @@
+"""
+Tests for the materialized client exposure
+"""
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from currensee.ingest import exposure, ingest
+from currensee.ingest.exposure import (
+    book_positions,
+    exposure_by_fund,
+    refresh_client_exposure,
+    top_positions,
+)
+
+PORTFOLIO = [
+    ("Acme", "SPY", "Equity Fund", 1_000_000),
+    ("Acme", "AAPL", "Equity Fund", 300_000),
+    ("Acme", "AGG", "Fixed Income Fund", 5_000_000),
+    ("Globex", "SPY", "Equity Fund", 200_000),
+]
+FUND_DETAIL = [
+    ("SPY", "Apple", 0.07),
+    ("SPY", "Microsoft", 0.06),
+    ("SPY", "Nvidia", 0.05),
+    ("AAPL", "Apple", 1.0),
+    ("AGG", "US Treasury", 0.4),
+]
+
+
+def write_tables(engine):
+    pd.DataFrame(
+        PORTFOLIO, columns=["company", "symbol", "fund_type", "fund_balance"]
+    ).to_sql("portfolio", engine, index=False)
+    pd.DataFrame(FUND_DETAIL, columns=["fund", "position_name", "weight"]).to_sql(
+        "fund_detail", engine, index=False
+    )
+
+
+def test_top_positions_match_the_live_join(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'crm.db'}")
+    write_tables(engine)
+
+    live = top_positions(engine, "Acme", limit=3)
+    assert live == [
+        "Apple",
+        "Apple",
+        "Microsoft",
+    ]  # AAPL (300k), then SPY's Apple (70k)
+
+    assert refresh_client_exposure(engine) == 8
+    assert top_positions(engine, "Acme", limit=3) == live
+    assert top_positions(engine, "Acme", fund_type="Fixed Income Fund") == [
+        "US Treasury"
+    ]
+    assert exposure_by_fund(engine, "Acme") == pytest.approx(
+        {"AAPL": 300_000, "AGG": 2_000_000, "SPY": 180_000}
+    )
+    assert book_positions(engine, 2) == ["Apple", "Microsoft"]
+
+
+def test_loading_a_portfolio_refreshes_only_its_companies(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'crm.db'}")
+    write_tables(engine)
+    refresh_client_exposure(engine)
+
+    pd.DataFrame(
+        [
+            {
+                "company": "Globex",
+                "symbol": "AAPL",
+                "fund_type": "Equity Fund",
+                "fund_balance": 1_000_000,
+            }
+        ]
+    ).to_csv(tmp_path / "portfolio.csv", index=False)
+    ingest([str(tmp_path / "portfolio.csv")], {"crm": engine})
+
+    assert top_positions(engine, "Globex") == ["Apple", "Apple", "Microsoft", "Nvidia"]
+    assert top_positions(engine, "Acme", limit=1) == ["Apple"]
+    assert (
+        pd.read_sql("SELECT COUNT(*) AS n FROM client_exposure", engine)["n"].item()
+        == 9
+    )
+
+
+def test_sources_written_outside_the_loader_fall_back_to_the_live_join(
+    tmp_path, monkeypatch, caplog
+):
+    monkeypatch.setattr(exposure, "FRESHNESS_CHECK_SECONDS", 0)
+    engine = create_engine(f"sqlite:///{tmp_path / 'crm.db'}")
+    write_tables(engine)
+    refresh_client_exposure(engine)
+    assert exposure.is_current(engine)
+
+    # As the notebooks do: the whole table replaced with to_sql
+    portfolio = pd.DataFrame(
+        PORTFOLIO, columns=["company", "symbol", "fund_type", "fund_balance"]
+    )
+    portfolio.loc[portfolio["symbol"] == "AAPL", "fund_balance"] = 10_000
+    portfolio.to_sql("portfolio", engine, index=False, if_exists="replace")
+
+    assert not exposure.is_current(engine)
+    assert "--refresh-exposure" in caplog.text
+    assert top_positions(engine, "Acme", limit=2) == ["Apple", "Microsoft"]
+    assert exposure_by_fund(engine, "Acme")["AAPL"] == pytest.approx(10_000)
+
+    refresh_client_exposure(engine)
+    assert exposure.is_current(engine)
+    assert top_positions(engine, "Acme", limit=2) == ["Apple", "Microsoft"]
+
+
+def test_writes_keeping_counts_and_totals_are_detected(tmp_path, monkeypatch):
+    monkeypatch.setattr(exposure, "FRESHNESS_CHECK_SECONDS", 0)
+    engine = create_engine(f"sqlite:///{tmp_path / 'crm.db'}")
+    write_tables(engine)
+    refresh_client_exposure(engine)
+
+    # Balances swapped between two holdings: same row count and balance total
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "UPDATE portfolio SET fund_balance = CASE symbol "
+            "WHEN 'SPY' THEN 300000 WHEN 'AAPL' THEN 1000000 END "
+            "WHERE company = 'Acme' AND symbol IN ('SPY', 'AAPL')"
+        )
+    assert not exposure.is_current(engine)
+    refresh_client_exposure(engine)
+
+    # A renamed position
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "UPDATE fund_detail SET position_name = 'Alphabet' WHERE position_name = 'Nvidia'"
+        )
+    assert not exposure.is_current(engine)
+    assert "Alphabet" in top_positions(engine, "Globex")
@@ -0,0 +1,228 @@
+"""
+Tests for the bulk loader
+"""
+
+from datetime import datetime
+from email.message import EmailMessage
+from email.utils import formatdate
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from currensee.core import pregeneration
+from currensee.ingest import ingest
+from currensee.ingest.loader import upsert_sql
+from currensee.ingest.sources import HAS_ICALENDAR, parse_eml, parse_ics
+from currensee.ingest.tables import TABLES
+
+
+def write_eml(path, subject, body, message_id=None):
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = "Ann Lee <ann.lee@acme.com>"
+    msg["To"] = "Jane Moneypenny <jane.moneypenny@bankwell.com>"
+    msg["Date"] = formatdate(
+        pd.Timestamp("2024-03-01 09:30:00").timestamp(), localtime=False
+    )
+    if message_id:
+        msg["Message-ID"] = message_id
+    msg.set_content(body)
+    path.write_bytes(bytes(msg))
+
+
+def test_parse_eml_maps_headers_to_email_data_columns(tmp_path):
+    write_eml(
+        tmp_path / "1.eml",
+        "Credit facility",
+        "Can we talk about the renewal?",
+        "<1@outlook.com>",
+    )
+    row = parse_eml((tmp_path / "1.eml").read_bytes())
+
+    assert row == {
+        "message_id": "<1@outlook.com>",
+        "email_timestamp": "2024-03-01 09:30:00",
+        "to_names": "Jane Moneypenny",
+        "to_emails": "jane.moneypenny@bankwell.com",
+        "from_name": "Ann Lee",
+        "from_email": "ann.lee@acme.com",
+        "email_subject": "Credit facility",
+        "email_body": "Can we talk about the renewal?",
+    }
+
+    # Without a Message-ID the key is derived from the identifying columns, so it is stable
+    write_eml(tmp_path / "2.eml", "Credit facility", "Can we talk about the renewal?")
+    first, second = (parse_eml((tmp_path / "2.eml").read_bytes()) for _ in range(2))
+    assert first["message_id"] and first["message_id"] == second["message_id"]
+
+
+def test_ingest_is_idempotent_and_upgrades_existing_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    # Table as created by the notebooks (pandas, no key column)
+    pd.DataFrame(
+        [
+            {
+                "email_timestamp": "2023-01-01 10:00:00",
+                "to_names": "x",
+                "to_emails": "x@y.com",
+                "from_name": "y",
+                "from_email": "y@z.com",
+                "email_subject": "old",
+                "email_body": "old",
+            }
+        ]
+    ).to_sql("email_data", engine, index=False)
+
+    emails = tmp_path / "eml"
+    emails.mkdir()
+    for i in range(5):
+        write_eml(
+            emails / f"{i}.eml", f"Subject {i}", f"Body {i}", f"<{i}@outlook.com>"
+        )
+    pd.DataFrame(
+        [
+            {
+                "company": "Acme",
+                "first_name": "Ann",
+                "last_name": "Lee",
+                "email": "ann.lee@acme.com",
+                "title": "CFO",
+                "ignored": 1,
+            }
+        ]
+    ).to_csv(tmp_path / "clients_contact.csv", index=False)
+
+    stats = {
+        s.table: s
+        for s in ingest(
+            [str(emails), str(tmp_path / "clients_contact.csv")],
+            {"crm": engine, "crm_outlook": engine},
+            batch_size=2,
+        )
+    }
+    assert (
+        stats["email_data"].rows_read,
+        stats["email_data"].rows_written,
+        stats["email_data"].batches,
+    ) == (5, 5, 3)
+    assert stats["clients_contact"].rows_written == 1
+
+    # Reloading unchanged files writes nothing; a changed message is updated in place
+    write_eml(emails / "0.eml", "Subject 0", "Edited body", "<0@outlook.com>")
+    stats = ingest([str(emails)], {"crm_outlook": engine})
+    assert (stats[0].rows_read, stats[0].rows_written) == (5, 1)
+
+    emails_table = pd.read_sql(
+        "SELECT * FROM email_data ORDER BY email_subject", engine
+    )
+    assert len(emails_table) == 6
+    assert (
+        emails_table.loc[
+            emails_table["message_id"] == "<0@outlook.com>", "email_body"
+        ].item()
+        == "Edited body"
+    )
+    indexes = {index["name"] for index in inspect(engine).get_indexes("email_data")}
+    assert {
+        "ux_email_data_message_id",
+        "ix_email_data_from_email_email_timestamp",
+    } <= indexes
+
+
+def test_first_load_into_a_notebook_table_does_not_duplicate_it(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'outlook.db'}")
+    meetings = pd.DataFrame(
+        [
+            {
+                "meeting_timestamp": f"2024-03-0{day} 10:00:00",
+                "host": "Jane Moneypenny",
+                "host_email": "jane.moneypenny@bankwell.com",
+                "invitees": "Ann Lee",
+                "invitee_emails": "ann.lee@acme.com",
+                "meeting_subject": f"Review {day}",
+            }
+            for day in (1, 2, 3)
+        ]
+    )
+    meetings.to_csv(tmp_path / "meeting_data.csv", index=False)
+    # As the notebooks create it: the same rows, no key column, twice the last one
+    pd.concat([meetings, meetings.tail(1)]).to_sql("meeting_data", engine, index=False)
+
+    (stats,) = ingest([str(tmp_path / "meeting_data.csv")], {"crm_outlook": engine})
+
+    assert (stats.rows_read, stats.rows_written) == (3, 0)
+    table = pd.read_sql("SELECT * FROM meeting_data", engine)
+    assert len(table) == 3
+    assert table["meeting_id"].notna().all()
+
+
+def test_loaded_meetings_feed_pregeneration(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'outlook.db'}")
+    # As exported by the notebooks
+    pd.DataFrame(
+        [
+            {
+                "meeting_timestamp": "2024-03-26 10:00:00",
+                "host": "Jane Moneypenny",
+                "host_email": "jane.moneypenny@bankwell.com",
+                "invitees": "Ann Lee",
+                "invitee_emails": "ann.lee@acme.com",
+                "meeting_subject": "Acme - Annual Portfolio Review",
+            }
+        ]
+    ).to_csv(tmp_path / "meeting_data.csv", index=False)
+    ingest([str(tmp_path / "meeting_data.csv")], {"crm_outlook": engine})
+
+    monkeypatch.setattr(pregeneration, "_get_engine", lambda: engine)
+    (meeting,) = pregeneration.fetch_upcoming_meetings(
+        datetime(2024, 3, 26), datetime(2024, 3, 27)
+    )
+    assert (meeting.client_name, meeting.client_email, meeting.meeting_description) == (
+        "Ann Lee",
+        "ann.lee@acme.com",
+        "Acme - Annual Portfolio Review",
+    )
+
+
+def test_ingest_requires_a_table_for_unknown_csv(tmp_path):
+    (tmp_path / "export.csv").write_text("a,b\n1,2\n")
+    with pytest.raises(ValueError, match="--table"):
+        ingest([str(tmp_path / "export.csv")], {})
+
+
+def test_postgres_upsert_keeps_the_last_row_of_a_key():
+    sql = upsert_sql(TABLES["portfolio"], "postgresql", "_ingest_staging")
+    assert 'DISTINCT ON ("company", "symbol")' in sql
+    assert 'ORDER BY "company", "symbol", _seq DESC' in sql
+    assert (
+        'ON CONFLICT ("company", "symbol") DO UPDATE SET "fund_type" = EXCLUDED."fund_type"'
+        in sql
+    )
+
+
+@pytest.mark.skipif(not HAS_ICALENDAR, reason="icalendar not installed")
+def test_parse_ics_maps_events_to_meeting_data():
+    calendar = b"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//test//
+BEGIN:VEVENT
+UID:abc-1
+SUMMARY:Acme - Annual Portfolio Review
+DTSTART:20240326T100000
+DTEND:20240326T110000
+ORGANIZER;CN=Jane Moneypenny:mailto:jane.moneypenny@bankwell.com
+ATTENDEE;CN=Ann Lee:mailto:ann.lee@acme.com
+END:VEVENT
+END:VCALENDAR
+"""
+    (row,) = parse_ics(calendar)
+    assert row == {
+        "meeting_id": "abc-1",
+        "meeting_timestamp": "2024-03-26 10:00:00",
+        "host": "Jane Moneypenny",
+        "host_email": "jane.moneypenny@bankwell.com",
+        "invitees": "Ann Lee",
+        "invitee_emails": "ann.lee@acme.com",
+        "meeting_subject": "Acme - Annual Portfolio Review",
+    }
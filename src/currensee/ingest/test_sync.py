@@ -0,0 +1,102 @@
+"""
+Tests for the incremental mailbox sync
+"""
+
+import os
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+from currensee.core.report_cache import CacheEntry, ReportCache
+from currensee.ingest.sync import (
+    EmlDirectorySource,
+    MailboxSyncService,
+    prepare_sync_tables,
+    sync_mailbox,
+)
+from currensee.ingest.test_ingest import write_eml
+
+JANE = "jane.moneypenny@bankwell.com"
+
+
+def cached_report(cache, client_email):
+    cache.put(
+        CacheEntry(
+            key=client_email,
+            user_email=JANE,
+            client_email=client_email,
+            result={},
+            email_watermark=None,
+        )
+    )
+
+
+def test_sync_only_loads_new_and_changed_messages(tmp_path):
+    mailbox = tmp_path / "mailboxes" / JANE
+    mailbox.mkdir(parents=True)
+    for i in range(3):
+        write_eml(
+            mailbox / f"{i}.eml", f"Subject {i}", f"Body {i}", f"<{i}@outlook.com>"
+        )
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'outlook.db'}")
+    prepare_sync_tables(engine)
+    source = EmlDirectorySource(tmp_path / "mailboxes")
+    cache = ReportCache(version_fn=lambda *args: None)
+    cached_report(cache, "ann.lee@acme.com")
+    cached_report(
+        cache, "bob.ray@acme.com"
+    )  # same company: the new mail feeds his report too
+    cached_report(cache, "eve.hart@globex.com")
+
+    stats = sync_mailbox(engine, source, JANE, cache)
+    assert (stats.changes, stats.emails_written, stats.reports_invalidated) == (3, 3, 2)
+    assert cache.get("eve.hart@globex.com") is not None
+
+    # Nothing new: at most the files at the watermark are read again, and they write nothing
+    stats = sync_mailbox(engine, source, JANE)
+    assert stats.changes < 3 and stats.emails_written == 0
+
+    # An edited message, a new one, and one copied in with an old modification time
+    write_eml(mailbox / "0.eml", "Subject 0", "Edited body", "<0@outlook.com>")
+    write_eml(mailbox / "3.eml", "Subject 3", "Body 3", "<3@outlook.com>")
+    write_eml(mailbox / "4.eml", "Subject 4", "Body 4", "<4@outlook.com>")
+    os.utime(mailbox / "4.eml", ns=(10**18, 10**18))
+    stats = sync_mailbox(engine, source, JANE)
+    assert stats.emails_written == 3
+
+    emails = pd.read_sql(
+        "SELECT message_id, email_body FROM email_data ORDER BY message_id", engine
+    )
+    assert emails["email_body"].tolist() == [
+        "Edited body",
+        "Body 1",
+        "Body 2",
+        "Body 3",
+        "Body 4",
+    ]
+
+
+def test_service_syncs_every_mailbox(tmp_path):
+    for mailbox in (JANE, "sam.wu@bankwell.com"):
+        (tmp_path / mailbox).mkdir()
+        write_eml(
+            tmp_path / mailbox / "1.eml",
+            "Hello",
+            f"Hi {mailbox}",
+            f"<{mailbox}@outlook.com>",
+        )
+    (tmp_path / "not-a-mailbox").mkdir()
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'outlook.db'}")
+    service = MailboxSyncService("eml", eml_dir=str(tmp_path), engine_fn=lambda: engine)
+    results = service.run_once()
+
+    assert [(r.mailbox, r.emails_written) for r in results] == [
+        (JANE, 1),
+        ("sam.wu@bankwell.com", 1),
+    ]
+    watermarks = pd.read_sql(
+        "SELECT source, mailbox FROM sync_watermarks ORDER BY mailbox", engine
+    )
+    assert watermarks.values.tolist() == [["eml", JANE], ["eml", "sam.wu@bankwell.com"]]
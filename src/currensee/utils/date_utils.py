@@ -0,0 +1,146 @@
+"""
+Normalization of the date strings returned by news search APIs.
+
+Serper returns dates such as "Mar 20, 2024", "2024-03-20T14:05:00Z" or
+"3 days ago". `normalize_date` first tries a table of compiled patterns for
+these shapes and only falls back to `dateutil` for anything else. Results are
+memoized per (string, reference time), so repeated dates across articles,
+holdings and reports cost a dictionary lookup.
+
+All returned datetimes are timezone-aware; strings without a timezone are
+taken to be UTC. Strings that cannot be parsed are counted by shape (digits
+replaced by 9, letters by a) and can be listed with `unparsed_date_formats`.
+"""
+
+import re
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Optional, Union
+
+from dateutil import parser as date_parser
+
+# Compiled shape check -> strptime format, in the order Serper most often uses them
+FAST_FORMATS = [
+    (re.compile(r"^[A-Z][a-z]{2} \d{1,2}, \d{4}$"), "%b %d, %Y"),
+    (re.compile(r"^[A-Z][a-z]+ \d{1,2}, \d{4}$"), "%B %d, %Y"),
+    (re.compile(r"^\d{4}-\d{2}-\d{2}$"), "%Y-%m-%d"),
+    (re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$"), "%Y-%m-%d %H:%M:%S"),
+    (
+        re.compile(
+            r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})$"
+        ),
+        "%Y-%m-%dT%H:%M:%S%z",
+    ),
+    (re.compile(r"^\d{1,2} [A-Z][a-z]{2} \d{4}$"), "%d %b %Y"),
+    (re.compile(r"^\d{1,2}/\d{1,2}/\d{4}$"), "%m/%d/%Y"),
+]
+
+RELATIVE_DATE = re.compile(
+    r"^(?:(\d+|an?)\s+(second|minute|min|hour|day|week|month|year)s?\s+ago|(just now|today|yesterday))$",
+    re.IGNORECASE,
+)
+RELATIVE_UNITS = {
+    "second": timedelta(seconds=1),
+    "minute": timedelta(minutes=1),
+    "min": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+
+_unparsed = Counter()
+_unparsed_lock = threading.Lock()
+_SHAPE = str.maketrans(
+    "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    "9" * 10 + "a" * 52,
+)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse_relative(match: re.Match, reference: datetime) -> datetime:
+    amount, unit, word = match.groups()
+    if word:
+        word = word.lower()
+        return reference - timedelta(days=1) if word == "yesterday" else reference
+    count = 1 if amount.lower() in ("a", "an") else int(amount)
+    return reference - count * RELATIVE_UNITS[unit.lower()]
+
+
+@lru_cache(maxsize=8192)
+def _normalize(date_str: str, reference: datetime) -> Optional[datetime]:
+    for shape, fmt in FAST_FORMATS:
+        if shape.match(date_str):
+            try:
+                return _as_utc(datetime.strptime(date_str.replace("Z", "+0000"), fmt))
+            except ValueError:
+                break
+
+    match = RELATIVE_DATE.match(date_str)
+    if match:
+        return _parse_relative(match, reference)
+
+    try:
+        return _as_utc(date_parser.parse(date_str))
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def normalize_date(
+    value: Union[str, datetime, None], reference: Optional[datetime] = None
+) -> Optional[datetime]:
+    """
+    Parse a search result date into a timezone-aware datetime.
+
+    Args:
+        value: Date string (absolute or relative, e.g. "2 hours ago") or datetime
+        reference: Time relative dates are counted from. Defaults to now,
+            truncated to the hour so results stay cacheable
+
+    Returns:
+        The datetime in UTC, or None if the value is empty or unparseable
+    """
+    if isinstance(value, datetime):
+        return _as_utc(value)
+    if not value:
+        return None
+
+    if reference is None:
+        reference = datetime.now(timezone.utc).replace(
+            minute=0, second=0, microsecond=0
+        )
+    parsed = _normalize(value.strip(), _as_utc(reference))
+    if parsed is None:
+        with _unparsed_lock:
+            _unparsed[value.strip().translate(_SHAPE)] += 1
+    return parsed
+
+
+def parse_flexible_date(
+    date_str: str, reference: Optional[datetime] = None
+) -> datetime:
+    """Like `normalize_date`, but raises ValueError for unparseable dates"""
+    parsed = normalize_date(date_str, reference)
+    if parsed is None:
+        raise ValueError(f"Unrecognized date format: {date_str}")
+    return parsed
+
+
+def unparsed_date_formats() -> Dict[str, int]:
+    """Shapes of the date strings that could not be parsed, with their counts"""
+    with _unparsed_lock:
+        return dict(_unparsed.most_common())
+
+
+def reset_date_stats() -> None:
+    with _unparsed_lock:
+        _unparsed.clear()
+    _normalize.cache_clear()
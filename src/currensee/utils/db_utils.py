@@ -1,9 +1,11 @@
 import sqlite3
+from functools import lru_cache
 
 import requests
 from sqlalchemy import create_engine
 from sqlalchemy.pool import StaticPool
 
+from currensee.core.profiling import instrument_engine
 from currensee.core.settings import Settings
 
 settings = Settings()
@@ -15,3 +17,11 @@ def create_pg_engine(db_name: str):
     )
 
     return engine
+
+
+@lru_cache(maxsize=None)
+def get_engine(db_name: str):
+    """Engine of a database, created on first use and shared by all callers"""
+    engine = create_pg_engine(db_name)
+    instrument_engine(engine, db_name)
+    return engine
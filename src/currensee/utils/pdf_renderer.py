@@ -0,0 +1,202 @@
+"""
+Out-of-process PDF rendering with a content-hash cache.
+
+WeasyPrint layout is CPU-bound and holds the GIL, so rendering PDFs in the API
+process slows down every other request. `PdfRenderer` renders in a pool of
+worker processes and keeps the produced PDFs keyed by the SHA-256 of their HTML,
+so downloading the same report again does not render it again. Both the memory
+and the optional disk cache evict their least recently used PDFs past a size cap.
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def render_pdf_bytes(html_string: str, page_size: str = "Letter") -> bytes:
+    """Render an HTML document to PDF bytes (runs in the worker processes)"""
+    import weasyprint
+
+    pdf_buffer = io.BytesIO()
+    weasyprint.HTML(string=html_string).write_pdf(
+        pdf_buffer,
+        stylesheets=None,
+        presentational_hints=True,
+        page_size=page_size,
+    )
+    return pdf_buffer.getvalue()
+
+
+def content_hash(html_string: str) -> str:
+    return hashlib.sha256(html_string.encode("utf-8")).hexdigest()
+
+
+def iter_chunks(data: bytes, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Split PDF bytes into chunks for a streaming response"""
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield bytes(view[start : start + chunk_size])
+
+
+class PdfRenderer:
+    """
+    Render HTML to PDF in a process pool, memoizing results by content hash.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        cache_max_bytes: int = 200 * 1024 * 1024,
+        cache_dir: Optional[str] = None,
+        cache_dir_max_bytes: int = 1024 * 1024 * 1024,
+        page_size: str = "Letter",
+    ):
+        """
+        Args:
+            workers: Number of worker processes (0 renders in the calling thread)
+            cache_max_bytes: Memory budget of the in-process PDF cache
+            cache_dir: Optional directory to also keep PDFs in, shared by API workers
+            cache_dir_max_bytes: Disk budget of `cache_dir`
+            page_size: PDF page size
+        """
+        self.workers = workers
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_dir_max_bytes = cache_dir_max_bytes
+        self.page_size = page_size
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.stats = {"hit": 0, "miss": 0}
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: the API process runs threads, which do not mix well with fork
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _count(self, status: str) -> None:
+        # Imported here: spawned render workers import this module and need none of currensee.core
+        from currensee.core.metrics import record_cache_lookup
+
+        self.stats[status] += 1
+        record_cache_lookup("pdf", status)
+
+    def get_cached(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            pdf_bytes = self._cache.get(key)
+            if pdf_bytes is not None:
+                self._cache.move_to_end(key)
+                return pdf_bytes
+
+        if self.cache_dir:
+            path = self.cache_dir / f"{key}.pdf"
+            try:
+                pdf_bytes = path.read_bytes()
+                # The modification time orders the files for eviction
+                os.utime(path)
+            except FileNotFoundError:
+                return None
+            self._store(key, pdf_bytes, write_disk=False)
+            return pdf_bytes
+        return None
+
+    def _store(self, key: str, pdf_bytes: bytes, write_disk: bool = True) -> None:
+        if len(pdf_bytes) <= self.cache_max_bytes:
+            with self._lock:
+                if key not in self._cache:
+                    self._cache[key] = pdf_bytes
+                    self._cache_bytes += len(pdf_bytes)
+                while self._cache_bytes > self.cache_max_bytes:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cache_bytes -= len(evicted)
+
+        if write_disk and self.cache_dir:
+            # Write then rename so other workers never read a partial file
+            path = self.cache_dir / f"{key}.pdf"
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(pdf_bytes)
+            tmp_path.replace(path)
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Delete the least recently used PDFs until `cache_dir` fits its budget"""
+        files = []
+        for path in self.cache_dir.glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda f: f[0]):
+            if total <= self.cache_dir_max_bytes:
+                break
+            # Another API worker may have evicted it already
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.debug(f"Evicted {path.name} from the PDF disk cache")
+
+    def render(self, html_string: str) -> bytes:
+        """Render (or fetch from the cache) the PDF of an HTML document"""
+        key = content_hash(html_string)
+        pdf_bytes = self.get_cached(key)
+        if pdf_bytes is not None:
+            self._count("hit")
+            return pdf_bytes
+
+        self._count("miss")
+        if self.workers > 0:
+            pdf_bytes = (
+                self._get_pool()
+                .submit(render_pdf_bytes, html_string, self.page_size)
+                .result()
+            )
+        else:
+            pdf_bytes = render_pdf_bytes(html_string, self.page_size)
+        self._store(key, pdf_bytes)
+        return pdf_bytes
+
+    async def render_async(self, html_string: str) -> bytes:
+        """Render without blocking the event loop"""
+        key = content_hash(html_string)
+        pdf_bytes = self.get_cached(key)
+        if pdf_bytes is not None:
+            self._count("hit")
+            return pdf_bytes
+
+        self._count("miss")
+        loop = asyncio.get_event_loop()
+        executor = self._get_pool() if self.workers > 0 else None
+        pdf_bytes = await loop.run_in_executor(
+            executor, render_pdf_bytes, html_string, self.page_size
+        )
+        self._store(key, pdf_bytes)
+        return pdf_bytes
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
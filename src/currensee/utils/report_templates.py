@@ -0,0 +1,64 @@
+"""
+Jinja2 environment for the briefing report templates in `utils/templates`.
+
+Templates are compiled once per process and kept in memory (`auto_reload` is
+off); compiled bytecode is also cached on disk so new worker processes skip
+parsing. Set CURRENSEE_TEMPLATE_CACHE_DIR to choose the bytecode directory.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+
+REPORT_TEMPLATE = "report/report.html"
+REPORT_SECTIONS = ["meeting_info", "client_interactions", "client_news", "financial"]
+
+
+@lru_cache(maxsize=1)
+def get_environment() -> Environment:
+    cache_dir = os.getenv("CURRENSEE_TEMPLATE_CACHE_DIR")
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        bytecode_cache=(
+            FileSystemBytecodeCache(cache_dir)
+            if cache_dir
+            else FileSystemBytecodeCache()
+        ),
+        # Sections embed HTML already produced by the formatters and summaries
+        autoescape=False,
+        auto_reload=False,
+        cache_size=-1,
+        keep_trailing_newline=True,
+    )
+
+
+def preload_templates() -> None:
+    """Compile the report templates up front (e.g. at API startup)"""
+    env = get_environment()
+    env.get_template(REPORT_TEMPLATE)
+    env.get_template("report/macros.html")
+    for section in REPORT_SECTIONS:
+        env.get_template(f"report/sections/{section}.html")
+
+
+@lru_cache(maxsize=1)
+def get_macros():
+    """Module exposing the macros of report/macros.html as callables"""
+    return get_environment().get_template("report/macros.html").module
+
+
+def render_template(name: str, context: Dict[str, Any]) -> str:
+    return get_environment().get_template(name).render(context)
+
+
+def stream_template(name: str, context: Dict[str, Any]) -> Iterator[str]:
+    """Render a template incrementally, yielding chunks as they are produced"""
+    return get_environment().get_template(name).generate(context)
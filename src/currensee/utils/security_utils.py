@@ -10,6 +10,8 @@ from datetime import datetime
 from typing import Dict, Optional
 from fastapi import HTTPException
 
+from currensee.core.metrics import GUARDRAIL_LATENCY
+
 logger = logging.getLogger(__name__)
 
 
@@ -198,3 +200,6 @@ def log_security_metrics(validation_results: Dict, execution_time_ms: float):
     }
     
     metrics_logger.info(f"Security validation metrics: {metrics}")
+    GUARDRAIL_LATENCY.labels(str(metrics["overall_valid"]).lower()).observe(
+        execution_time_ms / 1000
+    )
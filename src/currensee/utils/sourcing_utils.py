@@ -2,24 +2,19 @@ import re
 from textwrap import wrap
 from typing import Any, Dict, List, Optional, TypedDict
 
-import matplotlib.pyplot as plt
 # import yfinance as yf
-import pandas as pd
-import pandas_datareader.data as web
 from dotenv import load_dotenv
-from langchain_community.utilities import GoogleSerperAPIWrapper
 from langchain_core.messages import HumanMessage
 from langgraph.graph.state import CompiledStateGraph
-from tabulate import tabulate
 
-from currensee.agents.tools.base import SupervisorState
-from currensee.core import get_model, settings
+from currensee.agents.tools.base import NewsArticle, SupervisorState
+from currensee.core import get_default_model
 from currensee.schema import AgentInfo
 
 load_dotenv()
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 
 @dataclass
@@ -29,11 +24,10 @@ class Agent:
 
 
 logger = logging.getLogger(__name__)
-model = get_model(settings.DEFAULT_MODEL)
 
 
 def chunk_sources_with_metadata(
-    sources: dict[str, list[dict]], max_length: int = 1000
+    sources: dict[str, list[NewsArticle]], max_length: int = 1000
 ) -> dict[str, tuple[str, str]]:
     """
     Chunk each source's snippet and retain the original link with each chunk.
@@ -42,11 +36,8 @@ def chunk_sources_with_metadata(
     chunked = {}
     for category, entries in sources.items():
         for i, entry in enumerate(entries):
-            snippet = entry.get("snippet", "")
-            link = entry.get("link", "")
-            title = entry.get("title", "")
-
-            full_text = f"{title}\n{snippet}".strip()
+            full_text = f"{entry.title}\n{entry.snippet}".strip()
+            link = entry.link
             chunks = wrap(
                 full_text, max_length, break_long_words=False, replace_whitespace=False
             )
@@ -92,12 +83,9 @@ def format_holdings_sources(raw_sources):
     formatted = []
     for ticker, articles in raw_sources.items():
         for article in articles:
+            # Untitled articles are labelled with the holding they were found for
             formatted.append(
-                {
-                    "title": article.get("title", ticker),
-                    "snippet": article.get("snippet", ""),
-                    "link": article.get("link", ""),
-                }
+                article if article.title else replace(article, title=ticker)
             )
 
     return formatted
@@ -182,13 +170,16 @@ def insert_links_into_summary(
 
     return updated_summary
 
-def get_fin_linked_summary(state: SupervisorState) -> str:
+
+def get_fin_linked_summary(state: SupervisorState) -> dict:
     summary_fin_hold = state["summary_fin_hold"]
     summary_client_news = state["summary_client_news"]
     prompt_hold = get_soucing_prompt(summary_fin_hold,  state)
     prompt_client_news = get_soucing_prompt(summary_client_news,  state)
-    response_hold = model.invoke([HumanMessage(content=prompt_hold)])
-    response_client = model.invoke([HumanMessage(content=prompt_client_news)])
+    response_hold = get_default_model().invoke([HumanMessage(content=prompt_hold)])
+    response_client = get_default_model().invoke(
+        [HumanMessage(content=prompt_client_news)]
+    )
     filtered_output_hold = filter_empty_sources(response_hold.content)
     filtered_output_client = filter_empty_sources(response_client.content)
     claim_url_pairs_hold = extract_claim_url_pairs(filtered_output_hold) 
@@ -196,7 +187,7 @@ def get_fin_linked_summary(state: SupervisorState) -> str:
     linked_fin_hold_summary = insert_links_into_summary(summary_fin_hold, claim_url_pairs_hold)
     linked_client_news_summary = insert_links_into_summary(summary_client_news, claim_url_pairs_client)
 
-    new_state = state.copy()
-    new_state["fin_hold_summary_sourced"] = linked_fin_hold_summary
-    new_state["client_news_summary_sourced"] = linked_client_news_summary 
-    return new_state
+    return {
+        "fin_hold_summary_sourced": linked_fin_hold_summary,
+        "client_news_summary_sourced": linked_client_news_summary,
+    }
@@ -0,0 +1,67 @@
+"""
+Static assets of the briefing report (stylesheet, script and logo).
+
+By default reports link these assets instead of inlining them: each asset is
+served under `/static/report/` with a content hash in its file name, so
+browsers can cache it indefinitely and a changed asset gets a new URL.
+Self-contained documents (PDFs, files written by the batch CLI) still inline
+them.
+"""
+
+import base64
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from currensee.utils.get_logo_utils import get_logo
+
+ASSET_DIR = Path(__file__).resolve().parent / "templates" / "report"
+STATIC_PREFIX = "/static/report"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    name: str
+    content: bytes
+    media_type: str
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(self.content).hexdigest()[:16]
+
+    @property
+    def hashed_name(self) -> str:
+        stem, _, suffix = self.name.rpartition(".")
+        return f"{stem}.{self.digest}.{suffix}"
+
+
+@lru_cache(maxsize=None)
+def get_asset(name: str) -> StaticAsset:
+    if name == "logo.png":
+        encoded = get_logo().split(",", 1)[1]
+        return StaticAsset(name, base64.b64decode(encoded), "image/png")
+    if name == "report.css":
+        return StaticAsset(name, (ASSET_DIR / name).read_bytes(), "text/css")
+    if name == "report.js":
+        return StaticAsset(name, (ASSET_DIR / name).read_bytes(), "text/javascript")
+    raise KeyError(name)
+
+
+def asset_urls(base_url: str = "") -> Dict[str, str]:
+    """Content-hashed URLs of the report assets, keyed by asset name"""
+    return {
+        name: f"{base_url.rstrip('/')}{STATIC_PREFIX}/{get_asset(name).hashed_name}"
+        for name in ("report.css", "report.js", "logo.png")
+    }
+
+
+def resolve_hashed_asset(filename: str) -> Optional[StaticAsset]:
+    """Return the asset a hashed file name refers to, or None if unknown or outdated"""
+    for name in ("report.css", "report.js", "logo.png"):
+        asset = get_asset(name)
+        if asset.hashed_name == filename:
+            return asset
+    return None
@@ -0,0 +1,45 @@
+function toggleBox(id) {
+    const allBoxes = [
+        'recent-email-box', 'client-questions-box',
+        'macro-snap', 'resources', 'client-holdings'
+    ];
+    allBoxes.forEach(boxId => {
+        const box = document.getElementById(boxId);
+        if (!box) return;
+        box.style.display = (boxId === id) ?
+            (box.style.display === 'none' ? 'block' : 'none') :
+            'none';
+    });
+}
+
+function toggleThumb(elem, sectionId, isUp) {
+    const container = elem.parentElement;
+    [...container.children].forEach(sibling => sibling.style.color = '#2980B9');
+
+    if(isUp) {
+        elem.style.color = '#0000FF'; // bright blue
+        document.getElementById(sectionId).style.display = 'block';
+    } else {
+        document.getElementById(sectionId).style.display = 'none';
+        elem.style.color = '#0000FF';
+    }
+}
+
+function handleFeedback(button, type) {
+    const feedbackSection = button.closest('.feedback-section');
+    const buttons = feedbackSection.querySelector('.feedback-buttons');
+    const message = feedbackSection.querySelector('.feedback-message');
+
+    // Hide buttons only when clicked
+    buttons.style.display = 'none';
+    message.style.display = 'block';
+
+    // Hide message after 5 seconds
+    setTimeout(() => {
+        message.style.display = 'none';
+    }, 5000);
+}
+
+function openClientHoldingsPage() {
+    window.open('/static/client_holding.html', '_blank');
+}
@@ -0,0 +1,47 @@
+"""
+Tests for search result date normalization
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from currensee.utils.date_utils import (
+    normalize_date,
+    parse_flexible_date,
+    reset_date_stats,
+    unparsed_date_formats,
+)
+
+REFERENCE = datetime(2024, 3, 20, 12, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("Mar 20, 2024", datetime(2024, 3, 20, tzinfo=timezone.utc)),
+        ("March 5, 2024", datetime(2024, 3, 5, tzinfo=timezone.utc)),
+        ("2024-03-20T14:05:00Z", datetime(2024, 3, 20, 14, 5, tzinfo=timezone.utc)),
+        (
+            "2024-03-20T14:05:00+02:00",
+            datetime(2024, 3, 20, 12, 5, tzinfo=timezone.utc),
+        ),
+        ("3 days ago", REFERENCE - timedelta(days=3)),
+        ("an hour ago", REFERENCE - timedelta(hours=1)),
+        ("yesterday", REFERENCE - timedelta(days=1)),
+        ("Wednesday, 20th of March 2024", datetime(2024, 3, 20, tzinfo=timezone.utc)),
+    ],
+)
+def test_normalize_date(value, expected):
+    assert normalize_date(value, REFERENCE) == expected
+
+
+def test_unparseable_dates_are_counted():
+    reset_date_stats()
+    assert normalize_date("soon", REFERENCE) is None
+    assert normalize_date("later", REFERENCE) is None
+    assert normalize_date("", REFERENCE) is None
+    assert unparsed_date_formats() == {"aaaa": 1, "aaaaa": 1}
+
+    with pytest.raises(ValueError):
+        parse_flexible_date("soon", REFERENCE)
@@ -0,0 +1,60 @@
+"""
+Tests for the templated briefing report
+"""
+
+from currensee.utils.output_utils_dynamic import (
+    build_report_context,
+    format_sources_to_html,
+    generate_report,
+    render_report_section,
+    stream_report,
+)
+
+RESULT = {
+    "meeting_description": "Annual Credit Facility Review Meeting",
+    "client_name": "Adam Clay",
+    "client_holdings": ["Apple Inc", " "],
+    "summary_client_comms": "* Discussed the credit facility",
+    "recent_email_summary": "- Asked about rates\nno bullet",
+    "recent_client_questions": "1. What is the new rate?",
+    "client_holdings_sources": {
+        "Apple Inc": [{"title": "Apple news", "link": "https://www.reuters.com/a"}] * 4
+    },
+    "past_meeting_detail": "long",
+    "client_news_detail": "none",
+    "holdings_detail": "short",
+    "macro_news_detail": "none",
+}
+
+
+def test_generate_report_sections():
+    html = generate_report(RESULT, enable_guardrails=False)
+
+    assert "Annual Credit Facility Review Meeting : Briefing Document" in html
+    assert '<span class="client-holding-pill">💼Apple Inc</span>' in html
+    assert "<li>Asked about rates</li>" in html and "no bullet" not in html
+    assert "<li>What is the new rate?</li>" in html
+    assert "Client News & Developments" not in html
+    assert "Macro Snapshot" not in html
+    assert html.count("<h4>Apple news</h4>") == 4
+    assert "".join(stream_report(RESULT, enable_guardrails=False)) == html
+
+
+def test_render_single_section():
+    context = build_report_context(RESULT, enable_guardrails=False)
+    section = render_report_section("client_interactions", context)
+    assert "Client Interactions" in section and "<html>" not in section
+
+    assert "<p>No results found.</p>" in format_sources_to_html(
+        [], "Macro Economic News"
+    )
+
+
+def test_static_asset_mode_links_assets():
+    inline_html = generate_report(RESULT, enable_guardrails=False)
+    static_html = generate_report(RESULT, enable_guardrails=False, inline_assets=False)
+
+    assert "data:image/png;base64" in inline_html and "<style>" in inline_html
+    assert "data:image/png;base64" not in static_html and "<style>" not in static_html
+    assert '<link rel="stylesheet" href="/static/report/report.' in static_html
+    assert len(static_html) < len(inline_html) / 10
@@ -0,0 +1,71 @@
+"""
+Tests for the PDF renderer cache
+"""
+
+import os
+
+import pytest
+
+from currensee.utils import pdf_renderer
+from currensee.utils.pdf_renderer import PdfRenderer, content_hash
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """Replace WeasyPrint with a fake renderer that records its inputs"""
+    calls = []
+
+    def render_pdf_bytes(html_string, page_size="Letter"):
+        calls.append(html_string)
+        return f"%PDF {html_string}".encode().ljust(100, b" ")
+
+    monkeypatch.setattr(pdf_renderer, "render_pdf_bytes", render_pdf_bytes)
+    return calls
+
+
+def test_identical_html_is_rendered_once(rendered, tmp_path):
+    renderer = PdfRenderer(workers=0, cache_dir=str(tmp_path))
+
+    first = renderer.render("<p>report</p>")
+    assert renderer.render("<p>report</p>") == first
+    assert rendered == ["<p>report</p>"]
+    assert renderer.stats == {"hit": 1, "miss": 1}
+    assert (tmp_path / f"{content_hash('<p>report</p>')}.pdf").read_bytes() == first
+
+    # Another API worker finds it on disk
+    other = PdfRenderer(workers=0, cache_dir=str(tmp_path))
+    assert other.render("<p>report</p>") == first
+    assert rendered == ["<p>report</p>"]
+    assert other.stats == {"hit": 1, "miss": 0}
+
+
+def test_memory_cache_evicts_least_recently_used(rendered):
+    renderer = PdfRenderer(workers=0, cache_max_bytes=250)
+
+    for html in ("a", "b", "a", "c"):
+        renderer.render(html)
+
+    assert rendered == ["a", "b", "c"]
+    assert renderer.get_cached(content_hash("a")) is not None
+    assert renderer.get_cached(content_hash("b")) is None
+    assert renderer._cache_bytes == 200
+
+
+def test_disk_cache_evicts_least_recently_used(rendered, tmp_path):
+    renderer = PdfRenderer(
+        workers=0, cache_max_bytes=0, cache_dir=str(tmp_path), cache_dir_max_bytes=250
+    )
+
+    renderer.render("a")
+    renderer.render("b")
+    # Age both files, then read "a" so it becomes the most recently used
+    for key in ("a", "b"):
+        os.utime(tmp_path / f"{content_hash(key)}.pdf", (1, 1))
+    renderer.render("a")
+    renderer.render("c")
+
+    assert sorted(path.stem for path in tmp_path.glob("*.pdf")) == sorted(
+        content_hash(key) for key in ("a", "c")
+    )
+    assert rendered == ["a", "b", "c"]
+    assert renderer.stats == {"hit": 1, "miss": 3}
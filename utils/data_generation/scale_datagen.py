@@ -0,0 +1,658 @@
+"""
+Synthetic CRM and Outlook data at production scale, for performance testing.
+
+Builds the tables the report tools query (crm: accounts_alignment,
+clients_contact, portfolio, fund_detail; crm_outlook: email_data, meeting_data,
+preferences) with numpy instead of row-by-row Faker calls, so 100k accounts and
+millions of emails take minutes. Faker only seeds small name pools that are
+then sampled in bulk.
+
+- Seeded: the same --seed, --chunk-size and --end produce the same rows
+- Chunked: accounts are generated --chunk-size at a time and every table is
+  appended chunk by chunk, so memory stays flat however large the run
+- Per-client email volume is heavy-tailed (lognormal around
+  --emails-per-contact, with a share of dormant contacts), sent on business
+  days and hours, and meetings follow email volume
+- Output to CSV or Parquet files (--out) and/or straight into databases
+  (--crm-url, --outlook-url): Postgres is loaded with COPY, SQLite (which has
+  no COPY) with one executemany per chunk
+
+    python utils/data_generation/scale_datagen.py --accounts 100000 --out data/scale --format parquet
+    python utils/data_generation/scale_datagen.py --accounts 100000 \\
+        --crm-url postgresql+psycopg2://user:pw@localhost:5432/crm \\
+        --outlook-url postgresql+psycopg2://user:pw@localhost:5432/crm_outlook
+
+Jane Moneypenny is always the first banker, so the generated databases also
+serve the demo users.
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from faker import Faker
+from sqlalchemy import create_engine, text
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Database each table belongs to
+TABLES = {
+    "accounts_alignment": "crm",
+    "clients_contact": "crm",
+    "portfolio": "crm",
+    "fund_detail": "crm",
+    "email_data": "crm_outlook",
+    "meeting_data": "crm_outlook",
+    "preferences": "crm_outlook",
+}
+
+BANKER_DOMAIN = "bankwell.com"
+JANE = ("Jane", "Moneypenny")
+
+INDUSTRIES = np.array(
+    [
+        "Technology",
+        "Healthcare",
+        "Retail",
+        "Manufacturing",
+        "RealEstate",
+        "Hospitality",
+        "Automotive",
+    ]
+)
+INDUSTRY_WEIGHTS = np.array([0.24, 0.2, 0.2, 0.14, 0.12, 0.06, 0.04])
+NAME_PARTS = (
+    [
+        "Apex",
+        "Blue",
+        "Cedar",
+        "Delta",
+        "Ember",
+        "Falcon",
+        "Granite",
+        "Harbor",
+        "Iron",
+        "Juniper",
+        "Keystone",
+        "Lumen",
+        "Meridian",
+        "North",
+        "Orion",
+        "Pioneer",
+        "Quartz",
+        "River",
+        "Summit",
+        "Vertex",
+    ],
+    [
+        "Labs",
+        "Systems",
+        "Foods",
+        "Health",
+        "Logistics",
+        "Realty",
+        "Motors",
+        "Brands",
+        "Capital",
+        "Works",
+        "Energy",
+        "Networks",
+        "Partners",
+        "Industries",
+        "Hotels",
+        "Materials",
+        "Devices",
+        "Media",
+        "Bio",
+        "Group",
+    ],
+    ["Inc", "Corp", "Holdings", "LLC", "Co", "Ltd"],
+)
+TITLES = np.array(
+    ["Senior Director", "Manager", "Director", "VP", "Consultant", "CFO", "Treasurer"]
+)
+
+STOCKS = {
+    "AAPL": "Apple",
+    "MSFT": "Microsoft",
+    "GOOGL": "Alphabet",
+    "AMZN": "Amazon",
+    "TSLA": "Tesla",
+    "NVDA": "NVIDIA",
+    "META": "Meta Platforms",
+    "JPM": "JPMorgan Chase",
+    "V": "Visa",
+    "UNH": "UnitedHealth Group",
+}
+BONDS = ["US10Y", "US30Y", "CORP1", "CORP2", "MUNI1", "MUNI2"]
+INDEX_FUNDS = ["VFIAX", "SWPPX", "FXAIX", "VTSAX", "FZROX", "SPY"]
+INDEX_FUND_POSITIONS = [
+    ("Apple", 0.071),
+    ("Microsoft", 0.068),
+    ("NVIDIA", 0.061),
+    ("Amazon", 0.037),
+    ("Meta Platforms", 0.025),
+    ("Alphabet", 0.021),
+    ("Berkshire Hathaway", 0.017),
+    ("Broadcom", 0.016),
+    ("JPMorgan Chase", 0.013),
+    ("Tesla", 0.012),
+]
+
+EMAIL_TOPICS = np.array(
+    [
+        (
+            "Quarterly portfolio review",
+            "Could you share the performance of our equity allocation this quarter?",
+        ),
+        (
+            "Credit facility renewal",
+            "We would like to discuss the terms of the credit facility ahead of renewal.",
+        ),
+        (
+            "Market volatility",
+            "How are you thinking about rate cuts and the recent market volatility?",
+        ),
+        (
+            "ESG reporting",
+            "Our board asked for the carbon score of the portfolio. Is that available?",
+        ),
+        (
+            "Cash management",
+            "We expect a large inflow next month and want options for short-term cash.",
+        ),
+        (
+            "Follow-up from our call",
+            "Thanks for the call. Attached are the documents you requested.",
+        ),
+        (
+            "Treasury services",
+            "Can we review the fees on our treasury management services?",
+        ),
+        (
+            "Acquisition financing",
+            "We are evaluating an acquisition and would like to discuss financing options.",
+        ),
+    ]
+)
+MEETING_TYPES = np.array(
+    ["Check-in", "Annual Portfolio Review", "Credit Review", "Strategy Session"]
+)
+
+# Default end of the email and meeting window, fixed so the output does not depend on the day it runs
+DEFAULT_END = datetime(2025, 6, 30)
+
+# Share of contacts without any email in the window
+DORMANT_SHARE = 0.1
+# Spread of the lognormal per-contact email volume (1.0: the busiest 1% send ~10x the mean)
+VOLUME_SIGMA = 1.0
+
+
+def name_pools(seed: int, size: int = 2000) -> Dict[str, np.ndarray]:
+    """First and last names drawn once from a seeded Faker, sampled in bulk afterwards"""
+    fake = Faker()
+    fake.seed_instance(seed)
+    return {
+        "first": np.array([fake.first_name() for _ in range(size)]),
+        "last": np.array([fake.last_name() for _ in range(size)]),
+    }
+
+
+def slug(values: pd.Series) -> pd.Series:
+    return values.str.lower().str.replace(r"\W+", "", regex=True)
+
+
+def generate_bankers(
+    num_bankers: int, pools: Dict[str, np.ndarray], rng: np.random.Generator
+) -> pd.DataFrame:
+    first = rng.choice(pools["first"], num_bankers)
+    last = rng.choice(pools["last"], num_bankers)
+    first[0], last[0] = JANE
+    bankers = pd.DataFrame({"first_name": first, "last_name": last})
+    bankers["email"] = (
+        slug(bankers["first_name"])
+        + "."
+        + slug(bankers["last_name"])
+        + np.where(np.arange(num_bankers) == 0, "", np.arange(num_bankers).astype(str))
+        + "@"
+        + BANKER_DOMAIN
+    )
+    return bankers
+
+
+def generate_accounts(
+    start: int,
+    count: int,
+    pools: Dict[str, np.ndarray],
+    rng: np.random.Generator,
+    num_bankers: int,
+) -> pd.DataFrame:
+    """Accounts `start` .. `start + count` with their point of contact and banker"""
+    ids = np.arange(start, start + count)
+    company = pd.Series(
+        rng.choice(NAME_PARTS[0], count).astype(object)
+        + " "
+        + rng.choice(NAME_PARTS[1], count)
+        + " "
+        + rng.choice(NAME_PARTS[2], count)
+        + " "
+        + ids.astype(str)
+    )
+    first = pd.Series(rng.choice(pools["first"], count))
+    last = pd.Series(rng.choice(pools["last"], count))
+    return pd.DataFrame(
+        {
+            "account_id": ids,
+            "company": company,
+            "industry": rng.choice(INDUSTRIES, count, p=INDUSTRY_WEIGHTS),
+            "first_name": first,
+            "last_name": last,
+            "email": slug(first) + "." + slug(last) + "@" + slug(company) + ".com",
+            "title": rng.choice(TITLES, count),
+            # Jane covers a regular book of clients; the others split the rest
+            "banker": np.where(
+                rng.random(count) < 0.02, 0, rng.integers(0, num_bankers, count)
+            ),
+        }
+    )
+
+
+def generate_portfolio(
+    accounts: pd.DataFrame, rng: np.random.Generator
+) -> pd.DataFrame:
+    symbols = np.array(list(STOCKS) + BONDS + INDEX_FUNDS)
+    fund_types = np.array(
+        ["Equity Fund"] * len(STOCKS)
+        + ["Fixed Income Fund"] * len(BONDS)
+        + ["Equity Fund"] * len(INDEX_FUNDS)
+    )
+    positions = rng.integers(5, 11, len(accounts))
+    rows = np.repeat(np.arange(len(accounts)), positions)
+    # Distinct symbols per account: rank of random keys picks a sample without replacement
+    keys = rng.random((len(accounts), len(symbols))).argsort(axis=1)
+    picks = keys[rows, np.concatenate([np.arange(n) for n in positions])]
+    return pd.DataFrame(
+        {
+            "company": accounts["company"].to_numpy()[rows],
+            "symbol": symbols[picks],
+            "fund_type": fund_types[picks],
+            "fund_balance": np.round(rng.lognormal(13.5, 1.2, len(rows)), 2),
+        }
+    )
+
+
+def fund_detail() -> pd.DataFrame:
+    rows = [(symbol, name, 1.0) for symbol, name in STOCKS.items()]
+    rows += [
+        (fund, name, weight)
+        for fund in INDEX_FUNDS
+        for name, weight in INDEX_FUND_POSITIONS
+    ]
+    return pd.DataFrame(rows, columns=["fund", "position_name", "weight"])
+
+
+def email_volumes(count: int, mean: float, rng: np.random.Generator) -> np.ndarray:
+    """Emails per contact: lognormal with the given mean, a share of dormant contacts"""
+    mu = np.log(max(mean, 1e-9) / (1 - DORMANT_SHARE)) - VOLUME_SIGMA**2 / 2
+    volumes = rng.poisson(rng.lognormal(mu, VOLUME_SIGMA, count))
+    volumes[rng.random(count) < DORMANT_SHARE] = 0
+    return volumes
+
+
+def business_timestamps(
+    count: int, days: pd.DatetimeIndex, rng: np.random.Generator
+) -> pd.Series:
+    """Timestamps on the given business days, during office hours"""
+    day = days.values[rng.integers(0, len(days), count)]
+    minutes = np.clip(rng.normal(13 * 60, 150, count), 7 * 60, 19 * 60).astype("int64")
+    seconds = rng.integers(0, 60, count)
+    stamps = day + (minutes * 60 + seconds).astype("timedelta64[s]")
+    return pd.Series(stamps).dt.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def generate_emails(
+    accounts: pd.DataFrame,
+    bankers: pd.DataFrame,
+    mean: float,
+    days: pd.DatetimeIndex,
+    rng: np.random.Generator,
+) -> pd.DataFrame:
+    volumes = email_volumes(len(accounts), mean, rng)
+    rows = np.repeat(np.arange(len(accounts)), volumes)
+    n = len(rows)
+    contact = accounts.iloc[rows]
+    banker = bankers.iloc[contact["banker"].to_numpy()]
+    client_name = (contact["first_name"] + " " + contact["last_name"]).to_numpy()
+    banker_name = (banker["first_name"] + " " + banker["last_name"]).to_numpy()
+    client_email = contact["email"].to_numpy()
+    banker_email = banker["email"].to_numpy()
+    inbound = rng.random(n) < 0.55
+    topic = EMAIL_TOPICS[rng.integers(0, len(EMAIL_TOPICS), n)]
+    greeting = np.where(
+        inbound, banker["first_name"].to_numpy(), contact["first_name"].to_numpy()
+    )
+    frame = pd.DataFrame(
+        {
+            "email_timestamp": business_timestamps(n, days, rng).to_numpy(),
+            "to_names": np.where(inbound, banker_name, client_name),
+            "to_emails": np.where(inbound, banker_email, client_email),
+            "from_name": np.where(inbound, client_name, banker_name),
+            "from_email": np.where(inbound, client_email, banker_email),
+            "email_subject": topic[:, 0]
+            + " - "
+            + contact["company"].to_numpy().astype(str),
+            "email_body": "Hi "
+            + greeting.astype(object)
+            + ",\n\n"
+            + topic[:, 1]
+            + "\n\nBest regards",
+        }
+    )
+    return frame.sort_values("email_timestamp", kind="stable", ignore_index=True)
+
+
+def generate_meetings(
+    accounts: pd.DataFrame,
+    bankers: pd.DataFrame,
+    mean_emails: float,
+    days: pd.DatetimeIndex,
+    rng: np.random.Generator,
+) -> pd.DataFrame:
+    # Busier clients meet more often: about one meeting per ten emails, at least quarterly
+    volumes = rng.poisson(
+        np.maximum(4.0, email_volumes(len(accounts), mean_emails, rng) / 10)
+    )
+    rows = np.repeat(np.arange(len(accounts)), volumes)
+    contact = accounts.iloc[rows]
+    banker = bankers.iloc[contact["banker"].to_numpy()]
+    stamps = business_timestamps(len(rows), days, rng).str.slice(0, 13) + ":00:00"
+    # Columns of meeting_data as written by notebooks/1.0-data_loading/5.0-load-more-meetings.ipynb
+    return pd.DataFrame(
+        {
+            "meeting_timestamp": stamps.to_numpy(),
+            "host": (banker["first_name"] + " " + banker["last_name"]).to_numpy(),
+            "host_email": banker["email"].to_numpy(),
+            "invitees": (contact["first_name"] + " " + contact["last_name"]).to_numpy(),
+            "invitee_emails": contact["email"].to_numpy(),
+            "meeting_subject": contact["company"].to_numpy().astype(object)
+            + " - "
+            + MEETING_TYPES[rng.integers(0, len(MEETING_TYPES), len(rows))],
+        }
+    )
+
+
+def generate_preferences(
+    bankers: pd.DataFrame, rng: np.random.Generator
+) -> pd.DataFrame:
+    levels = np.array(["full", "short", "none"])
+    n = len(bankers)
+    return pd.DataFrame(
+        {
+            "as_of_date": "2023-01-23 10:00:00",
+            "employee_first_name": bankers["first_name"],
+            "employee_last_name": bankers["last_name"],
+            "finance_detail": rng.choice(levels, n, p=[0.6, 0.3, 0.1]),
+            "news_detail": rng.choice(levels, n, p=[0.6, 0.3, 0.1]),
+            "macro_news_detail": rng.choice(levels, n, p=[0.5, 0.3, 0.2]),
+            "past_meeting_detail": rng.choice(levels, n, p=[0.6, 0.3, 0.1]),
+            "email": bankers["email"],
+        }
+    )
+
+
+def generate(
+    accounts: int,
+    emails_per_contact: float = 40.0,
+    bankers: int = 200,
+    seed: int = 0,
+    chunk_size: int = 10_000,
+    end: Optional[datetime] = None,
+    days: int = 730,
+) -> Iterator[Dict[str, pd.DataFrame]]:
+    """
+    Generate the tables chunk by chunk.
+
+    Args:
+        accounts: Number of client accounts (one point of contact each)
+        emails_per_contact: Mean emails per contact over the window
+        bankers: Number of bankers the accounts are spread over
+        seed: Seed of every random draw
+        chunk_size: Accounts per chunk
+        end: End of the email and meeting window (default: DEFAULT_END)
+        days: Length of the window
+
+    Yields:
+        Dict of table name to the rows of the chunk (static tables in the first chunk only)
+    """
+    pools = name_pools(seed)
+    banker_table = generate_bankers(bankers, pools, np.random.default_rng([seed, 0]))
+    end = end or DEFAULT_END
+    window = pd.bdate_range(end=end.date() - timedelta(days=1), periods=days * 5 // 7)
+
+    for index, start in enumerate(range(0, accounts, chunk_size)):
+        rng = np.random.default_rng([seed, index + 1])
+        chunk = generate_accounts(
+            start, min(chunk_size, accounts - start), pools, rng, bankers
+        )
+        tables = {
+            "accounts_alignment": chunk[["company", "industry"]],
+            "clients_contact": chunk[
+                ["company", "first_name", "last_name", "email", "title"]
+            ],
+            "portfolio": generate_portfolio(chunk, rng),
+            "email_data": generate_emails(
+                chunk, banker_table, emails_per_contact, window, rng
+            ),
+            "meeting_data": generate_meetings(
+                chunk, banker_table, emails_per_contact, window, rng
+            ),
+        }
+        if index == 0:
+            tables["fund_detail"] = fund_detail()
+            tables["preferences"] = generate_preferences(banker_table, rng)
+        yield tables
+
+
+class FileSink:
+    """Appends every chunk to <out>/<database>/<table>.csv or .parquet"""
+
+    def __init__(self, directory: str, file_format: str = "csv"):
+        if file_format == "parquet" and not HAS_PYARROW:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        self.directory = directory
+        self.file_format = file_format
+        self.writers: Dict[str, object] = {}
+
+    def path(self, table: str) -> str:
+        directory = os.path.join(self.directory, TABLES[table])
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{table}.{self.file_format}")
+
+    def write(self, table: str, df: pd.DataFrame) -> None:
+        if self.file_format == "csv":
+            first = table not in self.writers
+            self.writers[table] = True
+            df.to_csv(
+                self.path(table), mode="w" if first else "a", header=first, index=False
+            )
+            return
+        batch = pa.Table.from_pandas(df, preserve_index=False)
+        if table not in self.writers:
+            self.writers[table] = pq.ParquetWriter(self.path(table), batch.schema)
+        self.writers[table].write_table(batch)
+
+    def close(self) -> None:
+        for writer in self.writers.values():
+            if self.file_format == "parquet":
+                writer.close()
+
+
+class DatabaseSink:
+    """
+    Loads every chunk into the table's database. Tables are (re)created from the
+    first chunk; Postgres chunks are streamed with COPY, SQLite ones inserted with
+    executemany in a single transaction.
+    """
+
+    def __init__(self, urls: Dict[str, str]):
+        self.engines = {database: create_engine(url) for database, url in urls.items()}
+        self.created: set = set()
+
+    def write(self, table: str, df: pd.DataFrame) -> None:
+        engine = self.engines.get(TABLES[table])
+        if engine is None:
+            return
+        if table not in self.created:
+            df.head(0).to_sql(table, engine, if_exists="replace", index=False)
+            self.created.add(table)
+        if engine.dialect.name == "postgresql":
+            copy_dataframe(engine, table, df)
+        else:
+            insert_dataframe(engine, table, df)
+
+    def close(self) -> None:
+        for engine in self.engines.values():
+            engine.dispose()
+
+
+def copy_dataframe(engine, table: str, df: pd.DataFrame) -> None:
+    """Stream a DataFrame into an existing Postgres table with COPY ... FROM STDIN"""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, quoting=csv.QUOTE_MINIMAL)
+    buffer.seek(0)
+    columns = ", ".join(f'"{column}"' for column in df.columns)
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f'COPY "{table}" ({columns}) FROM STDIN WITH (FORMAT csv)', buffer
+            )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def insert_dataframe(engine, table: str, df: pd.DataFrame) -> None:
+    """Insert a DataFrame into an existing table with one executemany"""
+    columns = ", ".join(f'"{column}"' for column in df.columns)
+    placeholders = ", ".join("?" for _ in df.columns)
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders})', list(rows)
+        )
+
+
+def create_indexes(sink: DatabaseSink) -> None:
+    """Indexes on the columns the report tools filter on"""
+    statements = {
+        "crm": [
+            "CREATE INDEX IF NOT EXISTS ix_clients_contact_email ON clients_contact (email)",
+            "CREATE INDEX IF NOT EXISTS ix_clients_contact_company ON clients_contact (company)",
+            "CREATE INDEX IF NOT EXISTS ix_accounts_alignment_company ON accounts_alignment (company)",
+            "CREATE INDEX IF NOT EXISTS ix_portfolio_company ON portfolio (company)",
+        ],
+        "crm_outlook": [
+            "CREATE INDEX IF NOT EXISTS ix_email_data_from_email ON email_data (from_email, email_timestamp)",
+            "CREATE INDEX IF NOT EXISTS ix_email_data_to_emails ON email_data (to_emails, email_timestamp)",
+            "CREATE INDEX IF NOT EXISTS ix_meeting_data_host ON meeting_data (host_email, meeting_timestamp)",
+        ],
+    }
+    for database, engine in sink.engines.items():
+        with engine.begin() as conn:
+            for statement in statements[database]:
+                conn.execute(text(statement))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate CRM and Outlook data at scale."
+    )
+    parser.add_argument("--accounts", type=int, default=100_000)
+    parser.add_argument(
+        "--emails-per-contact", type=float, default=40.0, help="Mean emails per contact"
+    )
+    parser.add_argument("--bankers", type=int, default=200)
+    parser.add_argument(
+        "--days", type=int, default=730, help="Length of the email and meeting window"
+    )
+    parser.add_argument(
+        "--end",
+        default=DEFAULT_END.strftime("%Y-%m-%d"),
+        help="End of the email and meeting window (YYYY-MM-DD)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--chunk-size", type=int, default=10_000, help="Accounts per chunk"
+    )
+    parser.add_argument(
+        "--out", default=None, help="Directory of the CSV/Parquet files"
+    )
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument(
+        "--crm-url", default=None, help="SQLAlchemy URL of the crm database"
+    )
+    parser.add_argument(
+        "--outlook-url", default=None, help="SQLAlchemy URL of the crm_outlook database"
+    )
+    args = parser.parse_args(argv)
+
+    sinks = []
+    if args.out:
+        sinks.append(FileSink(args.out, args.format))
+    urls = {
+        name: url
+        for name, url in (("crm", args.crm_url), ("crm_outlook", args.outlook_url))
+        if url
+    }
+    if urls:
+        sinks.append(DatabaseSink(urls))
+    if not sinks:
+        parser.error("give --out and/or --crm-url / --outlook-url")
+
+    end = datetime.strptime(args.end, "%Y-%m-%d")
+    counts: Dict[str, int] = {}
+    start = time.perf_counter()
+    for tables in generate(
+        args.accounts,
+        args.emails_per_contact,
+        args.bankers,
+        args.seed,
+        args.chunk_size,
+        end,
+        args.days,
+    ):
+        for table, df in tables.items():
+            for sink in sinks:
+                sink.write(table, df)
+            counts[table] = counts.get(table, 0) + len(df)
+        print(
+            f"{counts['accounts_alignment']:>9} accounts, {counts['email_data']:>10} emails "
+            f"({time.perf_counter() - start:.1f}s)",
+            file=sys.stderr,
+        )
+
+    for sink in sinks:
+        if isinstance(sink, DatabaseSink):
+            create_indexes(sink)
+        sink.close()
+    for table, count in counts.items():
+        print(f"{table:<20} {count:>12,} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())